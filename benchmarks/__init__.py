@@ -0,0 +1,4 @@
+# This file is part of the Minnesota Population Center's NHGISXWALK.
+# For copyright and licensing information, see the NOTICE and LICENSE files
+# in this project's top-level directory, and also on-line at:
+#   https://github.com/ipums/nhgisxwalk
@@ -0,0 +1,91 @@
+# This file is part of the Minnesota Population Center's NHGISXWALK.
+# For copyright and licensing information, see the NOTICE and LICENSE files
+# in this project's top-level directory, and also on-line at:
+#   https://github.com/ipums/nhgisxwalk
+
+"""Benchmarks for atom calculation in ``nhgisxwalk.calculate_atoms``.
+"""
+
+import numpy
+
+from nhgisxwalk import calculate_atoms
+from nhgisxwalk.id_keys import pack_ids
+
+from .common import SEED, atom_pairs
+
+
+class TimeCalculateAtoms:
+    """Cost of atom weights versus the number of weight variables -- e.g.
+    persons, families, households, and housing units -- on ID strings or
+    packed ID keys.
+    """
+
+    params = ([100_000, 1_000_000], [1, 2, 4, 8], [False, True])
+    param_names = ["n_rows", "n_vars", "id_keys"]
+
+    def setup(self, n_rows, n_vars, id_keys):
+        rng = numpy.random.default_rng(SEED)
+        self.df = atom_pairs(n_rows, n_rows // 10)
+        self.input_var = [f"var{v}" for v in range(n_vars)]
+        for var in self.input_var:
+            self.df[var] = rng.integers(0, 100, size=n_rows).astype(float)
+        self.id_keys = None
+        if id_keys:
+            self.id_keys = {}
+            for col in ["source", "target"]:
+                codec, (keys,) = pack_ids(self.df[col])
+                self.id_keys[col] = codec, keys
+
+    def time_calculate_atoms(self, n_rows, n_vars, id_keys):
+        calculate_atoms(
+            self.df,
+            weight="weight",
+            input_var=self.input_var,
+            weight_var=self.input_var,
+            weight_prefix="wt_",
+            source_id="source",
+            groupby_cols=["source", "target"],
+            id_keys=self.id_keys,
+        )
+
+    def peakmem_calculate_atoms(self, n_rows, n_vars, id_keys):
+        self.time_calculate_atoms(n_rows, n_vars, id_keys)
+
+
+class TimeAtomEngines:
+    """The ``'pandas'`` (``groupby``) versus ``'numpy'`` (``groupby`` sums of
+    combined integer codes) atom engines at national scale, for one weight
+    variable and the four of a production build -- persons, families,
+    households, and housing units.
+    """
+
+    params = ([1_000_000, 3_000_000, 10_000_000], [1, 4], ["pandas", "numpy"])
+    param_names = ["n_rows", "n_vars", "engine"]
+    timeout = 600
+
+    def setup(self, n_rows, n_vars, engine):
+        rng = numpy.random.default_rng(SEED)
+        self.df = atom_pairs(n_rows, min(n_rows // 10, 1_000_000))
+        self.input_var = [f"var{v}" for v in range(n_vars)]
+        for var in self.input_var:
+            self.df[var] = rng.integers(0, 100, size=n_rows).astype(float)
+        self.id_keys = {}
+        for col in ["source", "target"]:
+            codec, (keys,) = pack_ids(self.df[col])
+            self.id_keys[col] = codec, keys
+
+    def time_calculate_atoms(self, n_rows, n_vars, engine):
+        calculate_atoms(
+            self.df,
+            weight="weight",
+            input_var=self.input_var,
+            weight_var=self.input_var,
+            weight_prefix="wt_",
+            source_id="source",
+            groupby_cols=["source", "target"],
+            id_keys=self.id_keys,
+            engine=engine,
+        )
+
+    def peakmem_calculate_atoms(self, n_rows, n_vars, engine):
+        self.time_calculate_atoms(n_rows, n_vars, engine)
@@ -0,0 +1,498 @@
+# This file is part of the Minnesota Population Center's NHGISXWALK.
+# For copyright and licensing information, see the NOTICE and LICENSE files
+# in this project's top-level directory, and also on-line at:
+#   https://github.com/ipums/nhgisxwalk
+
+"""Benchmarks for building crosswalks with ``nhgisxwalk.GeoCrossWalk`` from the
+``testing_data_subsets`` inputs.
+"""
+
+import os
+import shutil
+import tempfile
+
+import numpy
+import pandas
+
+from nhgisxwalk import (
+    CrossWalkCache,
+    GeoCrossWalk,
+    StageProfile,
+    compose_xwalks,
+    desc_code_1990,
+    extract_state,
+    extract_unique_stfips,
+    multi_target_xwalks,
+    state_partitions,
+    str_types,
+    tabular_df_from_csv,
+    xwalk_df_from_csv,
+)
+from nhgisxwalk.id_codes import code_cols, gj_code_components
+from nhgisxwalk.id_keys import pack_ids
+
+from .common import SEED, block_gisjoins
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "testing_data_subsets", "")
+UNITS = ["Persons", "Families", "Households", "Housing Units"]
+INPUT_VAR = [desc_code_1990[unit]["Total"] for unit in UNITS]
+WEIGHT_VAR = ["pop", "fam", "hh", "hu"]
+# the subset (Delaware) and the state codes it is restated under
+STATES = ["10", "11", "12", "13", "15", "16", "17", "18"]
+
+
+def subset_inputs(categorical_ids=False):
+    """The 1990 block to 2010 block base crosswalk subset and the keyword
+    arguments for a 1990 block group part to 2010 tract crosswalk.
+    """
+    fname = "nhgis_blk1990_blk2010_gj"
+    base = xwalk_df_from_csv(
+        fname,
+        path=DATA_DIR,
+        archived=True,
+        remove_unpacked=True,
+        categorical_ids=categorical_ids,
+        dtype=str_types(["GJOIN1990", "GJOIN2010"]),
+    )
+    kwargs = {
+        "source_year": "1990",
+        "target_year": "2010",
+        "source_geo": "bgp",
+        "target_geo": "tr",
+        "base_source_table": DATA_DIR + "1990_block.csv.zip",
+        "supp_source_table": DATA_DIR + "1990_blck_grp_598.csv.zip",
+        "input_var": INPUT_VAR,
+        "weight_var": WEIGHT_VAR,
+        "categorical_ids": categorical_ids,
+    }
+    return base, kwargs
+
+
+def restate(df, id_cols, stfips):
+    """The Delaware records of ``df`` with IDs under another state code."""
+    df = df[df[id_cols[0]].str.startswith("G10", na=False)].copy()
+    for col in id_cols:
+        df[col] = df[col].str.replace("G10", f"G{stfips}", n=1, regex=False)
+    return df
+
+
+def restated_inputs(tmp, states=STATES):
+    """The subset inputs (see ``subset_inputs()``) with the Delaware records
+    restated under each of ``states`` -- the tabular data are written to the
+    ``tmp`` directory.
+    """
+    base, kwargs = subset_inputs()
+    base = pandas.concat(
+        [base] + [restate(base, base.columns[:2], st) for st in states[1:]],
+        ignore_index=True,
+    )
+    for table in ["base_source_table", "supp_source_table"]:
+        tab = pandas.read_csv(kwargs[table], dtype=str)
+        restated = [tab]
+        for st in states[1:]:
+            restated.append(restate(tab, ["GISJOIN"], st))
+            restated[-1]["STATEA"] = st
+        kwargs[table] = os.path.join(tmp, os.path.basename(kwargs[table]))
+        pandas.concat(restated, ignore_index=True).to_csv(kwargs[table], index=False)
+    return base, kwargs
+
+
+class TimeCategoricalIDs:
+    """Object versus categorical (dictionary-encoded) ID columns."""
+
+    params = [False, True]
+    param_names = ["categorical_ids"]
+
+    def setup(self, categorical_ids):
+        self.base, self.kwargs = subset_inputs(categorical_ids)
+
+    def time_geocrosswalk(self, categorical_ids):
+        GeoCrossWalk(self.base, **self.kwargs)
+
+    def peakmem_geocrosswalk(self, categorical_ids):
+        GeoCrossWalk(self.base, keep_base=True, **self.kwargs)
+
+    def track_base_id_memory_saved(self, categorical_ids):
+        if not categorical_ids:
+            return 0
+        xwalk = GeoCrossWalk(self.base, **self.kwargs)
+        return int(xwalk.id_memory.loc["base", "saved"].sum())
+
+    track_base_id_memory_saved.unit = "bytes"
+
+
+class TimeNoData1990:
+    """1990 block group part crosswalks -- including the handling of 1990
+    no-data blocks (``handle_1990_no_data()``).
+    """
+
+    params = ["bg", "tr", "co"]
+    param_names = ["target_geo"]
+
+    def setup(self, target_geo):
+        self.base, self.kwargs = subset_inputs()
+        self.kwargs["target_geo"] = target_geo
+
+    def time_geocrosswalk(self, target_geo):
+        GeoCrossWalk(self.base, **self.kwargs)
+
+    def peakmem_geocrosswalk(self, target_geo):
+        GeoCrossWalk(self.base, **self.kwargs)
+
+
+class TimeNoData1990States:
+    """1990 block group part to 2010 tract crosswalks of one, two, and eight
+    states (see ``restated_inputs()``) -- the build and its
+    ``handle_1990_no_data()`` stage (see ``StageProfile``).
+    """
+
+    params = [1, 2, 8]
+    param_names = ["n_states"]
+
+    def setup(self, n_states):
+        self.tmp = tempfile.mkdtemp()
+        self.base, self.kwargs = restated_inputs(self.tmp, STATES[:n_states])
+
+    def teardown(self, n_states):
+        shutil.rmtree(self.tmp)
+
+    def time_geocrosswalk(self, n_states):
+        GeoCrossWalk(self.base, **self.kwargs)
+
+    def peakmem_geocrosswalk(self, n_states):
+        GeoCrossWalk(self.base, **self.kwargs)
+
+    def track_handle_1990_no_data(self, n_states):
+        return self._no_data_stage(trace_memory=False)["wall_time"]
+
+    track_handle_1990_no_data.unit = "seconds"
+
+    def track_handle_1990_no_data_peak_memory(self, n_states):
+        return int(self._no_data_stage(trace_memory=True)["peak_memory"])
+
+    track_handle_1990_no_data_peak_memory.unit = "bytes"
+
+    def _no_data_stage(self, trace_memory):
+        profile = StageProfile(trace_memory=trace_memory)
+        GeoCrossWalk(self.base, profile=profile, **self.kwargs)
+        return profile.to_frame().set_index("stage").loc["handle_1990_no_data"]
+
+
+class TimeAccounting:
+    """Appending unaccounted for source and target IDs to a resultant
+    crosswalk of 100,000 atoms (Step 9) -- this should be linear in the
+    number of unaccounted for IDs.
+    """
+
+    params = [1_000, 10_000, 100_000]
+    param_names = ["n_unaccounted"]
+    n_atoms = 100_000
+
+    def setup(self, n_unaccounted):
+        ids = pandas.Series(block_gisjoins(self.n_atoms + n_unaccounted))
+        base = pandas.DataFrame({"blk2010gj": ids, "tr2010gj": ids.str[:14]})
+        self.xwalk = base.iloc[: self.n_atoms].copy()
+        self.xwalk["wt_pop"] = 1.0
+        codec, keys = pack_ids(*[base[c] for c in base.columns])
+        self.id_keys = {c: (codec, k) for c, k in zip(base.columns, keys)}
+
+    def time_accounting(self, n_unaccounted):
+        geoxwalk = GeoCrossWalk.__new__(GeoCrossWalk)
+        geoxwalk.source, geoxwalk.target = "blk2010gj", "tr2010gj"
+        geoxwalk.weight_col = ["wt_pop"]
+        geoxwalk.xwalk, geoxwalk.id_keys = self.xwalk, self.id_keys
+        geoxwalk.accounting()
+
+    def peakmem_accounting(self, n_unaccounted):
+        self.time_accounting(n_unaccounted)
+
+
+class TimeSplitStates:
+    """Partitioning a national crosswalk of block records by state -- one
+    ``extract_state()`` scan per state versus a single pass with
+    ``state_partitions()``.
+    """
+
+    params = ([100_000, 1_000_000], ["extract_state", "state_partitions"])
+    param_names = ["n_records", "method"]
+
+    def setup(self, n_records, method):
+        ids = pandas.Series(block_gisjoins(n_records))
+        self.xwalk = pandas.DataFrame({"blk2010gj": ids, "wt_pop": 1.0})
+
+    def time_split_states(self, n_records, method):
+        if method == "extract_state":
+            for stfips in sorted(
+                extract_unique_stfips(df=self.xwalk, endpoint="blk2010gj")
+            ):
+                extract_state(self.xwalk, stfips, "nhgis_blk2010_blk2010", "blk2010gj")
+        else:
+            for _ in state_partitions(self.xwalk, "blk2010gj"):
+                pass
+
+    def peakmem_split_states(self, n_records, method):
+        self.time_split_states(n_records, method)
+
+
+class TimeTabular1990Block:
+    """Reading the 1990 block summary file -- the subset repeated to 119,400
+    and a national-scale 1,194,000 blocks. Every column (with string ID
+    components) versus only the needed columns with the C or pyarrow parser.
+    """
+
+    params = ([10, 100], ["all_columns", "c", "pyarrow"])
+    param_names = ["n_copies", "reader"]
+
+    def setup(self, n_copies, reader):
+        tab = pandas.read_csv(DATA_DIR + "1990_block.csv.zip", dtype=str)
+        self.tmp = tempfile.mkdtemp()
+        self.table = os.path.join(self.tmp, "1990_block.csv.zip")
+        tab = pandas.concat([tab] * n_copies, ignore_index=True)
+        tab.to_csv(self.table, index=False)
+        self.id_cols = ["GISJOIN"] + code_cols("bgp", "1990")
+
+    def teardown(self, n_copies, reader):
+        shutil.rmtree(self.tmp)
+
+    def time_read(self, n_copies, reader):
+        self._read(reader)
+
+    def peakmem_read(self, n_copies, reader):
+        self._read(reader)
+
+    def _read(self, reader):
+        if reader == "all_columns":
+            components = gj_code_components("1990", "blk")["Variable"]
+            return pandas.read_csv(self.table, dtype=str_types(components))
+        return tabular_df_from_csv(
+            self.table, self.id_cols, num_cols=INPUT_VAR, engine=reader
+        )
+
+
+class TimeCrossWalkCache:
+    """A 1990 block group part to 2010 tract crosswalk built from scratch
+    versus restored from a ``CrossWalkCache`` -- a hit still hashes the base
+    crosswalk and tabular files.
+    """
+
+    params = ["build", "hit"]
+    param_names = ["cache"]
+
+    def setup(self, cache):
+        self.base, self.kwargs = subset_inputs()
+        self.tmp = tempfile.mkdtemp()
+        self.cache = CrossWalkCache(self.tmp) if cache == "hit" else None
+        GeoCrossWalk(self.base, cache=self.cache, **self.kwargs)
+
+    def teardown(self, cache):
+        shutil.rmtree(self.tmp)
+
+    def time_geocrosswalk(self, cache):
+        GeoCrossWalk(self.base, cache=self.cache, **self.kwargs)
+
+
+class TimeCacheKey:
+    """Content-addressing a national-scale base crosswalk of block records."""
+
+    params = [1_000_000, 10_000_000]
+    param_names = ["n_records"]
+    timeout = 300
+
+    def setup(self, n_records):
+        ids = pandas.Series(block_gisjoins(n_records))
+        rng = numpy.random.default_rng(SEED)
+        self.base = pandas.DataFrame(
+            {
+                "GJOIN1990": ids,
+                "GJOIN2010": ids.str[::-1],
+                "WEIGHT": rng.random(n_records),
+                "PAREA": rng.random(n_records),
+            }
+        )
+        self.tmp = tempfile.mkdtemp()
+        self.cache = CrossWalkCache(self.tmp)
+
+    def teardown(self, n_records):
+        shutil.rmtree(self.tmp)
+
+    def time_key(self, n_records):
+        self.cache.key(self.base, tables=[DATA_DIR + "1990_block.csv.zip"])
+
+
+class TimePartitionedBuild:
+    """A 1990 block group part to 2010 tract crosswalk of eight states -- the
+    Delaware subset under other state codes -- built in a single process
+    versus in state partitions with a pool of worker processes.
+    """
+
+    params = [1, 2, 4]
+    param_names = ["workers"]
+
+    def setup(self, workers):
+        self.tmp = tempfile.mkdtemp()
+        self.base, self.kwargs = restated_inputs(self.tmp)
+
+    def teardown(self, workers):
+        shutil.rmtree(self.tmp)
+
+    def time_geocrosswalk(self, workers):
+        GeoCrossWalk(self.base, workers=workers, **self.kwargs)
+
+
+class TimeMultiTarget:
+    """The 1990 block group part to 2010 block group, tract, and county
+    crosswalks of eight states (see ``TimePartitionedBuild``) -- each built
+    from scratch versus from a single shared source pass.
+    """
+
+    params = ["separate", "shared"]
+    param_names = ["source_pass"]
+    targets = ["bg", "tr", "co"]
+
+    def setup(self, source_pass):
+        TimePartitionedBuild.setup(self, 1)
+        del self.kwargs["target_geo"]
+
+    def teardown(self, source_pass):
+        TimePartitionedBuild.teardown(self, 1)
+
+    def time_geocrosswalks(self, source_pass):
+        if source_pass == "shared":
+            multi_target_xwalks(self.base, self.targets, **self.kwargs)
+        else:
+            for target_geo in self.targets:
+                GeoCrossWalk(self.base, target_geo=target_geo, **self.kwargs)
+
+
+class TimeRollup:
+    """The 1990 block group part to 2010 block group, tract, and county
+    crosswalks of eight states (see ``TimePartitionedBuild``) from a shared
+    source pass -- the tract and county crosswalks each built versus rolled up
+    from the block group crosswalk.
+    """
+
+    params = [False, True]
+    param_names = ["rollup"]
+    targets = ["bg", "tr", "co"]
+
+    def setup(self, rollup):
+        TimeMultiTarget.setup(self, "shared")
+
+    def teardown(self, rollup):
+        TimeMultiTarget.teardown(self, "shared")
+
+    def time_geocrosswalks(self, rollup):
+        multi_target_xwalks(self.base, self.targets, rollup=rollup, **self.kwargs)
+
+
+class TimeCompose:
+    """The 1990 block to 2010 block base crosswalk of eight states (see
+    ``TimePartitionedBuild``) chained with the 2010 block to 2000 block
+    (reversed) base crosswalk -- a merge and groupby of the ID strings versus
+    ``compose_xwalks()``.
+    """
+
+    params = ["merge", "compose"]
+    param_names = ["method"]
+    ids = ["GJOIN1990", "GJOIN2010", "GJOIN2000"]
+
+    def setup(self, method):
+        base, _ = subset_inputs()
+        second = xwalk_df_from_csv(
+            "nhgis_blk2000_blk2010_gj",
+            path=DATA_DIR,
+            archived=True,
+            remove_unpacked=True,
+            dtype=str_types(["GJOIN2000", "GJOIN2010"]),
+        )
+        second = second[["GJOIN2010", "GJOIN2000", "WEIGHT"]]
+        self.first, self.second = [
+            pandas.concat(
+                [df] + [restate(df, df.columns[:2], st) for st in STATES[1:]],
+                ignore_index=True,
+            )
+            for df in [base[["GJOIN1990", "GJOIN2010", "WEIGHT"]], second]
+        ]
+
+    def _compose(self, method):
+        source, middle, target = self.ids
+        if method == "compose":
+            compose_xwalks(self.first, self.second, source, middle, target)
+        else:
+            merged = self.first.merge(self.second, on=middle)
+            merged["WEIGHT"] = merged["WEIGHT_x"] * merged["WEIGHT_y"]
+            merged.groupby([source, target])["WEIGHT"].sum().reset_index()
+
+    def time_compose(self, method):
+        self._compose(method)
+
+    def peakmem_compose(self, method):
+        self._compose(method)
+
+
+class TimeReverse:
+    """The 1990 block group part to 2010 tract crosswalk of eight states (see
+    ``TimePartitionedBuild``) built with its numerators versus the 2010 tract
+    to 1990 block group part crosswalk reversed from it.
+    """
+
+    params = ["build", "reverse"]
+    param_names = ["direction"]
+
+    def setup(self, direction):
+        TimePartitionedBuild.setup(self, 1)
+        self.kwargs["keep_numerators"] = True
+        if direction == "reverse":
+            self.xwalk = GeoCrossWalk(self.base, **self.kwargs)
+
+    def teardown(self, direction):
+        TimePartitionedBuild.teardown(self, 1)
+
+    def time_geocrosswalk(self, direction):
+        if direction == "reverse":
+            self.xwalk.reverse()
+        else:
+            GeoCrossWalk(self.base, **self.kwargs)
+
+
+class TimeLazy:
+    """The 1990 block group part to 2010 tract crosswalk of eight states (see
+    ``TimePartitionedBuild``) -- only the atoms of a lazy build evaluated
+    versus the full build.
+    """
+
+    params = ["atoms", "xwalk"]
+    param_names = ["stage"]
+
+    def setup(self, stage):
+        TimePartitionedBuild.setup(self, 1)
+
+    def teardown(self, stage):
+        TimePartitionedBuild.teardown(self, 1)
+
+    def time_geocrosswalk(self, stage):
+        GeoCrossWalk(self.base, lazy=True, **self.kwargs).evaluate(stage)
+
+    def peakmem_geocrosswalk(self, stage):
+        GeoCrossWalk(self.base, lazy=True, **self.kwargs).evaluate(stage)
+
+
+class TimeProfile:
+    """The 1990 block group part to 2010 tract crosswalk of eight states (see
+    ``TimePartitionedBuild``) built without a profile, with timed stages, and
+    with timed and memory traced stages.
+    """
+
+    params = ["off", "time", "memory"]
+    param_names = ["profile"]
+
+    def setup(self, profile):
+        TimePartitionedBuild.setup(self, 1)
+        if profile != "off":
+            self.kwargs["profile"] = StageProfile(trace_memory=profile == "memory")
+
+    def teardown(self, profile):
+        TimePartitionedBuild.teardown(self, 1)
+
+    def time_geocrosswalk(self, profile):
+        GeoCrossWalk(self.base, **self.kwargs)
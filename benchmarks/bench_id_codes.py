@@ -0,0 +1,92 @@
+# This file is part of the Minnesota Population Center's NHGISXWALK.
+# For copyright and licensing information, see the NOTICE and LICENSE files
+# in this project's top-level directory, and also on-line at:
+#   https://github.com/ipums/nhgisxwalk
+
+"""Benchmarks for ID generation in ``nhgisxwalk.id_codes``.
+"""
+
+import numpy
+import pandas
+
+from nhgisxwalk.id_codes import (
+    bg_gj,
+    bgp_gj,
+    co_gj,
+    code_cols,
+    generate_geoid,
+    geoid_to_gisjoin,
+    gisjoin_id,
+    gisjoin_ids,
+    gisjoin_to_geoid,
+    id_from,
+    tr_gj,
+)
+
+from .common import block_gisjoins, summary_table
+
+
+class TimeGISJOIN:
+    """Record-by-record versus columnar GISJOIN construction -- and the block
+    group part IDs of a summary file (``bgp_gj``).
+    """
+
+    params = ([10_000, 100_000, 1_000_000], ["1990", "2000"])
+    param_names = ["n_rows", "year"]
+    tzero = ["STATEA", "COUNTYA"]
+
+    def setup(self, n_rows, year):
+        self.order = code_cols("bgp", year)
+        self.df = summary_table(n_rows, year=year)
+
+    def time_gisjoin_id_per_record(self, n_rows, year):
+        [gisjoin_id(rec, self.order, self.tzero) for rec in self.df.itertuples()]
+
+    def time_gisjoin_ids_columnar(self, n_rows, year):
+        gisjoin_ids(self.df, self.order, self.tzero)
+
+    def peakmem_gisjoin_ids_columnar(self, n_rows, year):
+        gisjoin_ids(self.df, self.order, self.tzero)
+
+    def time_bgp_gj(self, n_rows, year):
+        bgp_gj(self.df.copy(deep=False), self.order)
+
+
+class TimeIDFrom:
+    """Target ID derivation from national-scale block GISJOINs (``id_from``)."""
+
+    params = ([10_000, 100_000, 1_000_000], ["bg", "tr", "co"], [False, True])
+    param_names = ["n_rows", "target_geo", "vectorized"]
+    funcs = {"bg": bg_gj, "tr": tr_gj, "co": co_gj}
+
+    def setup(self, n_rows, target_geo, vectorized):
+        self.ids = block_gisjoins(n_rows, year="2010")
+
+    def time_id_from(self, n_rows, target_geo, vectorized):
+        id_from(self.funcs[target_geo], "2010", self.ids, vectorized)
+
+    def peakmem_id_from(self, n_rows, target_geo, vectorized):
+        id_from(self.funcs[target_geo], "2010", self.ids, vectorized)
+
+    def time_numpy_vectorize(self, n_rows, target_geo, vectorized):
+        numpy.vectorize(self.funcs[target_geo])("2010", self.ids)
+
+
+class TimeGEOID:
+    """Record-by-record versus bulk GISJOIN <-> GEOID translation."""
+
+    params = ([100_000, 1_000_000], ["1990", "2010"])
+    param_names = ["n_rows", "year"]
+
+    def setup(self, n_rows, year):
+        self.gisjoins = pandas.Series(block_gisjoins(n_rows, year=year))
+        self.geoids = gisjoin_to_geoid(self.gisjoins, year=year)
+
+    def time_generate_geoid_per_record(self, n_rows, year):
+        self.gisjoins.map(lambda x: generate_geoid(x))
+
+    def time_gisjoin_to_geoid(self, n_rows, year):
+        gisjoin_to_geoid(self.gisjoins, year=year)
+
+    def time_geoid_to_gisjoin(self, n_rows, year):
+        geoid_to_gisjoin(self.geoids, year=year)
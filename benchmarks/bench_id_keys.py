@@ -0,0 +1,93 @@
+# This file is part of the Minnesota Population Center's NHGISXWALK.
+# For copyright and licensing information, see the NOTICE and LICENSE files
+# in this project's top-level directory, and also on-line at:
+#   https://github.com/ipums/nhgisxwalk
+
+"""Benchmarks for integer-packed IDs in ``nhgisxwalk.id_keys``.
+"""
+
+import numpy
+import pandas
+
+from nhgisxwalk.id_keys import (
+    group_keys,
+    isin_pairs,
+    pack_ids,
+    setdiff_ids,
+    setdiff_keys,
+)
+
+from .common import atom_pairs
+
+
+class TimePackIDs:
+    """Packing and unpacking block group part and tract IDs."""
+
+    params = ([100_000, 1_000_000], ["source", "target"])
+    param_names = ["n_rows", "column"]
+
+    def setup(self, n_rows, column):
+        self.ids = atom_pairs(n_rows, n_rows // 10)[column]
+        self.codec, (self.keys,) = pack_ids(self.ids)
+
+    def time_pack_ids(self, n_rows, column):
+        pack_ids(self.ids)
+
+    def time_decode(self, n_rows, column):
+        self.codec.decode(self.keys)
+
+
+class TimeSetDiff:
+    """Unaccounted for IDs (``GeoCrossWalk.accounting``) -- string set
+    difference versus packed keys (with and without packing).
+    """
+
+    params = [100_000, 1_000_000]
+    param_names = ["n_rows"]
+
+    def setup(self, n_rows):
+        self.base = atom_pairs(n_rows, n_rows // 10)["source"]
+        self.xwalk = self.base[: n_rows // 2].unique()
+        _, (self.base_keys, self.xwalk_keys) = pack_ids(self.base, self.xwalk)
+
+    def time_numpy_setdiff1d(self, n_rows):
+        numpy.setdiff1d(self.base.tolist(), self.xwalk.tolist())
+
+    def time_setdiff_ids(self, n_rows):
+        setdiff_ids(self.base, self.xwalk)
+
+    def time_setdiff_keys(self, n_rows):
+        setdiff_keys(self.base_keys, self.xwalk_keys)
+
+
+class TimeAtoms:
+    """Atom grouping (``calculate_atoms``) and the atom anti-join
+    (``handle_1990_no_data``) on ID strings versus packed keys.
+    """
+
+    params = [100_000, 1_000_000]
+    param_names = ["n_rows"]
+
+    def setup(self, n_rows):
+        self.df = atom_pairs(n_rows, n_rows // 10)
+        self.pop = self.df[: n_rows // 2].drop_duplicates(["source", "target"])
+        _, (self.src_keys,) = pack_ids(self.df["source"])
+        _, (self.trg_keys,) = pack_ids(self.df["target"])
+
+    def time_groupby_strings(self, n_rows):
+        self.df.groupby(["source", "target"])["weight"].sum()
+
+    def time_groupby_keys(self, n_rows):
+        codes, first = group_keys(self.src_keys, self.trg_keys)
+        grouper = pandas.Categorical.from_codes(codes, categories=range(first.size))
+        self.df["weight"].groupby(grouper, observed=True).sum()
+
+    def time_atom_id_setdiff(self, n_rows):
+        nod_atoms = self.df["source"] + self.df["target"]
+        pop_atoms = self.pop["source"] + self.pop["target"]
+        keep = numpy.setdiff1d(nod_atoms.tolist(), pop_atoms.tolist())
+        nod_atoms.isin(keep)
+
+    def time_isin_pairs(self, n_rows):
+        pairs = self.df["source"], self.df["target"]
+        isin_pairs(pairs, (self.pop["source"], self.pop["target"]))
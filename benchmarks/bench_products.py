@@ -0,0 +1,180 @@
+# This file is part of the Minnesota Population Center's NHGISXWALK.
+# For copyright and licensing information, see the NOTICE and LICENSE files
+# in this project's top-level directory, and also on-line at:
+#   https://github.com/ipums/nhgisxwalk
+
+"""Benchmarks for writing and loading archived data products in
+``nhgisxwalk.geocrosswalk``.
+"""
+
+import os
+import shutil
+import tempfile
+import zipfile
+
+import numpy
+
+from nhgisxwalk import (
+    CSV,
+    FORMATS,
+    prepare_data_product,
+    split_xwalk,
+    str_types,
+    xwalk_df_from_columnar,
+    xwalk_df_from_csv,
+)
+
+from .common import SEED, atom_pairs
+
+XWALK_NAME = "nhgis_bgp1990_tr2010"
+WEIGHT_VAR = ["wt_pop", "wt_fam", "wt_hh", "wt_hu"]
+RESOURCES = os.path.join(os.path.dirname(__file__), "..", "resources")
+
+
+class TimeDataProducts:
+    """CSV versus columnar (Parquet/Feather) archives of block group part
+    crosswalks of 100,000 and a national-scale 1,000,000 atoms.
+    """
+
+    params = ([100_000, 1_000_000], FORMATS)
+    param_names = ["n_rows", "fmt"]
+
+    def setup(self, n_rows, fmt):
+        rng = numpy.random.default_rng(SEED)
+        self.xwalk = atom_pairs(n_rows, n_rows).drop(columns="weight")
+        self.xwalk.columns = ["bgp1990gj", "tr2010gj"]
+        for wcol in WEIGHT_VAR:
+            self.xwalk[wcol] = rng.random(n_rows).round(10)
+
+        # README.txt files are found relative to the working directory
+        self.cwd, self.tmp = os.getcwd(), tempfile.mkdtemp()
+        shutil.copytree(RESOURCES, os.path.join(self.tmp, "resources"))
+        os.chdir(self.tmp)
+        self.product = os.path.join(self.tmp, "products", XWALK_NAME)
+        prepare_data_product(self.xwalk, XWALK_NAME, self.product, formats=fmt)
+
+    def teardown(self, n_rows, fmt):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.tmp)
+
+    def time_prepare_data_product(self, n_rows, fmt):
+        prepare_data_product(self.xwalk, XWALK_NAME, self.product, formats=fmt)
+
+    def peakmem_prepare_data_product(self, n_rows, fmt):
+        prepare_data_product(self.xwalk, XWALK_NAME, self.product, formats=fmt)
+
+    def time_load(self, n_rows, fmt):
+        self._load(fmt)
+
+    def peakmem_load(self, n_rows, fmt):
+        self._load(fmt)
+
+    def time_load_weights(self, n_rows, fmt):
+        self._load(fmt, columns=["tr2010gj", "wt_pop"])
+
+    def _load(self, fmt, columns=None):
+        kws = {"path": os.path.dirname(self.product) + "/", "archived": True}
+        kws["remove_unpacked"] = True
+        if fmt == CSV:
+            dtype = str_types(["bgp1990gj", "tr2010gj"])
+            return xwalk_df_from_csv(XWALK_NAME, dtype=dtype, usecols=columns, **kws)
+        return xwalk_df_from_columnar(XWALK_NAME, fmt=fmt, columns=columns, **kws)
+
+
+class TimeArchivedCSV:
+    """Streaming an archived CSV crosswalk out of its ``.zip`` with the C or
+    the (multithreaded) pyarrow parser.
+    """
+
+    params = ([100_000, 1_000_000], ["c", "pyarrow"])
+    param_names = ["n_rows", "engine"]
+
+    def setup(self, n_rows, engine):
+        TimeDataProducts.setup(self, n_rows, CSV)
+        self.kws = {"path": os.path.dirname(self.product) + "/", "archived": True}
+        self.kws["dtype"] = str_types(["bgp1990gj", "tr2010gj"])
+
+    def teardown(self, n_rows, engine):
+        TimeDataProducts.teardown(self, n_rows, CSV)
+
+    def time_read(self, n_rows, engine):
+        xwalk_df_from_csv(XWALK_NAME, engine=engine, **self.kws)
+
+    def peakmem_read(self, n_rows, engine):
+        xwalk_df_from_csv(XWALK_NAME, engine=engine, **self.kws)
+
+
+class TimeArchivedCSVChunks:
+    """Streaming an archived CSV crosswalk out of its ``.zip`` in chunks."""
+
+    params = ([1_000_000], [100_000, 1_000_000])
+    param_names = ["n_rows", "chunksize"]
+
+    def setup(self, n_rows, chunksize):
+        TimeArchivedCSV.setup(self, n_rows, "c")
+
+    def teardown(self, n_rows, chunksize):
+        TimeDataProducts.teardown(self, n_rows, CSV)
+
+    def time_read_chunks(self, n_rows, chunksize):
+        for _ in xwalk_df_from_csv(XWALK_NAME, chunksize=chunksize, **self.kws):
+            pass
+
+    def peakmem_read_chunks(self, n_rows, chunksize):
+        for _ in xwalk_df_from_csv(XWALK_NAME, chunksize=chunksize, **self.kws):
+            pass
+
+
+class TimeZipCompression:
+    """Encoding a CSV crosswalk straight into its ``.zip`` archive with
+    different compression methods and levels.
+    """
+
+    params = ([1_000_000], ["stored", "deflated-1", "deflated-6"])
+    param_names = ["n_rows", "compression"]
+    methods = {
+        "stored": (zipfile.ZIP_STORED, None),
+        "deflated-1": (zipfile.ZIP_DEFLATED, 1),
+        "deflated-6": (zipfile.ZIP_DEFLATED, 6),
+    }
+
+    def setup(self, n_rows, compression):
+        TimeDataProducts.setup(self, n_rows, CSV)
+        method, level = self.methods[compression]
+        self.kws = {"compression": method, "compresslevel": level}
+
+    def teardown(self, n_rows, compression):
+        TimeDataProducts.teardown(self, n_rows, CSV)
+
+    def time_prepare_data_product(self, n_rows, compression):
+        prepare_data_product(self.xwalk, XWALK_NAME, self.product, **self.kws)
+
+    def track_archive_size(self, n_rows, compression):
+        prepare_data_product(self.xwalk, XWALK_NAME, self.product, **self.kws)
+        return os.path.getsize(f"{self.product}.zip")
+
+    track_archive_size.unit = "bytes"
+
+
+class TimeSplitWorkers:
+    """Writing the state archives of block group part crosswalks (see
+    ``TimeDataProducts``) in turn or with a pool of worker processes.
+    """
+
+    params = ([100_000, 1_000_000], [1, 2, 4])
+    param_names = ["n_rows", "workers"]
+
+    def setup(self, n_rows, workers):
+        TimeDataProducts.setup(self, n_rows, CSV)
+        self.st_path = self.product + "_state"
+
+    def teardown(self, n_rows, workers):
+        TimeDataProducts.teardown(self, n_rows, CSV)
+
+    def time_split_xwalk(self, n_rows, workers):
+        split_xwalk(
+            self.xwalk, "tr2010gj", XWALK_NAME, "gj", self.st_path, workers=workers
+        )
+
+    def peakmem_split_xwalk(self, n_rows, workers):
+        self.time_split_xwalk(n_rows, workers)
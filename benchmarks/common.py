@@ -0,0 +1,87 @@
+# This file is part of the Minnesota Population Center's NHGISXWALK.
+# For copyright and licensing information, see the NOTICE and LICENSE files
+# in this project's top-level directory, and also on-line at:
+#   https://github.com/ipums/nhgisxwalk
+
+"""Synthetic inputs shared by the ``nhgisxwalk`` benchmarks.
+"""
+
+import numpy
+import pandas
+
+from nhgisxwalk.id_codes import code_cols, gisjoin_ids
+
+# character widths of summary file ID components
+COMPONENT_WIDTHS = {
+    "STATEA": 2,
+    "COUNTYA": 3,
+    "CTY_SUBA": 5,
+    "PLACEA": 5,
+    "TRACTA": 4,
+    "CD101A": 2,
+    "AIANHHA": 4,
+    "RES_TRSTA": 1,
+    "ANRCA": 2,
+    "URB_AREAA": 4,
+    "URBRURALA": 1,
+    "BLCK_GRPA": 1,
+}
+
+# shared random seed for reproducible inputs
+SEED = 1990
+
+
+def random_digits(n, width, rng):
+    """Zero-padded strings of random digits."""
+    values = rng.integers(0, 10**width, size=n).astype(str)
+    return numpy.char.zfill(values, width).astype(object)
+
+
+def summary_table(n, geog="bgp", year="1990", missing=0.01, seed=SEED):
+    """A synthetic NHGIS summary file holding the ID components for
+    ``geog`` + ``year``. A ``missing`` proportion of records has no final
+    ID component, as with blocks absent from the summary data.
+    """
+    rng = numpy.random.default_rng(seed)
+    cols = code_cols(geog, year)
+    df = pandas.DataFrame(
+        {c: random_digits(n, COMPONENT_WIDTHS.get(c, 2), rng) for c in cols}
+    )
+    df.loc[rng.random(n) < missing, cols[-1]] = numpy.nan
+    return df
+
+
+def block_gisjoins(n, year="2010", seed=SEED):
+    """Synthetic block GISJOINs -- G+state+0+county+0+tract+block. 1990
+    blocks have 4- or 6-digit tracts and an optional suffix letter.
+    """
+    rng = numpy.random.default_rng(seed)
+    state, county = random_digits(n, 2, rng), random_digits(n, 3, rng)
+    tract, block = random_digits(n, 6, rng), random_digits(n, 4, rng)
+    if year == "1990":
+        # 6-digit tracts never end in "00" (those are 4-digit tracts)
+        tract[numpy.array([t.endswith("00") for t in tract])] = "000101"
+        short = rng.random(n) < 0.5
+        tract[short] = numpy.array([t[:4] for t in tract[short]], dtype=object)
+        block = random_digits(n, 3, rng)
+        block[rng.random(n) < 0.2] += "A"
+    return "G" + state + "0" + county + "0" + tract + block
+
+
+def atom_pairs(n, n_atoms, seed=SEED):
+    """Synthetic (source, target) ID pairs of a base crosswalk -- ``n``
+    records of (at most) ``n_atoms`` distinct 1990 block group part and 2010
+    tract atoms, with a weight for each record.
+    """
+    rng = numpy.random.default_rng(seed)
+    order = code_cols("bgp", "1990")
+    source = gisjoin_ids(summary_table(n_atoms, missing=0, seed=seed), order, order[:2])
+    target = pandas.Series(block_gisjoins(n_atoms, seed=seed)).str[:14]
+    rows = rng.integers(0, n_atoms, size=n)
+    return pandas.DataFrame(
+        {
+            "source": source[rows],
+            "target": target.to_numpy()[rows],
+            "weight": rng.random(n),
+        }
+    )
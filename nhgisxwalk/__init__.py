@@ -15,28 +15,49 @@ __date__ = "2020-04"
 import contextlib
 from importlib.metadata import PackageNotFoundError, version
 
+from .cache import CrossWalkCache
 from .geocrosswalk import (
+    CACHED_RESULTS,
     CSV,
+    FEATHER,
+    FORMATS,
     ID_COLS,
+    NUMERATOR_PREFIX,
+    PARQUET,
+    ROLLUPS,
     SORT_BYS,
     SORT_PARAMS,
+    SOURCE_PASS_PARAMS,
+    STAGES,
     TXT,
     ZIP,
     GeoCrossWalk,
     calculate_atoms,
+    categorize_ids,
+    compose_xwalks,
     example_crosswalk_data,
     extract_state,
     extract_unique_stfips,
     generate_data_product,
+    id_memory_usage,
+    multi_target_xwalks,
     prepare_data_product,
     regenerate_blk_blk_xwalk,
+    reverse_xwalk,
+    rollup_xwalk,
     round_weights,
     split_xwalk,
+    state_partitions,
     str_types,
+    tabular_df_from_csv,
+    translate_blk_blk_xwalk,
     valid_geo_shorthand,
+    xwalk_df_from_columnar,
     xwalk_df_from_csv,
+    xwalk_df_to_columnar,
     xwalk_df_to_csv,
 )
+from .profiling import StageProfile
 from .variable_codes import (
     code_desc_1990,
     code_desc_2000_SF1b,
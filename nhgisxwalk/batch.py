@@ -0,0 +1,453 @@
+# This file is part of the Minnesota Population Center's NHGISXWALK.
+# For copyright and licensing information, see the NOTICE and LICENSE files
+# in this project's top-level directory, and also on-line at:
+#   https://github.com/ipums/nhgisxwalk
+
+"""Build batches of crosswalk data products from a manifest -- the
+``nhgisxwalk-build`` console script.
+
+A manifest is a JSON file of ``"products"`` -- block group part (``"bgp"``)
+crosswalks built with ``generate_data_product()`` and block to block
+(``"blk"``) crosswalks regenerated with ``regenerate_blk_blk_xwalk()`` -- an
+``"out_path"``, and optional ``"defaults"`` for every product. See
+``standard_manifest()`` (or ``nhgisxwalk-build --template``) for the NHGIS
+products. Block group part products of the same source are built in one job
+that shares the source pass (see ``multi_target_xwalks()``) and, with
+``"rollup"``, rolls coarser targets up from the finer targets. Jobs run in a pool
+of worker processes while the sum of their ``"memory"`` budgets fits the total
+budget. Products are skipped when their archive is newer than all inputs.
+The README.txt files are found relative to the working directory, so run the
+builds from the repository (or its ``notebooks``) directory.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent import futures
+
+from .geocrosswalk import (
+    ID_COLS,
+    SORT_BYS,
+    ZIP,
+    _check_workers,
+    generate_data_product,
+    regenerate_blk_blk_xwalk,
+    str_types,
+    xwalk_df_from_csv,
+)
+from .variable_codes import desc_code_1990, desc_code_2000_SF1b
+
+# product kinds
+BGP = "bgp"
+BLK = "blk"
+
+# the default input variables (and their weight tags) -- totals of each unit
+UNITS = {"Persons": "pop", "Families": "fam", "Households": "hh", "Housing Units": "hu"}
+DESC_CODES = {"1990": desc_code_1990, "2000": desc_code_2000_SF1b}
+
+# byte multiples of memory budgets
+BYTE_UNITS = {"": 1, "K": 2**10, "M": 2**20, "G": 2**30, "T": 2**40}
+
+
+def standard_manifest(data_in, data_tab, out_path, memory=None):
+    """The manifest of the NHGIS data products -- the six block group part
+    crosswalks (1990 and 2000 to 2010 block groups, tracts, and counties; the
+    tracts and counties rolled up from the block groups) and the four block to
+    block crosswalks of ``SORT_BYS``.
+
+    Parameters
+    ----------
+
+    data_in : str
+        The directory of the archived block to block crosswalks.
+
+    data_tab : str
+        The directory of the block (and 1990 block group part) tabular data.
+
+    out_path : str
+        The directory of the data products.
+
+    memory : int or str
+        The memory budget of each product (see ``parse_bytes()``). Default
+        is ``None``, which is unbudgeted.
+
+    Returns
+    -------
+
+    manifest : dict
+        The manifest.
+
+    Examples
+    --------
+
+    >>> from nhgisxwalk.batch import standard_manifest
+    >>> manifest = standard_manifest("in/", "tab/", "out/")
+    >>> [product["kind"] for product in manifest["products"]].count("bgp")
+    6
+
+    >>> manifest["products"][-1]["in_path"]
+    'in/nhgis_blk2000_blk2010_gj.zip'
+
+    """
+    products = []
+    for source_year in DESC_CODES:
+        block_file = f"{source_year}_block"
+        tables = {"base_source_table": f"{data_tab}{block_file}/{block_file}.csv"}
+        if source_year == "1990":
+            supp_file = f"{source_year}_blck_grp_598"
+            tables["supp_source_table"] = f"{data_tab}{supp_file}/{supp_file}.csv"
+        for target_geo in ["bg", "tr", "co"]:
+            products.append(
+                {
+                    "kind": BGP,
+                    "base_xwalk": f"{data_in}nhgis_blk{source_year}_blk2010_gj.{ZIP}",
+                    "source_year": source_year,
+                    "target_geo": target_geo,
+                    "rollup": True,
+                    **tables,
+                }
+            )
+    for xwalk_name, sorter in SORT_BYS.items():
+        products.append(
+            {
+                "kind": BLK,
+                "in_path": f"{data_in}{xwalk_name}.{ZIP}",
+                "target_column": sorter[1],
+            }
+        )
+    return {"out_path": out_path, "defaults": {"memory": memory}, "products": products}
+
+
+def read_manifest(path):
+    """Read a manifest (see ``standard_manifest()``) from a JSON file."""
+    with open(path) as manifest:
+        manifest = json.load(manifest)
+    if "products" not in manifest or "out_path" not in manifest:
+        raise ValueError(f"Manifest '{path}' needs 'products' and an 'out_path'.")
+    return manifest
+
+
+def parse_bytes(size):
+    """Parse a memory budget -- a number of bytes, or a string such as
+    ``'512M'`` or ``'16GB'`` -- into bytes (``None`` stays ``None``).
+
+    Examples
+    --------
+
+    >>> from nhgisxwalk.batch import parse_bytes
+    >>> parse_bytes("1.5G")
+    1610612736
+
+    """
+    if size is None or isinstance(size, int):
+        return size
+    number = str(size).strip().upper().removesuffix("B")
+    unit = number[-1] if number[-1:] in BYTE_UNITS else ""
+    try:
+        return int(float(number[: len(number) - len(unit)]) * BYTE_UNITS[unit])
+    except ValueError:
+        raise ValueError(f"'{size}' is not a memory size.") from None
+
+
+def plan_jobs(manifest, force=False):
+    """Group the products of a manifest into jobs. Block group part products
+    of the same base crosswalk, tabular data, and parameters are one job (their
+    source pass is shared); every block to block product is a job. Products
+    whose archive is newer than all of their inputs are marked as skipped
+    unless ``force``.
+
+    Parameters
+    ----------
+
+    manifest : dict
+        See ``standard_manifest()``.
+
+    force : bool
+        Rebuild up-to-date products (``True``). Default is ``False``.
+
+    Returns
+    -------
+
+    jobs : list
+        Job dictionaries -- the ``kind``, the ``memory`` budget (the largest
+        of its products), the job ``args``, and the ``products`` -- a
+        dictionary of product names, each with its (job-specific) arguments
+        and whether it is ``skip``-ped.
+
+    """
+    out_path = manifest["out_path"]
+    defaults = manifest.get("defaults", {})
+    jobs = {}
+    for product in manifest["products"]:
+        product = {**defaults, **product}
+        kind = product.pop("kind")
+        memory = parse_bytes(product.pop("memory", None))
+        if kind == BGP:
+            name, target, inputs, args = _bgp_product(product)
+            product_args = {"target_geo": target}
+        elif kind == BLK:
+            name, inputs, args = _blk_product(product)
+            product_args = {}
+        else:
+            raise ValueError(f"Product kind must be '{BGP}' or '{BLK}', not '{kind}'.")
+        args["out_path"] = out_path
+        skip = not force and _up_to_date(f"{out_path}{name}.{ZIP}", inputs)
+
+        key = json.dumps([kind, args], sort_keys=True)
+        if kind == BLK:
+            key += name
+        job = jobs.setdefault(
+            key, {"kind": kind, "memory": memory, "args": args, "products": {}}
+        )
+        if memory is not None:
+            job["memory"] = max(job["memory"] or 0, memory)
+        job["products"][name] = {"args": product_args, "skip": skip}
+    return list(jobs.values())
+
+
+def _bgp_product(product):
+    """The name, target, inputs, and (shared) job arguments of a block group
+    part product.
+    """
+    source_year = product["source_year"]
+    target_year = product.get("target_year", "2010")
+    target_geo = product["target_geo"]
+    xwalk_kwargs = {
+        "source_year": source_year,
+        "target_year": target_year,
+        "source_geo": BGP,
+        "base_source_table": product["base_source_table"],
+        "supp_source_table": product.get("supp_source_table"),
+        "input_var": product.get("input_var"),
+        "weight_var": product.get("weight_var", list(UNITS.values())),
+        **product.get("xwalk_kwargs", {}),
+    }
+    if xwalk_kwargs["input_var"] is None:
+        codes = DESC_CODES[source_year]
+        xwalk_kwargs["input_var"] = [codes[unit]["Total"] for unit in UNITS]
+    args = {
+        "base_xwalk": product["base_xwalk"],
+        "xwalk_kwargs": xwalk_kwargs,
+        "workers": product.get("workers", 1),
+        "cache": product.get("cache"),
+        "rollup": product.get("rollup", False),
+    }
+    name = f"nhgis_{BGP}{source_year}_{target_geo}{target_year}"
+    inputs = [args["base_xwalk"], xwalk_kwargs["base_source_table"]]
+    inputs.append(xwalk_kwargs["supp_source_table"])
+    return name, target_geo, inputs, args
+
+
+def _blk_product(product):
+    """The name, inputs, and job arguments of a block to block product."""
+    in_path = product["in_path"]
+    name = os.path.basename(in_path).split(".")[0]
+    args = {
+        "in_path": in_path,
+        "target_column": product["target_column"],
+        "translate": product.get("translate", False),
+        "workers": product.get("workers", 1),
+    }
+    return name, [in_path], args
+
+
+def _up_to_date(output, inputs):
+    """Whether ``output`` exists and is newer than all (existing) ``inputs``."""
+    if not os.path.exists(output):
+        return False
+    built = os.path.getmtime(output)
+    inputs = [i for i in inputs if i is not None and os.path.exists(i)]
+    return all(os.path.getmtime(i) <= built for i in inputs)
+
+
+def run_job(job):
+    """Build the products of a job that are not skipped -- run in worker
+    processes. Returns the seconds taken by each product; the first product
+    of a block group part job also reads the shared inputs.
+    """
+    args = job["args"]
+    products = {n: p for n, p in job["products"].items() if not p["skip"]}
+    timings = {}
+    start = time.perf_counter()
+    if job["kind"] == BLK:
+        for name in products:
+            regenerate_blk_blk_xwalk(
+                args["in_path"],
+                args["out_path"],
+                args["target_column"],
+                str_types(ID_COLS),
+                translate=args["translate"],
+                workers=args["workers"],
+            )
+            timings[name] = time.perf_counter() - start
+        return timings
+
+    # block group part products share the base crosswalk and source pass
+    path, fname = os.path.split(args["base_xwalk"])
+    xwalk_kwargs = args["xwalk_kwargs"]
+    id_cols = [f"GJOIN{xwalk_kwargs[f'{d}_year']}" for d in ["source", "target"]]
+    base_xwalk = xwalk_df_from_csv(
+        fname.split(".")[0],
+        path=os.path.join(path, ""),
+        archived=True,
+        dtype=str_types(id_cols),
+    )
+    source_pass = {}
+    for name, product in products.items():
+        generate_data_product(
+            base_xwalk,
+            {**xwalk_kwargs, **product["args"]},
+            args["out_path"],
+            workers=args["workers"],
+            cache=args["cache"],
+            source_pass=source_pass,
+            rollup=args["rollup"],
+        )
+        timings[name] = time.perf_counter() - start
+        start = time.perf_counter()
+    return timings
+
+
+def run_jobs(jobs, workers=1, memory=None):
+    """Run jobs in turn or in a pool of ``workers`` processes. A job is only
+    started while the ``memory`` budgets of the running jobs and its own fit
+    ``memory`` (a job that does not fit on its own runs alone); jobs without
+    a budget always fit. Jobs are started in order, but a smaller job may
+    overtake one that does not fit yet.
+
+    Parameters
+    ----------
+
+    jobs : list
+        See ``plan_jobs()``.
+
+    workers : int
+        The number of worker processes (``None`` is one per CPU). Default
+        is ``1``.
+
+    memory : int or str
+        The total memory budget (see ``parse_bytes()``). Default is ``None``,
+        which is unbounded.
+
+    Yields
+    ------
+
+    job : dict
+        A finished job.
+
+    timings : dict
+        The seconds taken by each built product of the job.
+
+    error : Exception
+        The exception raised by the job, otherwise ``None``.
+
+    """
+    workers = _check_workers(workers)
+    memory = parse_bytes(memory)
+    pending = [
+        job for job in jobs if not all(p["skip"] for p in job["products"].values())
+    ]
+    if workers == 1:
+        for job in pending:
+            try:
+                yield job, run_job(job), None
+            except Exception as error:
+                yield job, {}, error
+        return
+
+    running = {}
+    with futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        while pending or running:
+            # admit jobs in order while workers and the memory budget allow
+            for job in list(pending):
+                if len(running) >= workers:
+                    break
+                if _fits(job, running.values(), memory):
+                    pending.remove(job)
+                    running[pool.submit(run_job, job)] = job
+            done, _ = futures.wait(running, return_when=futures.FIRST_COMPLETED)
+            for future in done:
+                job = running.pop(future)
+                error = future.exception()
+                yield job, {} if error else future.result(), error
+
+
+def _fits(job, running, memory):
+    """Whether ``job`` fits the ``memory`` budget next to ``running`` jobs."""
+    if memory is None or job["memory"] is None or not running:
+        return True
+    used = sum(r["memory"] or 0 for r in running)
+    return used + job["memory"] <= memory
+
+
+def main(argv=None):
+    """The ``nhgisxwalk-build`` console script."""
+    parser = argparse.ArgumentParser(
+        prog="nhgisxwalk-build",
+        description=__doc__.split("\n\n")[1].replace("\n", " "),
+    )
+    parser.add_argument("manifest", nargs="?", help="the JSON product manifest")
+    parser.add_argument(
+        "-j", "--workers", type=int, default=1, help="concurrent jobs (default 1)"
+    )
+    parser.add_argument(
+        "-m", "--memory", help="total memory budget of the running jobs, e.g. 64G"
+    )
+    parser.add_argument(
+        "-f", "--force", action="store_true", help="rebuild up-to-date products"
+    )
+    parser.add_argument(
+        "-n", "--dry-run", action="store_true", help="list the jobs and exit"
+    )
+    parser.add_argument(
+        "--template",
+        nargs=3,
+        metavar=("DATA_IN", "DATA_TAB", "OUT_PATH"),
+        help="print the manifest of the NHGIS data products and exit",
+    )
+    args = parser.parse_args(argv)
+
+    if args.template:
+        print(json.dumps(standard_manifest(*args.template), indent=2))
+        return 0
+    if not args.manifest:
+        parser.error("a manifest is required")
+    jobs = plan_jobs(read_manifest(args.manifest), force=args.force)
+
+    statuses = {}
+    for job in jobs:
+        for name, product in job["products"].items():
+            statuses[name] = (
+                ("up to date", None) if product["skip"] else ("pending", None)
+            )
+    if args.dry_run:
+        for i, job in enumerate(jobs):
+            for name in job["products"]:
+                print(f"job {i}\t{job['kind']}\t{name}\t{statuses[name][0]}")
+        return 0
+
+    start = time.perf_counter()
+    for job, timings, error in run_jobs(jobs, args.workers, args.memory):
+        for name, product in job["products"].items():
+            if product["skip"]:
+                continue
+            if error is not None:
+                statuses[name] = (f"failed: {error!r}", None)
+            else:
+                statuses[name] = ("built", timings[name])
+            print(f"{name}\t{statuses[name][0]}", file=sys.stderr)
+
+    # per-product timing
+    width = max(map(len, statuses), default=0)
+    print(f"{'product':<{width}}  {'seconds':>9}  status")
+    for name, (status, seconds) in statuses.items():
+        seconds = "" if seconds is None else f"{seconds:.1f}"
+        print(f"{name:<{width}}  {seconds:>9}  {status}")
+    print(f"{'total':<{width}}  {time.perf_counter() - start:>9.1f}")
+    return int(any(s.startswith("failed") for s, _ in statuses.values()))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
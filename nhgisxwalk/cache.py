@@ -0,0 +1,255 @@
+# This file is part of the Minnesota Population Center's NHGISXWALK.
+# For copyright and licensing information, see the NOTICE and LICENSE files
+# in this project's top-level directory, and also on-line at:
+#   https://github.com/ipums/nhgisxwalk
+
+"""A local, on-disk, content-addressed cache of built crosswalks.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import pickle
+from importlib.metadata import PackageNotFoundError, version
+
+import numpy
+import pandas
+
+# bump when the layout of the cached results changes
+CACHE_VERSION = 1
+
+# extension of cache entries
+ENTRY = "pkl"
+
+
+class CrossWalkCache:
+    """A directory of built crosswalk results, each stored under a key that
+    combines a hash of the base crosswalk, the contents of the tabular files,
+    and the build parameters. An identical rebuild is a lookup. The least
+    recently used entries are evicted once the cache exceeds ``max_bytes``.
+
+    Parameters
+    ----------
+
+    path : str
+        The cache directory. It is created if it does not exist.
+
+    max_bytes : int
+        The maximum total size of the cache entries. Default is ``None``,
+        which is unbounded.
+
+    Attributes
+    ----------
+
+    hits : int
+        The number of lookups found in the cache.
+
+    misses : int
+        The number of lookups not found in the cache.
+
+    Examples
+    --------
+
+    >>> import nhgisxwalk, tempfile
+    >>> cache = nhgisxwalk.CrossWalkCache(tempfile.mkdtemp(), max_bytes=2**30)
+    >>> df = nhgisxwalk.example_crosswalk_data()
+    >>> key = cache.key(df, params={"weight_var": "pop"})
+    >>> cache.get(key) is None
+    True
+
+    >>> cache.put(key, {"xwalk": df})
+    >>> cache.get(key)["xwalk"].equals(df)
+    True
+
+    >>> cache.hits, cache.misses
+    (1, 1)
+
+    >>> cache.invalidate(key)
+    1
+
+    """
+
+    def __init__(self, path, max_bytes=None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits, self.misses = 0, 0
+        os.makedirs(self.path, exist_ok=True)
+
+    def key(self, base, tables=(), params=None):
+        """Content-address a build.
+
+        Parameters
+        ----------
+
+        base : pandas.DataFrame
+            The base crosswalk -- its columns, data types, index, and values.
+
+        tables : iterable
+            The paths of tabular files -- their contents -- or tabular
+            dataframes. ``None`` tables are skipped. Default is ``()``.
+
+        params : dict
+            The (JSON-able) build parameters. Default is ``None``.
+
+        Returns
+        -------
+
+        key : str
+            A hexadecimal digest.
+
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(_package_version().encode())
+        digest.update(str(CACHE_VERSION).encode())
+        digest.update(hash_frame(base).encode())
+        for table in tables:
+            if isinstance(table, pandas.DataFrame):
+                digest.update(hash_frame(table).encode())
+            elif table is not None:
+                digest.update(hash_file(table).encode())
+        params = json.dumps(params, sort_keys=True, default=repr)
+        digest.update(params.encode())
+        return digest.hexdigest()
+
+    def get(self, key):
+        """The stored results of ``key``, or ``None`` if not cached."""
+        entry = self._entry(key)
+        try:
+            with open(entry, "rb") as cached:
+                results = pickle.load(cached)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        # mark the entry as recently used
+        with contextlib.suppress(FileNotFoundError):
+            os.utime(entry)
+        self.hits += 1
+        return results
+
+    def put(self, key, results):
+        """Store ``results`` (a dict of picklable values) under ``key``, then
+        evict least recently used entries until the cache fits ``max_bytes``.
+        The entry is written to a temporary file and then renamed, so
+        concurrent builds never read a partial entry.
+        """
+        entry = self._entry(key)
+        partial = f"{entry}.{os.getpid()}.tmp"
+        with open(partial, "wb") as cached:
+            pickle.dump(results, cached, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(partial, entry)
+        self._evict(keep=entry)
+
+    def invalidate(self, key=None):
+        """Remove the entry of ``key`` -- or every entry (``None``) -- and
+        return the number of entries removed.
+        """
+        entries = [self._entry(key)] if key else self.entries()["entry"]
+        removed = 0
+        for entry in entries:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(entry)
+                removed += 1
+        return removed
+
+    def entries(self):
+        """The cache entries (``entry``, ``key``, ``bytes``, and ``used``),
+        least recently used first.
+        """
+        records = []
+        for name in os.listdir(self.path):
+            key, ext = os.path.splitext(name)
+            if ext != f".{ENTRY}":
+                continue
+            entry = os.path.join(self.path, name)
+            with contextlib.suppress(FileNotFoundError):
+                stat = os.stat(entry)
+                records.append((entry, key, stat.st_size, stat.st_mtime_ns))
+        columns = ["entry", "key", "bytes", "used"]
+        records = pandas.DataFrame.from_records(records, columns=columns)
+        return records.sort_values(by="used", kind="stable", ignore_index=True)
+
+    @property
+    def size(self):
+        """The total size of the cache entries in bytes."""
+        return int(self.entries()["bytes"].sum())
+
+    def _entry(self, key):
+        return os.path.join(self.path, f"{key}.{ENTRY}")
+
+    def _evict(self, keep=None):
+        """Remove the least recently used entries (other than ``keep``) while
+        the cache is larger than ``max_bytes``.
+        """
+        if self.max_bytes is None:
+            return
+        entries = self.entries()
+        total = int(entries["bytes"].sum())
+        for entry, nbytes in zip(entries["entry"], entries["bytes"]):
+            if total <= self.max_bytes:
+                break
+            if entry == keep:
+                continue
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(entry)
+            total -= nbytes
+
+
+def hash_frame(df):
+    """Hash the columns, data types, index, and values of a dataframe."""
+    digest = hashlib.blake2b(digest_size=20)
+    header = [(str(c), str(dtype)) for c, dtype in df.dtypes.items()]
+    digest.update(json.dumps(header).encode())
+    if isinstance(df.index, pandas.RangeIndex):
+        index = df.index
+        digest.update(str((index.start, index.stop, index.step)).encode())
+    else:
+        _hash_values(pandas.Series(df.index), digest)
+    for c in range(df.shape[1]):
+        _hash_values(df.iloc[:, c], digest)
+    return digest.hexdigest()
+
+
+def _hash_values(values, digest):
+    """Update ``digest`` with the values of a series. Numbers are hashed as
+    their bytes, categoricals as their categories and codes, and strings as
+    their lengths and (joined) characters -- much faster than hashing each
+    string with ``pandas.util.hash_pandas_object()``, the fallback.
+    """
+    if isinstance(values.dtype, pandas.CategoricalDtype):
+        _hash_values(pandas.Series(values.cat.categories), digest)
+        digest.update(values.cat.codes.to_numpy().tobytes())
+        return
+    if isinstance(values.dtype, numpy.dtype) and values.dtype.kind in "biufcmM":
+        digest.update(numpy.ascontiguousarray(values.to_numpy()).tobytes())
+        return
+    missing = values.isna().to_numpy()
+    strings = values.to_numpy(dtype=object, na_value="")
+    try:
+        text = "".join(strings)
+    except TypeError:
+        hashes = pandas.util.hash_pandas_object(values, index=False)
+        digest.update(hashes.to_numpy().tobytes())
+        return
+    lengths = numpy.fromiter(map(len, strings), dtype=numpy.int64, count=len(strings))
+    digest.update(missing.tobytes())
+    digest.update(lengths.tobytes())
+    digest.update(text.encode("utf-8", "surrogatepass"))
+
+
+def hash_file(path, chunk_size=2**20):
+    """Hash the contents of a file."""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as content:
+        for chunk in iter(lambda: content.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _package_version():
+    """The installed ``nhgisxwalk`` version -- results of other versions are
+    never reused.
+    """
+    with contextlib.suppress(PackageNotFoundError):
+        return version("nhgisxwalk")
+    return "unknown"
@@ -6,25 +6,44 @@
 """IPUMS/NHGIS Census Crosswalk and Atom Generator
 """
 
+import contextlib
+import copy
+import io
+import itertools
 import os
 import pickle
-import shutil
+import sys
+import zipfile
+from concurrent import futures
 
 import numpy
 import pandas
 
+from .cache import CrossWalkCache
 from .id_codes import (
     bg_gj,
     bgp_gj,
     blk_gj,
     co_gj,
     code_cols,
-    generate_atom_id,
-    generate_geoid,
+    geoid_to_gisjoin,
+    gisjoin_to_geoid,
     gj_code_components,
     id_from,
+    slice_gj_ids,
     tr_gj,
 )
+from .id_keys import (
+    group_keys,
+    is_missing,
+    isin_keys,
+    isin_pairs,
+    key_indexer,
+    pack_ids,
+    setdiff_ids,
+    setdiff_keys,
+)
+from .profiling import StageProfile
 
 # used to fetch/vectorize ID generation functions
 id_generator_funcs = [blk_gj, bgp_gj, bg_gj, tr_gj, co_gj]
@@ -53,12 +72,63 @@ BGP_README = "nhgis_bgp_crosswalk"
 
 # extensions
 CSV = "csv"
+PARQUET = "parquet"
+FEATHER = "feather"
 ZIP = "zip"
 TXT = "txt"
 
+# data product formats -- columnar formats require ``pyarrow``
+FORMATS = [CSV, PARQUET, FEATHER]
+
+# fixed archive member timestamp (the earliest allowed) and permissions
+# (``rw-r--r--``) -- data products are byte-identical however (and whenever)
+# they are written
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+ZIP_ATTR = 0o644 << 16
+
 # NaN string
 NaN = "nan"
 
+# atom aggregation engines
+ENGINES = ["pandas", "numpy"]
+
+# tabular summary file parsers
+TABULAR_ENGINES = ["c", "pyarrow"]
+
+# prefix of the summed numerator columns kept with ``keep_numerators``
+NUMERATOR_PREFIX = "num_"
+
+# coarser (2010) target geographies that nest each target geography
+ROLLUPS = {"bg": ["tr", "co"], "tr": ["co"]}
+
+# the (result-determining) parameters of a shared source pass
+SOURCE_PASS_PARAMS = [
+    "source_year",
+    "source_geo",
+    "base_source_geo",
+    "input_var",
+    "categorical_ids",
+]
+
+# the stages of building a ``GeoCrossWalk`` (in order) -- see ``lazy``
+STAGES = ["joined_base", "source_ids", "target_ids", "atoms", "accounted", "xwalk"]
+
+# ``GeoCrossWalk`` attributes stored in (and restored from) a ``CrossWalkCache``
+CACHED_RESULTS = [
+    "xwalk",
+    "xwalk_name",
+    "input_var",
+    "weight_var",
+    "weight_col",
+    "numerator_col",
+    "src_unacc",
+    "trg_unacc",
+    "supp_geo",
+    "supp_source",
+    "supp_target",
+    "id_memory",
+]
+
 
 class GeoCrossWalk:
     """Generate a temporal crosswalk for census geography data
@@ -105,8 +175,9 @@ class GeoCrossWalk:
     base_source_geo : str
         The base-level crosswalk's source geographic units.
 
-    base_source_table : str
-        The path to the source year's base tabular data.
+    base_source_table : str or pandas.DataFrame
+        The path to the source year's base tabular data -- or the data (see
+        ``tabular_df_from_csv()``).
 
     input_var : str or iterable
         Demographic or housing census variables. For currently available
@@ -143,12 +214,13 @@ class GeoCrossWalk:
         Default is ``True``.
 
     vectorized : bool
-        Vectorize the ``id_codes.id_from()`` function for (potential)
-        speedups (``True``). Default is ``True``.
+        Build GISJOIN IDs from whole columns (see ``id_codes.gisjoin_ids()``)
+        and derive target IDs by slicing whole columns of block IDs (see
+        ``id_codes.slice_gj_ids()``) for speedups (``True``). Default is ``True``.
 
-    supp_source_table : str
+    supp_source_table : str or pandas.DataFrame
         The path to the source year's base supplementary
-        tabular data. Default is ``None``.
+        tabular data -- or the data. Default is ``None``.
 
     drop_supp_col : bool
         Drop the supplementary containing ID generated with the 1990 "no data" process.
@@ -157,6 +229,77 @@ class GeoCrossWalk:
     weights_precision : int
         Round the resultant crosswalk weights to this many decimals. Default is 10.
 
+    categorical_ids : bool
+        Keep the ``GJOIN*``, source, target, and supplementary ID columns
+        dictionary-encoded as categoricals from the base crosswalk through the
+        resultant crosswalk (``True``). Groupbys use observed categories only.
+        The memory saved is reported in ``id_memory``. Default is ``False``.
+
+    engine : str
+        The aggregation engine for atoms -- ``'pandas'`` (``groupby``) or
+        ``'numpy'`` (sums over combined integer source and target codes, with
+        the sources coded from the sorted atoms), which give identical weights.
+        See ``calculate_atoms()``. Default is ``'pandas'``.
+
+    tabular_engine : str
+        The ``pandas.read_csv()`` parser of the base and supplementary tabular
+        data -- ``'c'`` or the multithreaded ``'pyarrow'``. Only the ID
+        components and ``input_var`` columns are read. See
+        ``tabular_df_from_csv()``. Default is ``'c'``.
+
+    cache : nhgisxwalk.CrossWalkCache or str
+        Look up (and store) the resultant crosswalk in a ``CrossWalkCache`` (or
+        a cache directory). The key combines a hash of ``base``, the contents
+        of the tabular files, and the parameters that (may) determine the
+        result, including ``vectorized``, ``engine``, and ``tabular_engine``
+        -- ``keep_base``, ``drop_base_cols``, ``workers``, and ``source_pass``
+        do not. On a hit only the ``CACHED_RESULTS`` attributes are restored;
+        none of the intermediate ``base_tab_df``, ``nopop_base``, etc. are. The
+        cache is not used with ``keep_base``. Default is ``None``.
+
+    workers : int
+        Build the crosswalk in state partitions with a pool of ``workers``
+        processes (``None`` is one per CPU). Blocks nest within states, so the
+        base crosswalk is partitioned by the state of its source blocks -- each
+        partition holds every atom of its sources, also those with a target in
+        another state -- and the tabular data by state. The partitions are
+        merged before a single (national) ``accounting()``, so the resultant
+        crosswalk equals the one built in a single process. The intermediate
+        ``nopop_base``, ``nod_xwalk``, etc. are not kept, ``id_memory`` sums the
+        base memory of the partitions, and ``keep_base`` is not available.
+        Default is ``1``.
+
+    source_pass : dict
+        The target-independent work of crosswalks from one source -- the base
+        crosswalk joined to the tabular data, the source IDs, and the 1990
+        "no data" source IDs. An empty dictionary is filled by the build, and
+        later builds from the same ``base`` and source (to other targets)
+        reuse it. See ``multi_target_xwalks()``. A ``ValueError`` is raised for
+        a source pass of another source. Not used with ``workers`` > 1.
+        Default is ``None``.
+
+    keep_numerators : bool
+        Keep the summed numerators of each atom (``input_var`` times the base
+        weight) in ``numerator_col`` columns of ``xwalk`` (``True``). Only the
+        denominators differ between directions, so ``reverse()`` derives the
+        target to source weights from them. Default is ``False``.
+
+    lazy : bool
+        Evaluate the stages of the build (``STAGES``) on first access of their
+        attributes -- or with ``evaluate()`` -- instead of on instantiation
+        (``True``). Each stage is kept until the stage consuming it is
+        evaluated, e.g. ``atoms`` can be inspected without accounting for
+        unaccounted units. Not available with ``workers`` > 1. Default is
+        ``False``.
+
+    profile : bool or nhgisxwalk.StageProfile
+        Record the wall and CPU time and row counts of each stage of the build
+        -- including ``calculate_atoms()`` and the steps of
+        ``handle_1990_no_data()`` -- in ``profile`` (``True``), or in a shared
+        ``StageProfile``, e.g. one tracing peak memory. The stages within the
+        ``workers`` processes of a partitioned build are not recorded.
+        Default is ``False``.
+
     Attributes
     ----------
 
@@ -182,15 +325,16 @@ class GeoCrossWalk:
         The ``target`` result from ``id_codes.gj_code_components()``.
 
     base_tab_df : pandas.DataFrame
-        Summary file tabular for associated base crosswalk.
-
-    all_base_ids : numpy.array
-        All source IDs from the base crosswalk. Declared in ``handle_1990_no_data``.
+        Summary file tabular for associated base crosswalk -- the
+        ``GISJOIN``, ID component, and ``input_var`` columns.
 
     pop_base_ids : numpy.array
         Source IDs associated with some population/housing value
         from the base crosswalk. Declared in ``handle_1990_no_data``.
 
+    cache_key : str
+        The ``CrossWalkCache`` key of the crosswalk, or ``None``.
+
     nopop_base_ids : numpy.array
         Source IDs associated with no population/housing value
         from the base crosswalk. Declared in ``handle_1990_no_data``.
@@ -212,6 +356,10 @@ class GeoCrossWalk:
         Full weight column names (including prefixes).
         Declared in ``handle_1990_no_data``.
 
+    numerator_col : list
+        The summed numerator column names (``NUMERATOR_PREFIX`` and
+        ``weight_var``) with ``keep_numerators``, otherwise empty.
+
     supp_geo : str
         Type of geographic unit needed to determine unpopulated units. Currently
         this can only be 1990 block groups ('bg') for determining unpopulated
@@ -230,6 +378,19 @@ class GeoCrossWalk:
     trg_unacc : numpy.array
         Unaccounted for / potential target IDs. Declared in ``accounting``.
 
+    id_memory : pandas.DataFrame
+        Memory usage (bytes) of the categorical ID columns in the base and
+        resultant crosswalks versus ``object`` dtype. See ``id_memory_usage()``.
+        Only declared when ``categorical_ids=True``.
+
+    profile : nhgisxwalk.StageProfile or None
+        The stage records of the build (see the ``profile`` parameter).
+
+    joined_base, source_ids, target_ids, atoms, accounted : pandas.DataFrame
+        The results of the intermediate ``STAGES`` of a ``lazy`` crosswalk -- the
+        base crosswalk joined to the tabular data, its source and target IDs,
+        the atoms, and the accounted atoms. Dropped once consumed.
+
     Notes
     -----
 
@@ -435,6 +596,15 @@ class GeoCrossWalk:
         supp_source_table=None,
         drop_supp_col=True,
         weights_precision=10,
+        categorical_ids=False,
+        engine="pandas",
+        tabular_engine="c",
+        cache=None,
+        workers=1,
+        source_pass=None,
+        keep_numerators=False,
+        lazy=False,
+        profile=False,
     ):
         # Set class attributes -------------------------------------------------
         # source and target class attributes
@@ -445,6 +615,7 @@ class GeoCrossWalk:
         if (
             self.source_year == "1990"
             and self.source_geo == "bgp"
+            and (supp_source_table is None or isinstance(supp_source_table, str))
             and not supp_source_table
         ):
             msg = (
@@ -469,6 +640,7 @@ class GeoCrossWalk:
         self.base_weight = base_weight
         self.base_parea = base_parea
         self.wt = weight_prefix
+        self.numerator_col = []
 
         # source geographies within the base crosswalk
         self.base_source_geo = base_source_geo
@@ -481,84 +653,309 @@ class GeoCrossWalk:
         self.base_source_table = base_source_table
 
         # Prepare base for output crosswalk ------------------------------------
+        self.categorical_ids = categorical_ids
+        self.keep_numerators = keep_numerators
+        self.engine = engine
+        self.tabular_engine = tabular_engine
+        self.workers = _check_workers(workers)
         self.base = base
-
-        # fetch all components of that constitute various geographic IDs -------
-        self.fetch_gj_code_components()
-
-        # join the (base) source tabular data to the base crosswalk ------------
-        self.join_source_base_tabular()
-
-        # add source geographic unit ID to the base crosswalk ------------------
-        self.generate_ids("source", vectorized)
-
-        # add target geographic unit ID to the base crosswalk ------------------
-        self.generate_ids("target", vectorized)
-
-        # Create atomic crosswalk ----------------------------------------------
-        # calculate the source to target atom values
-        self.xwalk = calculate_atoms(
-            self.base,
-            weight=self.base_weight,
-            input_var=self.input_var,
-            weight_var=self.weight_var,
-            weight_prefix=self.wt,
-            source_id=self.source,
-            groupby_cols=[self.source, self.target],
-            overwrite_attrs=self,
+        if self.workers > 1 and keep_base:
+            raise ValueError("'keep_base' is not available with 'workers' > 1.")
+        if self.workers > 1 and lazy:
+            raise ValueError("'lazy' is not available with 'workers' > 1.")
+
+        # the parameters that determine the resultant crosswalk
+        params = {
+            "source_year": source_year,
+            "target_year": target_year,
+            "source_geo": source_geo,
+            "target_geo": target_geo,
+            "input_var": input_var,
+            "weight_var": weight_var,
+            "stfips": stfips,
+            "base_source_geo": base_source_geo,
+            "base_weight": base_weight,
+            "base_parea": base_parea,
+            "weight_prefix": weight_prefix,
+            "add_geoid": add_geoid,
+            "drop_supp_col": drop_supp_col,
+            "weights_precision": weights_precision,
+            "categorical_ids": categorical_ids,
+            "keep_numerators": keep_numerators,
+            "vectorized": vectorized,
+            "engine": engine,
+            "tabular_engine": tabular_engine,
+        }
+
+        # check a shared source pass ------------------------------------------
+        if source_pass is not None and self.workers == 1:
+            source = [base, base_source_table, supp_source_table, vectorized]
+            source += [params[p] for p in SOURCE_PASS_PARAMS]
+            source += self._tabular_id_cols()
+            shared = source_pass.get("source", source)
+            if not _same_source(shared, source):
+                raise ValueError("'source_pass' is of another source.")
+            source_pass.setdefault("source", source)
+
+        # the (pending) stages of the workflow and their parameters ------------
+        self.lazy = lazy
+        self.profile = StageProfile() if profile is True else profile or None
+        self.cache_key = None
+        self._pending = list(STAGES)
+        self._stage_kws = {
+            "params": params,
+            "cache": cache,
+            "vectorized": vectorized,
+            "supp_source_table": supp_source_table,
+            "drop_supp_col": drop_supp_col,
+            "drop_base_cols": drop_base_cols,
+            "keep_base": keep_base,
+            "add_geoid": add_geoid,
+            "weights_precision": weights_precision,
+            "source_pass": source_pass,
+        }
+        if not lazy:
+            self.evaluate()
+
+    def __getattr__(self, name):
+        """Evaluate a pending stage (see ``STAGES``) of a lazy crosswalk on first
+        access -- the ``CACHED_RESULTS`` are results of the ``xwalk`` stage.
+        Only called for attributes that are not set.
+        """
+        pending = self.__dict__.get("_pending")
+        if pending and not self.__dict__.get("_evaluating"):
+            stage = "xwalk" if name in CACHED_RESULTS else name
+            if stage in pending:
+                self.evaluate(stage)
+                if name in self.__dict__:
+                    return self.__dict__[name]
+        raise AttributeError(
+            f"'{type(self).__name__}' object has no attribute '{name}'"
         )
 
-        """-------------------------------------------------------------------------
-        Special case for handling 1990 data, where blocks without population/housing
-        where excluded from the publicly-released summary files
-        -------------------------------------------------------------------------"""
-        if self.source_year == "1990" or self.target_year == "1990":
-            if self.source_geo == "bgp" or self.target_geo == "bgp":
-                # block group IDs are needed to determine
-                # populated blocks in 1990
-                self.supp_geo = "bg"
+    def evaluate(self, stage="xwalk"):
+        """Evaluate the workflow up to (and including) a stage -- see
+        ``STAGES``. Stages that are already evaluated are not run again. With
+        ``lazy`` the result of each stage is kept in its attribute until the
+        stage that consumes it is evaluated.
 
-                if self.source_geo == "bgp":
-                    __supp_src = self.supp_geo + self.source_year + self.code_type
-                    self.supp_source = __supp_src
-                    self.supp_target = None
-                else:
-                    self.supp_source = None
-                    __supp_tgt = self.supp_geo + self.target_year + self.code_type
-                    self.supp_target = __supp_tgt
+        Parameters
+        ----------
 
-                # call special function
-                handle_1990_no_data(self, vectorized, supp_source_table, drop_supp_col)
+        stage : str
+            The last stage to evaluate. Default is ``'xwalk'``.
 
-            else:
-                raise RuntimeError("Only 'bgp' is currently functional.")
+        """
+        if stage not in STAGES:
+            raise ValueError(f"The 'stage' must be one of {STAGES}, not '{stage}'.")
+        pending = self.__dict__.get("_pending")
+        if not pending or stage not in pending:
+            return
+        self._evaluating = True
+        try:
+            # look up an identical, previously built crosswalk
+            if len(pending) == len(STAGES) and self._cache_lookup(stage):
+                pending.clear()
+            for name in STAGES[: STAGES.index(stage) + 1]:
+                if name not in pending:
+                    continue
+                # partitioned builds join and identify within the partitions
+                if self.workers == 1 or name not in STAGES[:3]:
+                    if self.lazy and name in ["accounted", "xwalk"]:
+                        previous = STAGES[STAGES.index(name) - 1]
+                        self.xwalk = self.__dict__[previous].copy(deep=False)
+                    rows_in = self._stage_rows()
+                    with _profiled(self.profile, name, self.xwalk_name, rows_in) as rec:
+                        getattr(self, f"_{name}_stage")()
+                        rec["rows_out"] = self._stage_rows()
+                    if self.lazy:
+                        self._keep_stage(name)
+                pending.remove(name)
+        finally:
+            del self._evaluating
+        if not pending:
+            del self._pending, self._stage_kws
+
+    def _stage_rows(self):
+        """The number of rows of the crosswalk -- or of the base crosswalk,
+        before the atoms are built.
+        """
+        df = self.__dict__.get("xwalk", self.__dict__.get("base"))
+        return None if df is None else len(df)
 
-        # keep only the necessary base columns ---------------------------------
-        if drop_base_cols:
-            self._drop_base_cols()
+    def _keep_stage(self, name):
+        """Keep the result of a lazily evaluated stage and drop the results of
+        the stages it consumed.
+        """
+        if name == "joined_base":
+            result = self.base.copy(deep=False)
+        elif name == "source_ids":
+            result = self.base[self.source]
+        elif name == "target_ids":
+            result = self.base[self.target]
+        elif name == "xwalk":
+            result = self.xwalk
+        else:
+            result = self.__dict__.pop("xwalk")
+        self.__dict__[name] = result
+        consumed = {"atoms": STAGES[:3], "accounted": ["atoms"], "xwalk": ["accounted"]}
+        for stage in consumed.get(name, []):
+            self.__dict__.pop(stage, None)
+
+    def _cache_lookup(self, stage):
+        """Key the build in the ``cache`` (before the base is consumed) and, for
+        the ``xwalk`` stage, restore an identical, previously built crosswalk.
+        Returns whether it was restored.
+        """
+        kws = self._stage_kws
+        cache = kws["cache"]
+        if cache is None or kws["keep_base"]:
+            return False
+        if not isinstance(cache, CrossWalkCache):
+            kws["cache"] = cache = CrossWalkCache(cache)
+        tables = [self.base_source_table, kws["supp_source_table"]]
+        with _profiled(self.profile, "cache", self.xwalk_name, len(self.base)) as rec:
+            self.cache_key = cache.key(self.base, tables=tables, params=kws["params"])
+            cached = cache.get(self.cache_key) if stage == "xwalk" else None
+            rec["rows_out"] = None if cached is None else len(cached["xwalk"])
+        if cached is None:
+            return False
+        self.__dict__.update(cached)
+        self.fetch_gj_code_components()
+        del self.base
+        return True
 
-        # Step 9 from the General Workflow -------------------------------------
-        self.accounting()
+    def _joined_base_stage(self):
+        """Join the (base) source tabular data to the base crosswalk -- or reuse
+        the joined base crosswalk (with source IDs) of a ``source_pass``.
+        """
+        # fetch all components of that constitute various geographic IDs -------
+        self.fetch_gj_code_components()
+
+        source_pass = self._stage_kws["source_pass"]
+        if source_pass and "base" in source_pass:
+            # reuse the joined base crosswalk with source IDs and their keys
+            self.base = source_pass["base"].copy(deep=False)
+            self.base_tab_df = source_pass["base_tab_df"]
+            self.id_keys = dict(source_pass["id_keys"])
+        else:
+            if self.categorical_ids:
+                self.base = categorize_ids(
+                    self.base, [self.base_source_col, self.base_target_col]
+                )
+
+            # join the (base) source tabular data to the base crosswalk --------
+            self.join_source_base_tabular()
+
+    def _source_ids_stage(self):
+        """Add the source geographic unit IDs to the base crosswalk."""
+        source_pass = self._stage_kws["source_pass"]
+        if not (source_pass and "base" in source_pass):
+            self.generate_ids("source", self._stage_kws["vectorized"])
+            self._shared_base = self.base.copy(deep=False)
+
+    def _target_ids_stage(self):
+        """Add the target geographic unit IDs to the base crosswalk."""
+        self.generate_ids("target", self._stage_kws["vectorized"])
+
+    def _atoms_stage(self):
+        """Build the atoms of the crosswalk from the base crosswalk -- in state
+        partitions with ``workers`` > 1 -- reusing or filling a ``source_pass``.
+        The base crosswalk is consumed (unless ``keep_base``).
+        """
+        kws = self._stage_kws
+        if self.workers > 1:
+            partition_kws = {
+                **kws["params"],
+                "add_geoid": False,
+                "stfips": None,
+                "weights_precision": None,
+            }
+            supp_source_table = kws["supp_source_table"]
+            self._base_memory = self._build_partitions(partition_kws, supp_source_table)
+        else:
+            # pack the source and target IDs into integer keys -----------------
+            self.pack_base_ids()
+            source_pass = kws["source_pass"]
+            if source_pass is not None and "base" not in source_pass:
+                shared_keys = [self.base_source_col, self.tabular_code_label]
+                shared_keys += [self.source]
+                source_pass["base"] = self.__dict__.pop("_shared_base")
+                source_pass["base_tab_df"] = self.base_tab_df
+                source_pass["id_keys"] = {k: self.id_keys[k] for k in shared_keys}
+            self.__dict__.pop("_shared_base", None)
+
+            # Create atomic crosswalk ------------------------------------------
+            # calculate the source to target atom values
+            profile, rows_in = self.profile, len(self.base)
+            with _profiled(profile, "calculate_atoms", self.xwalk_name, rows_in) as rec:
+                self.xwalk = calculate_atoms(
+                    self.base,
+                    weight=self.base_weight,
+                    input_var=self.input_var,
+                    weight_var=self.weight_var,
+                    weight_prefix=self.wt,
+                    source_id=self.source,
+                    groupby_cols=[self.source, self.target],
+                    overwrite_attrs=self,
+                    id_keys=self.id_keys,
+                    engine=self.engine,
+                    numerator_prefix=NUMERATOR_PREFIX if self.keep_numerators else None,
+                )
+                rec["rows_out"] = len(self.xwalk)
+
+            """---------------------------------------------------------------------
+            Special case for handling 1990 data, where blocks without population/housing
+            where excluded from the publicly-released summary files
+            ---------------------------------------------------------------------"""
+            if self._set_supp_geo():
+                # call special function
+                rows_in = len(self.xwalk)
+                with _profiled(
+                    profile, "handle_1990_no_data", self.xwalk_name, rows_in
+                ) as rec:
+                    handle_1990_no_data(
+                        self,
+                        kws["vectorized"],
+                        kws["supp_source_table"],
+                        kws["drop_supp_col"],
+                        source_pass=source_pass,
+                    )
+                    rec["rows_out"] = len(self.xwalk)
+            if kws["drop_base_cols"]:
+                self._drop_base_cols()
+            if self.categorical_ids:
+                self._base_memory = id_memory_usage(self.base)
 
         # discard building base if not needed ----------------------------------
-        if not keep_base:
+        if not kws["keep_base"]:
             del self.base
 
+    def _accounted_stage(self):
+        """Step 9 from the General Workflow -- see ``accounting()``."""
+        self.accounting()
+        del self.id_keys
+
+    def _xwalk_stage(self):
+        """Finish the resultant crosswalk -- GEOIDs, state subset, rounding, and
+        categorical IDs -- sort it, and store it in the ``cache``.
+        """
+        kws = self._stage_kws
+
         # add column(s) for the original Census GEOID --------------------------
         # -- this options is not available for "bgp" (block group parts)
-        if add_geoid:
+        if kws["add_geoid"]:
             for xdir in [self.source, self.target]:
                 if xdir.startswith("bgp"):
                     continue
                 else:
                     # col = "tr%s" % target_year
-                    self.xwalk[xdir[:-2] + "ge"] = self.xwalk[xdir].map(
-                        lambda x: generate_geoid(x)
-                    )
+                    self.xwalk[xdir[:-2] + "ge"] = gisjoin_to_geoid(self.xwalk[xdir])
 
             # reorder columns
-            _id_cols = [c for c in self.xwalk.columns if c not in self.weight_col]
-            self.xwalk = self.xwalk[_id_cols + self.weight_col]
+            value_cols = self.weight_col + self.numerator_col
+            _id_cols = [c for c in self.xwalk.columns if c not in value_cols]
+            self.xwalk = self.xwalk[_id_cols + value_cols]
 
         # extract a subset of national resultant crosswalk to target state (if desired)
         if self.stfips:
@@ -568,12 +965,111 @@ class GeoCrossWalk:
             self.xwalk_name += "_" + self.stfips
 
         # round the weights in the resultant crosswalk (if desired)
-        if weights_precision:
-            self.xwalk = round_weights(self.xwalk, decimals=weights_precision)
+        if kws["weights_precision"]:
+            self.xwalk = round_weights(self.xwalk, decimals=kws["weights_precision"])
+
+        # dictionary-encode the resultant IDs (if desired)
+        if self.categorical_ids:
+            self.xwalk = categorize_ids(self.xwalk)
+            self.id_memory = pandas.concat(
+                {
+                    "base": self.__dict__.pop("_base_memory"),
+                    "xwalk": id_memory_usage(self.xwalk),
+                }
+            )
 
         # sort the resultant values
         self.xwalk.sort_values(by=[self.source, self.target], **SORT_PARAMS)
 
+        # store the results for identical rebuilds
+        if self.cache_key:
+            results = {a: getattr(self, a) for a in CACHED_RESULTS if hasattr(self, a)}
+            kws["cache"].put(self.cache_key, results)
+
+    def _set_supp_geo(self):
+        """Set the supplementary geography attributes of the 1990 no-data
+        process, and return whether it applies.
+        """
+        if self.source_year == "1990" or self.target_year == "1990":
+            if self.source_geo == "bgp" or self.target_geo == "bgp":
+                # block group IDs are needed to determine
+                # populated blocks in 1990
+                self.supp_geo = "bg"
+
+                if self.source_geo == "bgp":
+                    __supp_src = self.supp_geo + self.source_year + self.code_type
+                    self.supp_source = __supp_src
+                    self.supp_target = None
+                else:
+                    self.supp_source = None
+                    __supp_tgt = self.supp_geo + self.target_year + self.code_type
+                    self.supp_target = __supp_tgt
+                return True
+
+            else:
+                raise RuntimeError("Only 'bgp' is currently functional.")
+        return False
+
+    def _build_partitions(self, partition_kws, supp_source_table):
+        """Build the atoms of the state partitions of the crosswalk in a pool of
+        processes (see the ``workers`` parameter) and merge them. The tabular
+        data are read once. The unaccounted for IDs of each partition are
+        candidates only -- IDs are unaccounted for when not in any partition.
+        Returns the summed base ID memory usage for ``categorical_ids``.
+        """
+        # read the tabular data once and partition them by state
+        self.base_tab_df = tabular_df_from_csv(
+            self.base_source_table,
+            self._tabular_id_cols(),
+            num_cols=self.input_var,
+            engine=self.tabular_engine,
+        )
+        tab_states = dict(state_partitions(self.base_tab_df, self.tabular_code_label))
+        supp_tab_df, supp_states = None, {}
+        if self._set_supp_geo():
+            supp_tab_df = _supp_tabular_df(self, supp_source_table)
+            supp_states = dict(state_partitions(supp_tab_df, self.tabular_code_label))
+
+        # partition the base by source block state -- records without a
+        # source block (only target candidates) join the last partition
+        partitions = list(state_partitions(self.base, self.base_source_col))
+        if len(partitions) > 1 and partitions[-1][0] == NaN:
+            (stfips, last), (_, no_source) = partitions[-2:]
+            partitions[-2:] = [(stfips, pandas.concat([last, no_source]))]
+        tasks = (
+            (
+                base,
+                tab_states.get(stfips, self.base_tab_df.iloc[:0]),
+                None
+                if supp_tab_df is None
+                else supp_states.get(stfips, supp_tab_df.iloc[:0]),
+                partition_kws,
+            )
+            for stfips, base in partitions
+        )
+        results = _pool_starmap(_build_partition, tasks, self.workers)
+
+        # merge the partitions -- source states are in sorted order
+        self.__dict__.update(results[0])
+        # (partitions of mostly missing IDs may infer untyped, object columns)
+        self.xwalk = pandas.concat([r["xwalk"] for r in results], ignore_index=True)
+        self.xwalk = self.xwalk.infer_objects()
+        src_unacc = [r["src_unacc"] for r in results]
+        if supp_tab_df is not None:
+            # all (national) 1990 block group parts are source candidates
+            src_unacc.append(supp_tab_df[self.tabular_code_label].to_numpy())
+        trg_unacc = [r["trg_unacc"] for r in results]
+        self.src_unacc = setdiff_ids(
+            numpy.concatenate(src_unacc), self.xwalk[self.source]
+        )
+        self.trg_unacc = setdiff_ids(
+            numpy.concatenate(trg_unacc), self.xwalk[self.target]
+        )
+        self.id_keys = None
+
+        if self.categorical_ids:
+            return sum(r["id_memory"].loc["base"] for r in results)
+
     def _drop_base_cols(self):
         """Retain only ID columns and original weights in the base crosswalk."""
         retain = [
@@ -601,9 +1097,16 @@ class GeoCrossWalk:
 
     def join_source_base_tabular(self):
         """Join tabular attributes to base crosswalk."""
-        # read in national tabular data
-        data_types = str_types(self.base_source_gj_components["Variable"])
-        self.base_tab_df = pandas.read_csv(self.base_source_table, dtype=data_types)
+        # read in national tabular data -- only the IDs and input variables
+        if isinstance(self.base_source_table, pandas.DataFrame):
+            self.base_tab_df = self.base_source_table
+        else:
+            self.base_tab_df = tabular_df_from_csv(
+                self.base_source_table,
+                self._tabular_id_cols(),
+                num_cols=self.input_var,
+                engine=self.tabular_engine,
+            )
 
         # Special case for 2000 blocks (of 2000 bgp)-- needs Urban/Rural code
         # For more details see:
@@ -611,15 +1114,57 @@ class GeoCrossWalk:
         # and
         # nhgisxwalk/notebooks/build_subset.ipynb
 
-        # do left merge
-        self.base = pandas.merge(
-            left=self.base,
-            right=self.base_tab_df,
-            how="left",
-            left_on=self.base_source_col,
-            right_on=self.tabular_code_label,
-            validate="many_to_many",
+        # pack the base and tabular block IDs into integer keys
+        codec, (base_keys, tab_keys) = pack_ids(
+            self.base[self.base_source_col], self.base_tab_df[self.tabular_code_label]
         )
+        indexer = key_indexer(base_keys, tab_keys)
+        overlap = self.base.columns.intersection(self.base_tab_df.columns)
+
+        if indexer is not None and overlap.empty:
+            # do left join by (unique) tabular record position
+            tab_records = self.base_tab_df.reset_index(drop=True).reindex(indexer)
+            tab_records.index = self.base.index
+            self.base = pandas.concat([self.base, tab_records], axis=1)
+            self.base.reset_index(drop=True, inplace=True)
+        else:
+            # do left merge
+            self.base = pandas.merge(
+                left=self.base,
+                right=self.base_tab_df,
+                how="left",
+                left_on=self.base_source_col,
+                right_on=self.tabular_code_label,
+                validate="many_to_many",
+            )
+            base_keys = codec.encode(self.base[self.base_source_col])
+
+        self.id_keys = {
+            self.base_source_col: (codec, base_keys),
+            self.tabular_code_label: (codec, tab_keys),
+        }
+
+    def _tabular_id_cols(self):
+        """The tabular ID columns -- ``GISJOIN`` and any ID components."""
+        id_cols = [self.tabular_code_label]
+        for geog, year in [
+            (self.source_geo, self.source_year),
+            (self.target_geo, self.target_year),
+        ]:
+            if geog == "bgp":
+                id_cols += code_cols(geog, year)
+        return id_cols
+
+    def pack_base_ids(self):
+        """Pack the source and target IDs of the base crosswalk into integer keys
+        (see ``nhgisxwalk.id_keys``) for grouping and set differences. Keys are
+        only unpacked into IDs for the resultant crosswalk.
+        """
+        for col in [self.source, self.target]:
+            if col in self.id_keys:
+                continue
+            codec, (keys,) = pack_ids(self.base[col])
+            self.id_keys[col] = codec, keys
 
     def generate_ids(self, id_type, vect, supp=False, supp_base=None, return_df=False):
         """Add source or target geographic unit ID to the base crosswalk.
@@ -676,7 +1221,7 @@ class GeoCrossWalk:
         if not supp and geog == "bgp":
             cols, func = code_cols(geog, year), bgp_gj
             args = df, cols
-            df = func(*args, cname=cname)
+            df = func(*args, cname=cname, vectorized=vect)
         elif id_type == "target" or supp_bgp:
             if id_type == "source" and geog == "blk":
                 raise AttributeError()
@@ -690,6 +1235,10 @@ class GeoCrossWalk:
             msg = "Error in generate_ids params: " + msg
             raise RuntimeError(msg)
 
+        # dictionary-encode the IDs (if desired)
+        if self.categorical_ids:
+            df[cname] = df[cname].astype("category")
+
         # return the dataframe for supplementary scenarios
         if return_df:
             return df
@@ -699,25 +1248,11 @@ class GeoCrossWalk:
 
         # Isolate unaccounted for source geographies
         if not hasattr(self, "src_unacc"):
-            self.src_unacc = numpy.setdiff1d(
-                self.base[self.source].tolist(),
-                self.xwalk[self.source].tolist(),
-            )
+            self.src_unacc = self._unaccounted(self.source)
 
         # Isolate unaccounted for target geographies
-        self.trg_unacc = numpy.setdiff1d(
-            self.base[self.target].tolist(),
-            self.xwalk[self.target].tolist(),
-        )
-
-        # Append unaccounted source and target atoms
-        # start with the last index of the resultant crosswalk
-        endex = self.xwalk.index[-1]
-        # dict for source and target 'unaccounted for' ids
-        unaccounted = {self.source_geo: self.src_unacc}
-        unaccounted.update({self.target_geo: self.trg_unacc})
-        # check for these character lengths in column names for each record append
-        lsrc, ltrg = len(self.source_geo), len(self.target_geo)
+        if not hasattr(self, "trg_unacc"):
+            self.trg_unacc = self._unaccounted(self.target)
 
         # confirm variable data types
         if not hasattr(self, "weight_col"):
@@ -726,26 +1261,142 @@ class GeoCrossWalk:
                 self.wt if self.wt else "", self.weight_var
             )
 
-        # iterate over {geography_type: unaccounted_for_ids}
-        for geo, unaccs in unaccounted.items():
-            # move to the geography type if there are no missing IDs
-            if unaccs.size == 0:
-                continue
-            # iterate over each unaccounted for id}
-            for idx, unacc in enumerate(unaccs, 1):
-                endex += idx
-                # append one record to the dataframe
-                self.xwalk.loc[endex] = [
-                    unacc
-                    if (c.split("_")[0][:lsrc] == geo or c.split("_")[0][:ltrg] == geo)
-                    else 0.0
-                    if c in self.weight_col
-                    else numpy.nan
-                    for c in self.xwalk.columns
-                ]
+        # build one frame of unaccounted for source and target records
+        unaccounted = [
+            pandas.DataFrame({col: unaccs})
+            for col, unaccs in [
+                (self.source, self.src_unacc),
+                (self.target, self.trg_unacc),
+            ]
+            if len(unaccs)
+        ]
+        if not unaccounted:
+            return
+        unaccounted = pandas.concat(unaccounted, ignore_index=True)
+        unaccounted = unaccounted.reindex(columns=self.xwalk.columns)
+        value_cols = self.weight_col + getattr(self, "numerator_col", [])
+        id_cols = [c for c in self.xwalk.columns if c not in value_cols]
+        unaccounted = unaccounted.astype(self.xwalk[id_cols].dtypes.to_dict())
+        unaccounted[value_cols] = 0.0
+
+        # append unaccounted source and target atoms after the last index
+        unaccounted.index += self.xwalk.index[-1] + 1
+        self.xwalk = pandas.concat([self.xwalk, unaccounted])
+
+    def _unaccounted(self, col):
+        """Base crosswalk IDs missing from the resultant crosswalk -- IDs in the
+        resultant crosswalk that can not be packed are not in the base anyway.
+        """
+        codec, keys = self.id_keys[col]
+        xwalk_keys = codec.encode(self.xwalk[col], strict=False)
+        return codec.decode(setdiff_keys(keys, xwalk_keys))
+
+    def rollup(self, target_geo, weights_precision=None):
+        """Derive the crosswalk of the same source to a coarser target
+        geography from the resultant crosswalk -- see ``rollup_xwalk()`` --
+        instead of building it from the base crosswalk.
+
+        Parameters
+        ----------
+
+        target_geo : str
+            The coarser target geographic unit (see ``ROLLUPS``).
+
+        weights_precision : int
+            Round the rolled up weights. Roll up an unrounded crosswalk
+            (``weights_precision=None``), as summed rounded weights are not
+            the rounded weights. Default is ``None``.
+
+        Returns
+        -------
+
+        rolled : nhgisxwalk.GeoCrossWalk
+            A copy with the coarser ``target``, ``xwalk``, ``xwalk_name``, and
+            ``trg_unacc``. The intermediate ``base``, ``nopop_base``, and
+            ``nod_xwalk`` of the finer target are not kept.
+
+        """
+        self.evaluate()
+        rolled = copy.copy(self)
+        for attr in ["base", "nopop_base", "nod_xwalk"]:
+            rolled.__dict__.pop(attr, None)
+        rolled.target_geo = target_geo
+        rolled.target = target_geo + self.target_year + self.code_type
+        rolled.target_gj_components = gj_code_components(self.target_year, target_geo)
+        rolled.xwalk_name = self.xwalk_name.replace(
+            self.target[:-2], rolled.target[:-2]
+        )
+        rolled.xwalk = rollup_xwalk(self.xwalk, self.source, self.target, target_geo)
+        if weights_precision:
+            rolled.xwalk = round_weights(rolled.xwalk, decimals=weights_precision)
+
+        # the coarser targets of which no target is accounted for
+        accounted = rolled.xwalk[self.source].notna().to_numpy()
+        rolled.trg_unacc = setdiff_ids(
+            slice_gj_ids(target_geo, self.target_year, self.trg_unacc),
+            rolled.xwalk.loc[accounted, rolled.target],
+        )
+        if hasattr(self, "id_memory"):
+            rolled.id_memory = pandas.concat(
+                {
+                    "base": self.id_memory.loc["base"],
+                    "xwalk": id_memory_usage(rolled.xwalk),
+                }
+            )
+        return rolled
+
+    def reverse(self, weights_precision=None):
+        """Derive the crosswalk of the target to the source geography from the
+        same atoms -- see ``reverse_xwalk()`` -- instead of building it. The
+        crosswalk must be built with ``keep_numerators``.
+
+        Parameters
+        ----------
+
+        weights_precision : int
+            Round the reverse weights. Default is ``None``.
+
+        Returns
+        -------
+
+        reversed : nhgisxwalk.GeoCrossWalk
+            A copy with the source and target (years, geographies, ID
+            components, supplementary units, and unaccounted for IDs) swapped,
+            and the reverse ``xwalk`` and ``xwalk_name``. The intermediate
+            ``base``, ``nopop_base``, and ``nod_xwalk`` are not kept.
+
+        """
+        self.evaluate()
+        if not getattr(self, "numerator_col", None):
+            raise ValueError("Reversing a crosswalk needs 'keep_numerators'.")
+        rev = copy.copy(self)
+        for attr in ["base", "nopop_base", "nod_xwalk"]:
+            rev.__dict__.pop(attr, None)
+        for src_attr, trg_attr in [
+            ("source_year", "target_year"),
+            ("source_geo", "target_geo"),
+            ("source", "target"),
+            ("source_gj_components", "target_gj_components"),
+            ("supp_source", "supp_target"),
+            ("src_unacc", "trg_unacc"),
+        ]:
+            if hasattr(self, src_attr):
+                setattr(rev, src_attr, getattr(self, trg_attr))
+                setattr(rev, trg_attr, getattr(self, src_attr))
+        # (keep any state suffix)
+        name = f"nhgis_{self.source[:-2]}_{self.target[:-2]}"
+        rev.xwalk_name = f"nhgis_{rev.source[:-2]}_{rev.target[:-2]}"
+        rev.xwalk_name += self.xwalk_name[len(name) :]
+        rev.xwalk = reverse_xwalk(
+            self.xwalk, self.source, self.target, self.numerator_col, self.weight_col
+        )
+        if weights_precision:
+            rev.xwalk = round_weights(rev.xwalk, decimals=weights_precision)
+        return rev
 
     def xwalk_to_pickle(self, path="", fext=".pkl"):
         """Write the produced ``GeoCrossWalk`` object."""
+        self.evaluate()
         with open(path + self.xwalk_name + fext, "wb") as pkl_xwalk:
             pickle.dump(self, pkl_xwalk, protocol=2)
 
@@ -793,6 +1444,20 @@ def extract_state(in_xwalk, stfips, xwalk_name, endpoint, code="gj", sort_by=Non
     """
 
     # make sure the crosswalk isn't already an extracted state or overwritten
+    _check_national(xwalk_name, stfips)
+
+    # set extraction condition -- 'nan' extracts geographies with no state
+    condition = _state_keys(in_xwalk[endpoint], code=code) == stfips.lower()
+    out_xwalk = in_xwalk[condition.to_numpy()].copy()
+
+    if sort_by:
+        out_xwalk.sort_values(by=sort_by, **SORT_PARAMS)
+
+    return out_xwalk
+
+
+def _check_national(xwalk_name, stfips):
+    """Make sure a crosswalk isn't already an extracted state."""
     check_state_label = xwalk_name.split("_")[-1]
     if check_state_label.isnumeric() or check_state_label == NaN:
         msg = "This crosswalk may already be a state subset. "
@@ -800,20 +1465,47 @@ def extract_state(in_xwalk, stfips, xwalk_name, endpoint, code="gj", sort_by=Non
         msg += f"\txwalk_name: '{xwalk_name}', stfips: {stfips}'"
         raise RuntimeError(msg)
 
-    # set NaN (null) extraction condition
-    nan = stfips.lower() == NaN
 
-    # set extraction condition
-    extract_lambda = (
-        lambda x: nan if str(x) == NaN else _state(x, stfips=stfips, code=code)
-    )
-    condition = in_xwalk[endpoint].map(extract_lambda)
-    out_xwalk = in_xwalk[condition].copy()
+def state_partitions(in_xwalk, endpoint, code="gj"):
+    """Partition a national crosswalk by state in a single pass. The state of
+    each record is sliced from the ``endpoint`` IDs once, and the crosswalk is
+    reordered by state once, so each partition is a slice (view) of it.
 
-    if sort_by:
-        out_xwalk.sort_values(by=sort_by, **SORT_PARAMS)
+    Parameters
+    ----------
 
-    return out_xwalk
+    in_xwalk : pandas.DataFrame
+        See ``extract_state()``.
+
+    endpoint : str
+        Column name to partition on.
+
+    code : str
+        The code type used in indexing unique states. Default is ``'gj'``.
+
+    Yields
+    ------
+
+    stfips : str
+        The state FIPS code, in sorted order. Geographies with no associated
+        state are last, in the ``'nan'`` partition.
+
+    partition : pandas.DataFrame
+        The records of the state, in their original order.
+
+    """
+
+    # 'nan' sorts after all state FIPS codes
+    states = _state_keys(in_xwalk[endpoint], code=code)
+    codes, stfips = pandas.factorize(states, sort=True)
+
+    # order the records by state -- stable, so the original order is kept
+    # within each state -- with a single copy of the crosswalk
+    by_state_xwalk = in_xwalk.take(_stable_order(codes))
+    stops = numpy.cumsum(numpy.bincount(codes, minlength=len(stfips)))
+    starts = numpy.r_[0, stops[:-1]]
+    for st, start, stop in zip(stfips, starts, stops):
+        yield st, by_state_xwalk.iloc[start:stop]
 
 
 def extract_unique_stfips(cls=None, df=None, endpoint="target", code="gj"):
@@ -849,7 +1541,7 @@ def extract_unique_stfips(cls=None, df=None, endpoint="target", code="gj"):
         endpoint = getattr(cls, endpoint.lower())
         df = cls.xwalk
 
-    unique_stfips = set(df[endpoint].map(lambda x: _state(x, code=code)))
+    unique_stfips = set(_state_keys(df[endpoint], code=code).unique())
 
     return unique_stfips
 
@@ -875,6 +1567,60 @@ def xwalk_df_to_csv(cls=None, dfkwds=dict(), path=""):
 
     """
 
+    xwalk, xwalk_name = _xwalk_to_write(cls, dfkwds)
+
+    file_name = f"{xwalk_name}.{CSV}"
+    file_name = os.path.join(path, file_name)
+
+    xwalk.to_csv(file_name, index=False)
+
+
+def xwalk_df_to_columnar(cls=None, dfkwds=dict(), path="", fmt=PARQUET):
+    """Write the produced crosswalk to ``.parquet`` or ``.feather``. ID columns
+    are dictionary-encoded (see ``categorize_ids()``) and weights are stored
+    as typed floats, so the crosswalk is loaded without parsing any strings.
+    Both formats require ``pyarrow``.
+
+    Parameters
+    ----------
+
+    cls : nhgisxwalk.GeoCrossWalk
+        See ``xwalk_df_to_csv()``. Default is ``None``.
+
+    dfkwds : dict()
+        See ``xwalk_df_to_csv()``. Default is ``dict()``.
+
+    path : str
+        Directory path without the file name. Default is ``''``.
+
+    fmt : str
+        The columnar format -- ``'parquet'`` or ``'feather'``.
+        Default is ``'parquet'``.
+
+    """
+
+    if fmt not in FORMATS[1:]:
+        raise ValueError(f"'fmt' must be one of {FORMATS[1:]}, not '{fmt}'.")
+
+    xwalk, xwalk_name = _xwalk_to_write(cls, dfkwds)
+
+    file_name = f"{xwalk_name}.{fmt}"
+    file_name = os.path.join(path, file_name)
+
+    _to_columnar(xwalk, file_name, fmt)
+
+
+def _to_columnar(xwalk, file_name, fmt):
+    """Write a crosswalk with dictionary-encoded IDs to a columnar file."""
+    xwalk = categorize_ids(xwalk).reset_index(drop=True)
+    if fmt == PARQUET:
+        xwalk.to_parquet(file_name, index=False)
+    else:
+        xwalk.to_feather(file_name)
+
+
+def _xwalk_to_write(cls, dfkwds):
+    """Fetch the crosswalk and its (state-level) name to write out."""
     if cls:
         stfips = cls.stfips
         xwalk_name = cls.xwalk_name
@@ -888,18 +1634,24 @@ def xwalk_df_to_csv(cls=None, dfkwds=dict(), path=""):
         xwalk = dfkwds["df"]
     if stfips and xwalk_name.split("_")[-1] != stfips:
         xwalk_name += "_" + stfips
-
-    file_name = f"{xwalk_name}.{CSV}"
-    file_name = os.path.join(path, file_name)
-
-    xwalk.to_csv(file_name, index=False)
+    return xwalk, xwalk_name
 
 
 def xwalk_df_from_csv(
-    fname, path="", archived=False, remove_unpacked=False, **read_csv
+    fname,
+    path="",
+    archived=False,
+    remove_unpacked=False,  # noqa: ARG001
+    categorical_ids=False,
+    **read_csv,
 ):
     """Read in a produced crosswalk from an archived ``.zip`` or ``.csv``.
-    Pass in ``pandas.read_csv()`` keyword arguments with ``**kwargs``.
+    Pass in ``pandas.read_csv()`` keyword arguments with ``**kwargs``. An
+    archived crosswalk is streamed straight out of the ``.zip``, so nothing is
+    extracted to disk. For chunked reads pass ``chunksize``, and for
+    multithreaded parsing pass ``engine="pyarrow"`` -- the column types are
+    then declared to ``pyarrow.csv`` from ``dtype`` (only ``dtype`` and
+    ``usecols`` are supported), so string IDs keep their leading zeros.
 
     Parameters
     ----------
@@ -915,8 +1667,12 @@ def xwalk_df_from_csv(
         directory, otherwise ``False``. Default is ``False``.
 
     remove_unpacked : bool
-        Delete the unzipped directory after (``True``), otherwise ``False``.
-        Default is ``False``.
+        Kept for backwards compatibility. Archived crosswalks are no longer
+        unpacked, so there is nothing to remove. Default is ``False``.
+
+    categorical_ids : bool
+        Read the GISJOIN and GEOID columns directly as categoricals (``True``).
+        See ``categorize_ids()``. Default is ``False``.
 
     read_csv : dict
         Pass in ``pandas.read_csv()`` keyword arguments with this parameter.
@@ -925,99 +1681,300 @@ def xwalk_df_from_csv(
     -------
 
     xwalk : pandas.DataFrame
-        The crosswalk dataframe.
+        The crosswalk dataframe -- or an iterator of dataframes when
+        ``chunksize`` (or ``iterator``) is passed.
 
     """
 
-    def _unzip_directory():
-        """Initialize and decompress a directory."""
-        if not os.path.exists(archive_path):
-            os.mkdir(archive_path + "/")
-        shutil.unpack_archive(f"{archive_path}.{ZIP}", extract_dir=archive_path)
-
-    archive_path = None
-
-    if archived:
-        archive_path = f"{path}{fname}"
-        # make the temporary directory to store the unzipped archive and unpack
-        _unzip_directory()
-        # update file path+name
-        fname = f"{fname}/{fname}"
-
-    file_path = f"{path}{fname}.{CSV}"
-    xwalk = pandas.read_csv(file_path, **read_csv)
-
-    if remove_unpacked and archive_path:
-        shutil.rmtree(archive_path)
+    if categorical_ids:
+        with _open_product(fname, path, archived, CSV) as csv:
+            header = pandas.read_csv(csv, nrows=0).columns
+        dtype = read_csv.get("dtype", {})
+        dtype = dtype if isinstance(dtype, dict) else dict.fromkeys(header, dtype)
+        id_dtype = {c: "category" for c in header if _is_id_column(c)}
+        read_csv = {**read_csv, "dtype": {**dtype, **id_dtype}}
+
+    if read_csv.get("engine") == "pyarrow":
+        with _open_product(fname, path, archived, CSV) as csv:
+            return _read_arrow_xwalk(csv, read_csv)
+    if not archived:
+        return pandas.read_csv(f"{path}{fname}.{CSV}", **read_csv)
+    if read_csv.get("chunksize") or read_csv.get("iterator"):
+        return _read_csv_chunks(fname, path, read_csv)
+    with _open_product(fname, path, archived, CSV) as csv:
+        xwalk = pandas.read_csv(csv, **read_csv)
 
     return xwalk
 
 
-def calculate_atoms(
-    df,
-    weight=None,
-    input_var=None,
-    weight_var=None,
-    weight_prefix=None,
-    source_id=None,
-    groupby_cols=None,
-    overwrite_attrs=None,
-):
-    """Calculate the atoms (intersecting parts) of census geographies
-    and interpolate a proportional weight of the source attribute that
-    lies within the target geography.
+def tabular_df_from_csv(table, str_cols, num_cols=None, engine="c"):
+    """Read in only the needed columns of an NHGIS tabular summary file (a
+    ``.csv`` or a compressed ``.csv.zip``) with declared data types.
 
     Parameters
     ----------
 
-    df : pandas.DataFrame
-        The input data. See ``GeoCrossWalk.base``.
-
-    weight : str
-        The weight colum name(s).
-
-    input_var : str or iterable
-        The input variable column name(s).
-
-    weight_var : str or iterable
-        The groupby and summed variable column name(s).
-
-    weight_prefix : str
-        Prepend this prefix to the the ``weight_var`` column name.
+    table : str
+        The path to the tabular data.
 
-    source_id : str
-        The source ID column name.
+    str_cols : iterable
+        The ID columns -- e.g. ``GISJOIN`` and the ``id_codes.code_cols()``
+        components -- read as strings.
 
-    groupby_cols : list
-        The dataframe columns on which to perform groupby.
+    num_cols : str or iterable
+        The (summed) variables, read as floats. Default is ``None``.
 
-    overwrite_attrs : None or GeoCrossWalk
-        Setting this parameter to a ``GeoCrossWalk`` object overwrites the
-        ``input_var`` and ``weight_var`` attributes. Default is ``None``.
+    engine : str
+        The ``pandas.read_csv()`` parser -- ``'c'`` or the multithreaded
+        ``'pyarrow'``. Default is ``'c'``.
 
     Returns
     -------
 
-    atoms : pandas.DataFrame
-        All intersections between ``source`` and ``target`` geographies, and
-        the interpolated weight calculations for the propotion of
-        source area attributes that are in the target area.
+    tab_df : pandas.DataFrame
+        The tabular data -- ``str_cols`` followed by ``num_cols``.
 
-    Notes
-    -----
+    """
 
-    See example 1 in the ``GeoCrossWalk`` Examples section.
+    if engine not in TABULAR_ENGINES:
+        raise ValueError(f"'engine' must be one of {TABULAR_ENGINES}, not '{engine}'.")
 
-    """
+    num_cols = [] if num_cols is None else _check_vars(num_cols)
+    usecols = list(dict.fromkeys([*str_cols, *num_cols]))
+    dtype = {**dict.fromkeys(num_cols, float), **str_types(str_cols)}
+    if engine == "pyarrow":
+        tab_df = _read_arrow_csv(table, usecols, dtype)
+    else:
+        tab_df = pandas.read_csv(table, usecols=usecols, dtype=dtype)
 
-    # confirm variable data types
-    input_var, weight_var = _check_vars(input_var), _check_vars(weight_var)
+    # the parsers do not agree on column order
+    return tab_df[usecols]
 
-    # determine length of variable lists
-    n_input_var, n_weight_var = len(input_var), len(weight_var)
 
-    # check variable lists are equal length
-    if n_input_var != n_weight_var:
+def _read_arrow_xwalk(csv, read_csv):
+    """Parse a crosswalk with ``pyarrow.csv`` -- the ``pandas.read_csv()``
+    ``dtype`` and ``usecols`` keyword arguments are honored.
+    """
+    read_csv = {k: v for k, v in read_csv.items() if k != "engine"}
+    unsupported = set(read_csv) - {"dtype", "usecols"}
+    if unsupported:
+        raise ValueError(
+            f"{sorted(unsupported)} not supported with 'engine=\"pyarrow\"'."
+        )
+    dtype = read_csv.get("dtype", {})
+    if not isinstance(dtype, dict):
+        header = pandas.read_csv(csv, nrows=0).columns
+        csv.seek(0)
+        dtype = dict.fromkeys(header, dtype)
+    return _read_arrow_csv(csv, read_csv.get("usecols"), dtype)
+
+
+def _read_arrow_csv(table, usecols, dtype):
+    """Parse tabular data with ``pyarrow.csv`` -- the column types are declared
+    to the parser, as ``pandas.read_csv(engine="pyarrow")`` infers (and drops
+    the leading zeros of) numeric-looking ID components before casting. Missing
+    strings are returned as ``NaN``, as with the ``'c'`` parser.
+    """
+    import pyarrow
+    from pyarrow import csv as arrow_csv
+
+    arrow_types = {
+        str: pyarrow.string(),
+        "str": pyarrow.string(),
+        "category": pyarrow.string(),
+        float: pyarrow.float64(),
+        "float": pyarrow.float64(),
+        "float64": pyarrow.float64(),
+    }
+    column_types = {c: arrow_types[t] for c, t in dtype.items() if t in arrow_types}
+    convert = arrow_csv.ConvertOptions(
+        column_types=column_types,
+        include_columns=usecols,
+        strings_can_be_null=True,
+    )
+    with contextlib.ExitStack() as stack:
+        source = table
+        if isinstance(table, str) and zipfile.is_zipfile(table):
+            archive = stack.enter_context(zipfile.ZipFile(table))
+            source = stack.enter_context(archive.open(archive.namelist()[0]))
+        df = arrow_csv.read_csv(source, convert_options=convert).to_pandas()
+
+    strings = [c for c, t in column_types.items() if t == pyarrow.string()]
+    strings = [c for c in strings if c in df.columns]
+    df[strings] = df[strings].where(df[strings].notna(), numpy.nan)
+    casts = {c: t for c, t in dtype.items() if c in df.columns}
+    casts = {c: t for c, t in casts.items() if column_types.get(c) != pyarrow.string()}
+    casts.update({c: "category" for c in strings if dtype[c] == "category"})
+    return df.astype(casts)
+
+
+def _read_csv_chunks(fname, path, read_csv):
+    """Yield the chunks of an archived crosswalk -- the archive stays open
+    until the last chunk is read.
+    """
+    product = _open_product(fname, path, True, CSV)
+    with product as csv, pandas.read_csv(csv, **read_csv) as reader:
+        yield from reader
+
+
+def xwalk_df_from_columnar(
+    fname,
+    path="",
+    fmt=PARQUET,
+    archived=False,
+    remove_unpacked=False,  # noqa: ARG001
+    columns=None,
+):
+    """Read in a produced crosswalk from an archived ``.zip`` or a ``.parquet``
+    or ``.feather`` file (see ``xwalk_df_to_columnar()``). ID columns are read
+    as categoricals. Both formats require ``pyarrow``.
+
+    Parameters
+    ----------
+
+    fname : str
+        Crosswalk (file) name.
+
+    path : str
+        Directory path without the file name. Default is ``''``.
+
+    fmt : str
+        The columnar format -- ``'parquet'`` or ``'feather'``.
+        Default is ``'parquet'``.
+
+    archived : bool
+        ``True`` if the crosswalk is coming from an archived
+        directory, otherwise ``False``. Default is ``False``.
+
+    remove_unpacked : bool
+        See ``xwalk_df_from_csv()``. Default is ``False``.
+
+    columns : list
+        Read only these columns. Default is ``None``, which reads all columns.
+
+    Returns
+    -------
+
+    xwalk : pandas.DataFrame
+        The crosswalk dataframe.
+
+    """
+
+    if fmt not in FORMATS[1:]:
+        raise ValueError(f"'fmt' must be one of {FORMATS[1:]}, not '{fmt}'.")
+
+    # columnar readers need random access -- read an archived file into memory
+    with _open_product(fname, path, archived, fmt) as columnar:
+        columnar = io.BytesIO(columnar.read()) if archived else columnar
+        if fmt == PARQUET:
+            xwalk = pandas.read_parquet(columnar, columns=columns)
+        else:
+            xwalk = pandas.read_feather(columnar, columns=columns)
+
+    return xwalk
+
+
+@contextlib.contextmanager
+def _open_product(fname, path, archived, fext):
+    """Open a data product file -- a member of the ``.zip`` archive (streamed,
+    without extracting it) when ``archived``.
+    """
+    if not archived:
+        with open(f"{path}{fname}.{fext}", "rb") as product:
+            yield product
+    else:
+        archive = zipfile.ZipFile(f"{path}{fname}.{ZIP}")
+        with archive, archive.open(f"{fname}.{fext}") as product:
+            yield product
+
+
+def calculate_atoms(
+    df,
+    weight=None,
+    input_var=None,
+    weight_var=None,
+    weight_prefix=None,
+    source_id=None,
+    groupby_cols=None,
+    overwrite_attrs=None,
+    id_keys=None,
+    engine="pandas",
+    numerator_prefix=None,
+):
+    """Calculate the atoms (intersecting parts) of census geographies
+    and interpolate a proportional weight of the source attribute that
+    lies within the target geography.
+
+    Parameters
+    ----------
+
+    df : pandas.DataFrame
+        The input data. See ``GeoCrossWalk.base``.
+
+    weight : str
+        The weight colum name(s).
+
+    input_var : str or iterable
+        The input variable column name(s).
+
+    weight_var : str or iterable
+        The groupby and summed variable column name(s).
+
+    weight_prefix : str
+        Prepend this prefix to the the ``weight_var`` column name.
+
+    source_id : str
+        The source ID column name.
+
+    groupby_cols : list
+        The dataframe columns on which to perform groupby.
+
+    overwrite_attrs : None or GeoCrossWalk
+        Setting this parameter to a ``GeoCrossWalk`` object overwrites the
+        ``input_var`` and ``weight_var`` attributes. Default is ``None``.
+
+    id_keys : dict
+        Integer keys packed from the ``groupby_cols`` IDs in the form
+        ``{column: (IDCodec, keys)}``. See ``nhgisxwalk.id_keys``. When set,
+        atoms are grouped on the keys instead of the ID strings. Default
+        is ``None``.
+
+    engine : str
+        The aggregation engine -- ``'pandas'`` for ``groupby`` or ``'numpy'``
+        to factorize the ``groupby_cols`` once into a combined integer code,
+        sum over the codes, and code the sources of the (sorted) atoms from
+        their runs rather than by factorizing them again. Both sums are the
+        compensated (Kahan) pandas ``groupby`` sum, so the weights are
+        identical. Default is ``'pandas'``.
+
+    numerator_prefix : str
+        Keep the summed numerators of each atom -- the weights before they
+        are divided by the sum of their source -- in columns of this prefix
+        and the ``weight_var``. Default is ``None``, which does not keep them.
+
+    Returns
+    -------
+
+    atoms : pandas.DataFrame
+        All intersections between ``source`` and ``target`` geographies, and
+        the interpolated weight calculations for the propotion of
+        source area attributes that are in the target area.
+
+    Notes
+    -----
+
+    See example 1 in the ``GeoCrossWalk`` Examples section.
+
+    """
+
+    # confirm variable data types
+    input_var, weight_var = _check_vars(input_var), _check_vars(weight_var)
+
+    # determine length of variable lists
+    n_input_var, n_weight_var = len(input_var), len(weight_var)
+
+    # check variable lists are equal length
+    if n_input_var != n_weight_var:
         msg = "The 'input_var' and 'weight_var' should be the same length. "
         msg += f"{n_input_var} != {n_weight_var}"
         raise RuntimeError(msg)
@@ -1025,35 +1982,189 @@ def calculate_atoms(
     # add prefix (if desired)
     weight_col = _weight_columns(weight_prefix if weight_prefix else "", weight_var)
 
+    numerator_col = []
+    if numerator_prefix:
+        numerator_col = _weight_columns(numerator_prefix, weight_var)
+
     if str(overwrite_attrs) != "None":
         overwrite_attrs.input_var = input_var
         overwrite_attrs.weight_col = weight_col
+        overwrite_attrs.numerator_col = numerator_col
+
+    if engine not in ENGINES:
+        raise ValueError(f"The 'engine' must be one of {ENGINES}, not '{engine}'.")
+
+    if engine == "numpy":
+        return _segment_atoms(
+            df,
+            input_var,
+            weight,
+            weight_col,
+            source_id,
+            groupby_cols,
+            id_keys,
+            numerator_col,
+        )
 
-    # iterate over each pair of input/interpolation variables
-    for ix, (ivar, wvar) in enumerate(zip(input_var, weight_col)):
-        # calculate numerators
-        df[wvar] = df[weight] * df[ivar]
-        if ix == 0:
-            # on the first iteration create an atom dataframe
-            atoms = df.groupby(groupby_cols)[wvar].sum().to_frame()
-            atoms.reset_index(inplace=True)
-        else:
-            # on tsubsequent iterations add weights as a column
-            atoms[wvar] = df.groupby(groupby_cols)[wvar].sum().values
+    # group on the packed ID keys (if available) -- codes follow the ID order
+    groupby = groupby_cols
+    if id_keys:
+        codes, first = group_keys(*[id_keys[c][1] for c in groupby_cols])
+        groupby = pandas.Categorical.from_codes(codes, categories=range(first.size))
+
+    # calculate all numerators at once
+    df[weight_col] = df[input_var].mul(df[weight], axis=0).to_numpy()
+
+    # sum the numerators of each atom with a single groupby
+    numerators = df.groupby(groupby, observed=True)[weight_col].sum()
+    if id_keys:
+        src_keys = id_keys[source_id][1][first]
+        atoms = pandas.DataFrame(
+            {c: id_keys[c][0].decode(id_keys[c][1][first]) for c in groupby_cols}
+        )
+        atoms[weight_col] = numerators.to_numpy()
+        sources = group_keys(src_keys)[0]
+    else:
+        atoms = numerators.reset_index()
+        sources = atoms[source_id]
+
+    if numerator_col:
+        atoms[numerator_col] = atoms[weight_col].to_numpy()
 
-        # calculate denominators
-        denominators = atoms.groupby(source_id)[wvar].sum()
+    # sum the denominators of each source with a single group-reduce
+    denominators = atoms.groupby(sources, observed=True)[weight_col].transform("sum")
 
-        # interpolate weights
-        atoms[wvar] = atoms[wvar] / atoms[source_id].map(denominators)
+    # interpolate weights -- if any weights are NaN, replace with 0.
+    atoms[weight_col] = (atoms[weight_col] / denominators).fillna(0.0)
 
-        # if any weights are NaN, replace with 0.
-        atoms[wvar].fillna(0.0, inplace=True)
+    return atoms
+
+
+def _segment_atoms(
+    df, input_var, weight, weight_col, source_id, groupby_cols, id_keys, numerator_col
+):
+    """The ``'numpy'`` engine of ``calculate_atoms()``."""
+    # calculate all numerators at once
+    numerators = df[input_var].mul(df[weight], axis=0).to_numpy(dtype=float)
+    df[weight_col] = numerators
+
+    # sum the numerators of each atom over the combined atom codes
+    codes, first = _group_codes(df, groupby_cols, id_keys=id_keys)
+    numerators = _segment_sum(codes, numerators)
+
+    # atoms are in sorted ID order -- with the source first, each source is a
+    # run of atoms, which is coded (and decoded) without factorizing again
+    by_source = groupby_cols[0] == source_id
+    if id_keys:
+        src_keys = id_keys[source_id][1][first]
+        sources = _run_codes(src_keys) if by_source else group_keys(src_keys)[0]
+        atoms = {}
+        for col in groupby_cols:
+            codec, keys = id_keys[col]
+            if col == source_id and by_source:
+                starts = numpy.flatnonzero(numpy.diff(sources, prepend=-1))
+                atoms[col] = codec.decode(src_keys[starts])[sources]
+            else:
+                atoms[col] = codec.decode(keys[first])
+        atoms = pandas.DataFrame(atoms)
+    else:
+        atoms = df[groupby_cols].iloc[first].reset_index(drop=True)
+        if by_source:
+            sources = _run_codes(atoms[source_id].to_numpy())
+        else:
+            sources = pandas.factorize(atoms[source_id], sort=True)[0]
+
+    # sum the denominators of each source over the source codes
+    denominators = _segment_sum(sources, numerators)[sources]
+
+    # interpolate weights -- if any weights are NaN, replace with 0.
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        weights = numerators / denominators
+    weights[numpy.isnan(weights)] = 0.0
+    atoms[weight_col] = weights
+    if numerator_col:
+        atoms[numerator_col] = numerators
 
     return atoms
 
 
-def handle_1990_no_data(geoxwalk, vect, supp_src_tab, drop_supp_col):
+def _group_codes(df, cols, id_keys=None):
+    """Group rows by one or more ID columns. Each column (or each word of its
+    packed keys) is factorized once and the sorted codes are combined into a
+    single integer code per row, which is factorized once more. The codes and
+    first rows of each group equal those of ``id_keys.group_keys()``.
+    """
+    words, sizes = [], []
+    missing = numpy.zeros(len(df), dtype=bool)
+    for col in cols:
+        if id_keys:
+            keys = id_keys[col][1]
+            missing |= is_missing(keys)
+            for word in keys.T:
+                word_codes, word_uniques = pandas.factorize(word, sort=True)
+                words.append(word_codes)
+                sizes.append(len(word_uniques))
+        else:
+            col_codes, col_uniques = pandas.factorize(df[col], sort=True)
+            missing |= col_codes < 0
+            words.append(col_codes)
+            sizes.append(len(col_uniques))
+
+    # mixed radix codes follow the sorted order of the rows
+    combined, size = numpy.zeros(len(df), dtype=numpy.int64), 1
+    for word_codes, word_size in zip(words, sizes):
+        if size * word_size > numpy.iinfo(numpy.int64).max:
+            combined, uniques = pandas.factorize(combined, sort=True)
+            size = len(uniques)
+        combined = combined * word_size + word_codes
+        size *= word_size
+
+    codes = numpy.full(len(df), -1)
+    codes[~missing] = pandas.factorize(combined[~missing], sort=True)[0]
+    first = numpy.full(codes.max() + 1 if codes.size else 0, -1)
+    present = numpy.flatnonzero(codes >= 0)[::-1]
+    first[codes[present]] = present
+    return codes, first
+
+
+def _run_codes(values):
+    """Code the runs of equal ``values`` (or rows of 2-D keys) ``0, 1, ...``."""
+    change = values[1:] != values[:-1]
+    if change.ndim > 1:
+        change = change.any(axis=1)
+    return numpy.concatenate([[0], numpy.cumsum(change)])[: len(values)]
+
+
+def _segment_sum(codes, values):
+    """Sum the rows of ``values`` over the groups of ``codes`` (``0, 1, ...``)
+    with the pandas ``groupby`` sum -- compensated (Kahan) in row order and
+    skipping NaN, so both engines give identical results. The codes are
+    grouped as categorical codes, so they are not factorized again. Rows with
+    a negative code are not summed.
+    """
+    n_groups = int(codes.max()) + 1 if codes.size else 0
+    groups = pandas.Categorical.from_codes(
+        codes, categories=pandas.RangeIndex(n_groups)
+    )
+    sums = pandas.DataFrame(values).groupby(groups, observed=False).sum()
+    return sums.to_numpy().reshape((n_groups,) + values.shape[1:])
+
+
+def _stable_order(codes):
+    """A stable ``argsort`` of non-negative integer ``codes`` as a radix sort,
+    16 bits at a time -- NumPy radix sorts 16-bit integers, which is much
+    faster than its general stable sort.
+    """
+    order = numpy.arange(codes.size)
+    if not codes.size:
+        return order
+    for shift in range(0, max(int(codes.max()).bit_length(), 1), 16):
+        digits = ((codes[order] >> shift) & 0xFFFF).astype(numpy.uint16)
+        order = order[numpy.argsort(digits, kind="stable")]
+    return order
+
+
+def handle_1990_no_data(geoxwalk, vect, supp_src_tab, drop_supp_col, source_pass=None):
     """Step 1 in this workflow is handled as a normal case. See the algorithmic
     workflow in Handling 1990 No-Data Blocks in Crosswalks [https://github.com/ipums
     /nhgisxwalk/blob/master/resources/frameworks/handling-1990-no].
@@ -1073,6 +2184,12 @@ def handle_1990_no_data(geoxwalk, vect, supp_src_tab, drop_supp_col):
     drop_supp_col : bool
         See ``drop_supp_col`` parameter in ``GeoCrossWalk.__init__``.
 
+    source_pass : dict
+        See ``source_pass`` parameter in ``GeoCrossWalk.__init__``. The
+        "no data" base IDs, their supplementary source IDs, and the
+        supplementary tabular data are reused from (or stored in) it.
+        Default is ``None``.
+
     Returns
     -------
 
@@ -1081,164 +2198,625 @@ def handle_1990_no_data(geoxwalk, vect, supp_src_tab, drop_supp_col):
 
     """
 
-    # Step 2(a) ----------------------------------------------------------------------
-    # isolate all unique source block IDs in the base crosswalk
-    all_base_ids = geoxwalk.base[~geoxwalk.base[geoxwalk.base_source_col].isna()][
-        geoxwalk.base_source_col
-    ].copy()
-    geoxwalk.all_base_ids = all_base_ids.unique()
+    supp_idcols = code_cols(geoxwalk.supp_geo, geoxwalk.source_year)
+    shared = source_pass is not None and "nopop_base" in source_pass
+    if shared:
+        # Steps 2(a), 2(b) for the source, 3(a), and 3(b) are target-independent
+        geoxwalk.pop_base_ids = source_pass["pop_base_ids"]
+        geoxwalk.nopop_base_ids = source_pass["nopop_base_ids"]
+        geoxwalk.nopop_base = source_pass["nopop_base"].copy(deep=False)
+        supp_src_tab_sf = source_pass["supp_src_tab_sf"]
+
+    profile = getattr(geoxwalk, "profile", None)
+    name = getattr(geoxwalk, "xwalk_name", None)
+
+    with _profiled(profile, "no_data_ids", name, len(geoxwalk.base)) as rec:
+        # Step 2(a) --------------------------------------------------------------------
+        # packed keys of all source block IDs in the base crosswalk and
+        # of all **populated** base IDs from the base summary data
+        if not shared:
+            codec, all_base_keys = geoxwalk.id_keys[geoxwalk.base_source_col]
+            _, pop_base_keys = geoxwalk.id_keys[geoxwalk.tabular_code_label]
+            pop_base_ids = geoxwalk.base_tab_df[geoxwalk.tabular_code_label].to_numpy()
+            geoxwalk.pop_base_ids = pop_base_ids
+
+            # isolate all unique **unpopulated** base IDs
+            nopop_base_keys = setdiff_keys(all_base_keys, pop_base_keys)
+            geoxwalk.nopop_base_ids = codec.decode(nopop_base_keys)
+
+            # create a "no-data" slice of the base crosswalk -- the only copy of
+            # ``base`` (missing GJOIN1990 block IDs are never in the "no-data" keys)
+            geoxwalk.nopop_base = geoxwalk.base.loc[
+                isin_keys(all_base_keys, nopop_base_keys),
+                [geoxwalk.base_source_col, geoxwalk.base_target_col],
+            ]
 
-    # isolate all unique **populated** base IDs from the base summary data
-    geoxwalk.pop_base_ids = (
-        geoxwalk.base_tab_df[geoxwalk.tabular_code_label].copy().to_numpy()
-    )
+        # Step 2(b) --------------------------------------------------------------------
+        # Generate the (supplement) IDs for source and target
+        if not shared:
+            geoxwalk.nopop_base = geoxwalk.generate_ids(
+                "source", vect, supp=True, supp_base=geoxwalk.nopop_base, return_df=True
+            )
+            nopop_base = geoxwalk.nopop_base.copy(deep=False)
+
+        # add target geographic unit ID to the base crosswalk
+        geoxwalk.nopop_base = geoxwalk.generate_ids(
+            "target", vect, supp=False, supp_base=geoxwalk.nopop_base, return_df=True
+        )
+        rec["rows_out"] = len(geoxwalk.nopop_base)
+
+    with _profiled(profile, "no_data_atoms", name, len(geoxwalk.nopop_base)) as rec:
+        # Step 2(c) --------------------------------------------------------------------
+        # groupby the source and target
+        src_trg_cols = [geoxwalk.supp_source, geoxwalk.target]
+        nod_xwalk = geoxwalk.nopop_base.groupby(src_trg_cols, observed=True).size()
+        nod_xwalk = nod_xwalk.reset_index()
+        geoxwalk.nod_xwalk = nod_xwalk[src_trg_cols]
+
+        # Step 2(d/e) ------------------------------------------------------------------
+        # Assign a weight of 0. for all records in the "no-data" crosswalk
+        if not hasattr(geoxwalk, "weight_col"):
+            geoxwalk.weight_var = _check_vars(geoxwalk.weight_var)
+            geoxwalk.weight_col = _weight_columns(
+                geoxwalk.wt if geoxwalk.wt else "", geoxwalk.weight_var
+            )
+        value_cols = geoxwalk.weight_col + getattr(geoxwalk, "numerator_col", [])
+        for wcol in value_cols:
+            geoxwalk.nod_xwalk[wcol] = 0.0
+        rec["rows_out"] = len(geoxwalk.nod_xwalk)
+
+    # Step 3 — Combine the result of Step 1 & Step 2
+    with _profiled(profile, "supp_source_ids", name, None) as rec:
+        # - 3(a) -----------------------------------------------------------------------
+        # -- 1990 Block Group Part Summary Data (National)
+        # only the IDs and block group ID components are needed
+        if hasattr(geoxwalk, "input_var"):
+            geoxwalk.input_var = _check_vars(geoxwalk.input_var)
+        if not shared:
+            supp_src_tab_sf = _supp_tabular_df(geoxwalk, supp_src_tab)
+
+            # 3(b) ---------------------------------------------------------------------
+            # Identify containing geography IDs in Summary File (block groups)
+            supp_src_tab_sf = id_generators["%s_gj" % geoxwalk.supp_geo](
+                geoxwalk.source_year,
+                None,
+                df=supp_src_tab_sf,
+                order=supp_idcols,
+                cname=geoxwalk.supp_source,
+                vectorized=vect,
+            )
+            # subset columns
+            susbet_cols = [geoxwalk.tabular_code_label] + supp_idcols
+            susbet_cols += [geoxwalk.supp_source]
+            supp_src_tab_sf = supp_src_tab_sf[susbet_cols]
+
+            if source_pass is not None:
+                source_pass["pop_base_ids"] = pop_base_ids
+                source_pass["nopop_base_ids"] = geoxwalk.nopop_base_ids
+                source_pass["nopop_base"] = nopop_base
+                source_pass["supp_src_tab_sf"] = supp_src_tab_sf
+        rec["rows_out"] = len(supp_src_tab_sf)
+
+    with _profiled(profile, "expand_no_data", name, len(geoxwalk.nod_xwalk)) as rec:
+        # 3(c) -------------------------------------------------------------------------
+        # Identify containing block group IDs in Populated src1990trg-year crosswalk
+        geoxwalk.xwalk[geoxwalk.supp_source] = _lookup_ids(
+            geoxwalk.xwalk[geoxwalk.source],
+            supp_src_tab_sf[geoxwalk.tabular_code_label],
+            supp_src_tab_sf[geoxwalk.supp_source],
+        )
+        reorder_cols = [
+            geoxwalk.source,
+            geoxwalk.supp_source,
+            geoxwalk.target,
+        ] + value_cols
+        geoxwalk.xwalk = geoxwalk.xwalk[reorder_cols]
+
+        # 3(d) -------------------------------------------------------------------------
+        # "Expand" the no-data supplement_src1990target-year crosswalk
+        nod_xwalk_exp = pandas.merge(
+            left=supp_src_tab_sf,
+            right=geoxwalk.nod_xwalk,
+            how="left",
+            left_on=geoxwalk.supp_source,
+            right_on=geoxwalk.supp_source,
+            validate="many_to_many",
+        )
+        keep_cols = [geoxwalk.tabular_code_label, geoxwalk.supp_source, geoxwalk.target]
+        keep_cols += value_cols
+        nod_xwalk_exp = nod_xwalk_exp[keep_cols].copy()
+        nod_xwalk_exp.rename(
+            columns={geoxwalk.tabular_code_label: geoxwalk.source}, inplace=True
+        )
+        rec["rows_out"] = len(nod_xwalk_exp)
+
+    with _profiled(profile, "append_no_data", name, len(geoxwalk.xwalk)) as rec:
+        # 3(e) -------------------------------------------------------------------------
+        # Remove records from the expanded xwalk that are already in the populated xwalk
+        # Anti-join on the packed (source, target) keys of each atom
+        src_trg_cols = [geoxwalk.source, geoxwalk.target]
+        nod_atoms = tuple(nod_xwalk_exp[c] for c in src_trg_cols)
+        pop_atoms = tuple(geoxwalk.xwalk[c] for c in src_trg_cols)
+        keep_nod_atoms = ~isin_pairs(nod_atoms, pop_atoms)
+
+        # Remove the duplicated atoms (and those without a target)
+        keep_nod_atoms &= nod_xwalk_exp[src_trg_cols].notna().all(axis=1).to_numpy()
+        nod_xwalk_exp = nod_xwalk_exp[keep_nod_atoms]
+        nod_xwalk_exp.reset_index(inplace=True, drop=True)
+
+        # 3(f) -------------------------------------------------------------------------
+        # Append the "no-data" crosswalk to the populated crosswalk
+        geoxwalk.xwalk = pandas.concat(
+            [geoxwalk.xwalk, nod_xwalk_exp], ignore_index=True
+        )
+
+        # pre-step 9 - # Isolate unaccounted for source geographies --------------------
+        geoxwalk.src_unacc = setdiff_ids(
+            supp_src_tab_sf[geoxwalk.tabular_code_label],
+            geoxwalk.xwalk[geoxwalk.source],
+        )
+        rec["rows_out"] = len(geoxwalk.xwalk)
 
-    # isolate all unique **unpopulated** base IDs
-    geoxwalk.nopop_base_ids = numpy.setdiff1d(
-        geoxwalk.all_base_ids.tolist(), geoxwalk.pop_base_ids.tolist()
+    if drop_supp_col:
+        geoxwalk.xwalk.drop(columns=geoxwalk.supp_source, inplace=True)
+
+    return geoxwalk
+
+
+def _same_source(source, other):
+    """Whether two ``source_pass`` sources -- objects and parameters -- match."""
+    if len(source) != len(other):
+        return False
+    for a, b in zip(source, other):
+        if isinstance(a, pandas.DataFrame) or isinstance(b, pandas.DataFrame):
+            if a is not b:
+                return False
+        elif a != b:
+            return False
+    return True
+
+
+def _supp_tabular_df(geoxwalk, supp_src_tab):
+    """The IDs and block group ID components of the supplementary tabular data
+    -- read in, or copied when passed as a dataframe.
+    """
+    if isinstance(supp_src_tab, pandas.DataFrame):
+        return supp_src_tab.copy()
+    supp_idcols = code_cols(geoxwalk.supp_geo, geoxwalk.source_year)
+    return tabular_df_from_csv(
+        supp_src_tab,
+        [geoxwalk.tabular_code_label] + supp_idcols,
+        engine=getattr(geoxwalk, "tabular_engine", "c"),
     )
 
-    # create a "no-data" slice of the base crosswalk
-    geoxwalk.nopop_base = geoxwalk.base[
-        geoxwalk.base[geoxwalk.base_source_col].isin(geoxwalk.nopop_base_ids)
-    ].copy()
-    geoxwalk.nopop_base = geoxwalk.nopop_base[
-        [geoxwalk.base_source_col, geoxwalk.base_target_col]
-    ].copy()
-
-    # Step 2(b) ----------------------------------------------------------------------
-    # Generate the (supplement) IDs for source and target
-    geoxwalk.nopop_base = geoxwalk.generate_ids(
-        "source", vect, supp=True, supp_base=geoxwalk.nopop_base, return_df=True
+
+def _build_partition(base, base_tab_df, supp_tab_df, partition_kws):
+    """Build the atoms of a state partition -- run in worker processes. The
+    (partition) unaccounted for records are dropped; their IDs are returned as
+    candidates.
+    """
+    geoxwalk = GeoCrossWalk(
+        base,
+        base_source_table=base_tab_df,
+        supp_source_table=supp_tab_df,
+        **partition_kws,
     )
+    results = {a: getattr(geoxwalk, a) for a in CACHED_RESULTS if hasattr(geoxwalk, a)}
+    xwalk = results["xwalk"]
+    atoms = xwalk[geoxwalk.source].notna() & xwalk[geoxwalk.target].notna()
+    results["xwalk"] = xwalk[atoms]
+    return results
+
+
+def _lookup_ids(ids, index_ids, values):
+    """Look up the ``values`` of ``ids`` through an index of ``index_ids``
+    (e.g. the block group of each block group part). As with a ``dict`` map,
+    the last of any duplicated ``index_ids`` is used, and IDs that are not
+    found are ``NaN``.
+    """
+    last = ~index_ids.duplicated(keep="last").to_numpy()
+    indexer = pandas.Index(index_ids[last]).get_indexer(ids)
+    return values[last].reset_index(drop=True).reindex(indexer).to_numpy()
+
+
+def _is_id_column(col):
+    """Flag GISJOIN/GEOID column names, e.g. ``GJOIN1990`` or ``tr2010ge``."""
+    gj_ge = col[-2:] in ("gj", "ge") and col[-3:-2].isdigit()
+    return gj_ge or col.startswith(("GJOIN", "GEOID", "GISJOIN"))
 
-    # drop unneeded weight/area columns (these should all be zero anyway)
-    _id_cols_ = [
-        geoxwalk.supp_source,
-        geoxwalk.base_source_col,
-        geoxwalk.base_target_col,
-    ]
-    geoxwalk.nopop_base = geoxwalk.nopop_base[_id_cols_]
 
-    # add target geographic unit ID to the base crosswalk
-    geoxwalk.nopop_base = geoxwalk.generate_ids(
-        "target", vect, supp=False, supp_base=geoxwalk.nopop_base, return_df=True
+def categorize_ids(df, columns=None):
+    """Dictionary-encode ID columns as categoricals (with sorted categories,
+    so sorting is unchanged).
+
+    Parameters
+    ----------
+
+    df : pandas.DataFrame
+        A (base) crosswalk.
+
+    columns : list
+        The ID columns to encode. Default is ``None``, which encodes all
+        GISJOIN and GEOID columns.
+
+    Returns
+    -------
+
+    df : pandas.DataFrame
+        A copy of ``df`` with categorical ID columns.
+
+    """
+    if columns is None:
+        columns = [c for c in df.columns if _is_id_column(c)]
+    return df.astype(dict.fromkeys(columns, "category"))
+
+
+def id_memory_usage(df, columns=None):
+    """Memory usage of (categorical) ID columns versus ``object`` dtype. The
+    ``object`` usage of categorical columns is calculated from the size and
+    count of each category -- as ``pandas.Series.memory_usage(deep=True)``
+    would for an ``object`` column -- without converting the column.
+
+    Parameters
+    ----------
+
+    df : pandas.DataFrame
+        A (base) crosswalk.
+
+    columns : list
+        The ID columns to report. Default is ``None``, which reports all
+        GISJOIN and GEOID columns.
+
+    Returns
+    -------
+
+    usage : pandas.DataFrame
+        The ``object`` and ``current`` bytes of each column and the bytes
+        ``saved`` by the current dtype.
+
+    """
+    if columns is None:
+        columns = [c for c in df.columns if _is_id_column(c)]
+    pointer, nan_size = numpy.dtype(object).itemsize, sys.getsizeof(numpy.nan)
+    usage = {}
+    for col in columns:
+        values = df[col]
+        if isinstance(values.dtype, pandas.CategoricalDtype):
+            codes = values.cat.codes.to_numpy()
+            sizes = [sys.getsizeof(c) for c in values.cat.categories.to_numpy(object)]
+            counts = numpy.bincount(codes[codes >= 0], minlength=len(sizes))
+            as_object = values.size * pointer + int(counts @ numpy.array(sizes))
+            as_object += int((codes < 0).sum()) * nan_size
+        else:
+            as_object = values.astype(object).memory_usage(deep=True, index=False)
+        usage[col] = as_object, values.memory_usage(deep=True, index=False)
+    usage = pandas.DataFrame.from_dict(
+        usage, orient="index", columns=["object", "current"], dtype="int64"
     )
+    usage["saved"] = usage["object"] - usage["current"]
+    return usage
 
-    # Step 2(c) ----------------------------------------------------------------------
-    # Drop records with a null value for GJOIN1990 block IDs (if present)
-    geoxwalk.nopop_base = geoxwalk.nopop_base[
-        ~geoxwalk.nopop_base[geoxwalk.base_source_col].isna()
-    ]
 
-    # groupby the source and target
-    src_trg_cols = [geoxwalk.supp_source, geoxwalk.target]
-    nod_xwalk = geoxwalk.nopop_base.groupby(src_trg_cols).size().reset_index()
-    geoxwalk.nod_xwalk = nod_xwalk[src_trg_cols]
-
-    # Step 2(d/e) -------------------------------------------------------------------
-    # Assign a weight of 0. for all records in the "no-data" crosswalk
-    if not hasattr(geoxwalk, "weight_col"):
-        geoxwalk.weight_var = _check_vars(geoxwalk.weight_var)
-        geoxwalk.weight_col = _weight_columns(
-            geoxwalk.wt if geoxwalk.wt else "", geoxwalk.weight_var
+def rollup_xwalk(in_xwalk, source, target, target_geo):
+    """Roll a crosswalk up to a coarser target geography that nests its target
+    geography (in 2010 block groups nest in tracts, and tracts in counties).
+    The target GISJOINs are truncated (see ``id_codes.slice_gj_ids()``) and the
+    weights of each source and coarser target are summed in a single groupby.
+    A coarser target is unaccounted for only when none of its targets are
+    accounted for. The result equals the crosswalk built from the base
+    crosswalk up to floating point summation order, so roll up unrounded
+    weights (``weights_precision=None``).
+
+    Parameters
+    ----------
+
+    in_xwalk : pandas.DataFrame
+        A crosswalk with GISJOIN targets. See the ``xwalk`` attribute of
+        ``GeoCrossWalk``.
+
+    source : str
+        The source ID column.
+
+    target : str
+        The target ID column, e.g. ``'bg2010gj'``.
+
+    target_geo : str
+        The coarser target geographic unit (see ``ROLLUPS``).
+
+    Returns
+    -------
+
+    out_xwalk : pandas.DataFrame
+        The rolled up crosswalk -- with the coarser target GISJOIN (and GEOID)
+        column in place of the target column(s) -- sorted by source and target.
+
+    Examples
+    --------
+
+    >>> import nhgisxwalk, pandas
+    >>> xwalk = pandas.DataFrame(
+    ...     {
+    ...         "bgp1990gj": ["A", "A", "A", "B"],
+    ...         "bg2010gj": [
+    ...             "G10000100401001",
+    ...             "G10000100401002",
+    ...             "G10000100402001",
+    ...             "G10000100402001",
+    ...         ],
+    ...         "wt_pop": [0.25, 0.25, 0.5, 1.0],
+    ...     }
+    ... )
+    >>> nhgisxwalk.rollup_xwalk(xwalk, "bgp1990gj", "bg2010gj", "tr")
+      bgp1990gj        tr2010gj  wt_pop
+    0         A  G1000010040100     0.5
+    1         A  G1000010040200     0.5
+    2         B  G1000010040200     1.0
+
+    """
+    geog, year, code = target[:-6], target[-6:-2], target[-2:]
+    if code != "gj" or target_geo not in ROLLUPS.get(geog, []):
+        msg = f"'{target}' can not be rolled up to '{target_geo}' (see 'ROLLUPS')."
+        raise ValueError(msg)
+    rolled = target_geo + year + code
+    rename = {target: rolled, target[:-2] + "ge": rolled[:-2] + "ge"}
+    weight_col = [c for c in in_xwalk.columns if not _is_id_column(c)]
+    keys = [c for c in in_xwalk.columns if c not in weight_col and c not in rename]
+
+    # sum the weights of each source (and its dependent IDs) and coarser target
+    rolled_ids = slice_gj_ids(target_geo, year, in_xwalk[target])
+    out_xwalk = in_xwalk[keys + weight_col].assign(**{rolled: rolled_ids})
+    out_xwalk = out_xwalk.groupby(
+        keys + [rolled], dropna=False, sort=False, observed=True
+    )[weight_col].sum(min_count=1)
+    out_xwalk = out_xwalk.reset_index().infer_objects()
+
+    # keep unaccounted for coarser targets without any accounted for target
+    no_source = out_xwalk[source].isna()
+    accounted = out_xwalk.loc[~no_source, rolled]
+    out_xwalk = out_xwalk[~no_source | ~out_xwalk[rolled].isin(accounted)]
+
+    if target[:-2] + "ge" in in_xwalk.columns:
+        out_xwalk[rolled[:-2] + "ge"] = gisjoin_to_geoid(out_xwalk[rolled])
+    columns = [rename.get(c, c) for c in in_xwalk.columns]
+    out_xwalk = out_xwalk[columns]
+    if isinstance(in_xwalk[target].dtype, pandas.CategoricalDtype):
+        out_xwalk = categorize_ids(
+            out_xwalk, [c for c in rename.values() if c in columns]
         )
-    for wcol in geoxwalk.weight_col:
-        geoxwalk.nod_xwalk[wcol] = 0.0
+    out_xwalk.sort_values(by=[source, rolled], **SORT_PARAMS)
+    return out_xwalk
 
-    # Step 3 — Combine the result of Step 1 & Step 2
-    # - 3(a) --------------------------------------------------------------------------
-    # -- 1990 Block Group Part Summary Data (National)
-    # confirm variable data types
-    if hasattr(geoxwalk, "input_var"):
-        geoxwalk.input_var = _check_vars(geoxwalk.input_var)
-    supp_src_tab_sf = pandas.read_csv(supp_src_tab, dtype=str)
-    for iv in geoxwalk.input_var:
-        supp_src_tab_sf[iv] = supp_src_tab_sf[iv].astype(float)
-
-    # 3(b) ---------------------------------------------------------------------------
-    # Identify containing geography IDs in Summary File (block groups)
-    supp_idcols = code_cols(geoxwalk.supp_geo, geoxwalk.source_year)
-    supp_src_tab_sf = id_generators["%s_gj" % geoxwalk.supp_geo](
-        geoxwalk.source_year,
-        None,
-        df=supp_src_tab_sf,
-        order=supp_idcols,
-        cname=geoxwalk.supp_source,
-    )
-    # subset columns
-    susbet_cols = [geoxwalk.tabular_code_label] + supp_idcols + [geoxwalk.supp_source]
-    supp_src_tab_sf = supp_src_tab_sf[susbet_cols]
-
-    # 3(c) ---------------------------------------------------------------------------
-    # Identify containing block group IDs in Populated src1990trg-year crosswalk
-    _map = dict(
-        supp_src_tab_sf[[geoxwalk.tabular_code_label, geoxwalk.supp_source]].values
+
+def reverse_xwalk(in_xwalk, source, target, numerator_col, weight_col):
+    """Reverse a crosswalk -- from its target to its source geography -- with
+    its summed numerators (see ``keep_numerators`` in ``GeoCrossWalk``). The
+    atoms are the same in both directions and only the denominators differ,
+    so the reverse weights are the numerators divided by the sum of their
+    target in a single group-reduce. As in ``calculate_atoms()``, ``NaN``
+    weights (e.g. of targets without population) are replaced with ``0.``.
+
+    Parameters
+    ----------
+
+    in_xwalk : pandas.DataFrame
+        A crosswalk with numerator columns. See the ``xwalk`` attribute of
+        ``GeoCrossWalk``.
+
+    source : str
+        The source ID column.
+
+    target : str
+        The target ID column -- the source of the reverse crosswalk.
+
+    numerator_col : list
+        The summed numerator columns.
+
+    weight_col : list
+        The weight column of each numerator column.
+
+    Returns
+    -------
+
+    out_xwalk : pandas.DataFrame
+        The reverse crosswalk -- the target ID column(s) first -- sorted by
+        target and source.
+
+    Examples
+    --------
+
+    >>> import nhgisxwalk, pandas
+    >>> xwalk = pandas.DataFrame(
+    ...     {
+    ...         "bgp1990gj": ["A", "A", "B"],
+    ...         "tr2010gj": ["X", "Y", "Y"],
+    ...         "wt_pop": [0.25, 0.75, 1.0],
+    ...         "num_pop": [10.0, 30.0, 10.0],
+    ...     }
+    ... )
+    >>> nhgisxwalk.reverse_xwalk(
+    ...     xwalk, "bgp1990gj", "tr2010gj", ["num_pop"], ["wt_pop"]
+    ... )
+      tr2010gj bgp1990gj  wt_pop  num_pop
+    0        X         A    1.00     10.0
+    1        Y         A    0.75     30.0
+    2        Y         B    0.25     10.0
+
+    """
+    # the target ID column(s) first
+    target_cols = [target, target[:-2] + "ge"]
+    columns = [c for c in target_cols if c in in_xwalk.columns]
+    columns += [c for c in in_xwalk.columns if c not in target_cols]
+    out_xwalk = in_xwalk[columns].copy()
+
+    # sum the denominators of each target with a single group-reduce
+    numerators = out_xwalk[numerator_col]
+    denominators = numerators.groupby(out_xwalk[target], observed=True).transform("sum")
+    weights = (numerators / denominators).fillna(0.0).to_numpy()
+    out_xwalk[weight_col] = weights
+    out_xwalk.sort_values(by=[target, source], **SORT_PARAMS)
+    return out_xwalk
+
+
+def compose_xwalks(first, second, source, middle, target, weights=None):
+    """Compose two crosswalks that share a middle geography -- e.g. blk1990 to
+    blk2000 and blk2000 to blk2010, or bgp1990 to bg2010 and bg2010 to
+    tr2010 -- into a source to target crosswalk. The weight of each source and
+    target is the sum over the middle units of the products of their weights.
+    The rows of ``second`` are sorted by their middle ID once, and each row of
+    ``first`` is expanded to its matching rows by position (a sorted merge on
+    integer codes), so no merged frame of ID strings is created. Sources with
+    no target and targets with no source are added as accounting rows with
+    ``0.0`` weights (see ``GeoCrossWalk.accounting()``).
+
+    Parameters
+    ----------
+
+    first : pandas.DataFrame
+        The source to middle crosswalk. Rows with a missing source or middle
+        ID are only accounting rows and are skipped.
+
+    second : pandas.DataFrame
+        The middle to target crosswalk. Rows with a missing middle or target
+        ID are only accounting rows and are skipped.
+
+    source : str
+        The source ID column of ``first``.
+
+    middle : str
+        The middle ID column of ``first`` and ``second``.
+
+    target : str
+        The target ID column of ``second``.
+
+    weights : dict
+        The composed weight columns in the form ``{out: (first_col,
+        second_col)}``. Default is ``None``, which pairs the numeric columns
+        of both crosswalks by name or, when ``second`` has a single numeric
+        column, multiplies each numeric column of ``first`` by it.
+
+    Returns
+    -------
+
+    out_xwalk : pandas.DataFrame
+        The composed crosswalk with the ``source``, ``target``, and weight
+        columns sorted by source and target.
+
+    Examples
+    --------
+
+    >>> import nhgisxwalk, pandas
+    >>> first = pandas.DataFrame(
+    ...     {
+    ...         "bgp1990gj": ["A", "A", "B"],
+    ...         "bg2010gj": ["G10000100401001", "G10000100402001", "G10000100402001"],
+    ...         "wt_pop": [0.25, 0.75, 1.0],
+    ...     }
+    ... )
+    >>> second = pandas.DataFrame(
+    ...     {
+    ...         "bg2010gj": ["G10000100401001", "G10000100402001", "G10000300403001"],
+    ...         "co2010gj": ["G1000010", "G1000010", "G1000030"],
+    ...         "wt": [1.0, 1.0, 1.0],
+    ...     }
+    ... )
+    >>> nhgisxwalk.compose_xwalks(first, second, "bgp1990gj", "bg2010gj", "co2010gj")
+      bgp1990gj  co2010gj  wt_pop
+    0         A  G1000010     1.0
+    1         B  G1000010     1.0
+    2       NaN  G1000030     0.0
+
+    """
+    if weights is None:
+        first_wts = [c for c in first.columns if _is_weight_column(first[c])]
+        second_wts = [c for c in second.columns if _is_weight_column(second[c])]
+        if len(second_wts) == 1:
+            weights = {c: (c, second_wts[0]) for c in first_wts}
+        elif set(first_wts) == set(second_wts):
+            weights = {c: (c, c) for c in first_wts}
+        else:
+            msg = f"Weight columns {first_wts} and {second_wts} can not be paired, "
+            msg += "pass 'weights'."
+            raise ValueError(msg)
+
+    # integer codes of the (sorted) source and target IDs and the middle IDs
+    src_codes, src_ids = pandas.factorize(first[source], sort=True)
+    trg_codes, trg_ids = pandas.factorize(second[target], sort=True)
+    mid_codes, _ = pandas.factorize(
+        pandas.concat([first[middle], second[middle]], ignore_index=True)
     )
-    geoxwalk.xwalk[geoxwalk.supp_source] = geoxwalk.xwalk[geoxwalk.source].map(_map)
-    reorder_cols = [
-        geoxwalk.source,
-        geoxwalk.supp_source,
-        geoxwalk.target,
-    ] + geoxwalk.weight_col
-    geoxwalk.xwalk = geoxwalk.xwalk[reorder_cols]
-
-    # 3(d) ---------------------------------------------------------------------------
-    # "Expand" the no-data supplement_src1990target-year crosswalk
-    nod_xwalk_exp = pandas.merge(
-        left=supp_src_tab_sf,
-        right=geoxwalk.nod_xwalk,
-        how="left",
-        left_on=geoxwalk.supp_source,
-        right_on=geoxwalk.supp_source,
-        validate="many_to_many",
+    first_mid, second_mid = mid_codes[: len(first)], mid_codes[len(first) :]
+    first_ok = (src_codes >= 0) & (first_mid >= 0)
+    second_ok = (trg_codes >= 0) & (second_mid >= 0)
+
+    # the (sorted) rows of ``second`` matching each row of ``first``
+    second_rows = numpy.flatnonzero(second_ok)
+    second_rows = second_rows[numpy.argsort(second_mid[second_rows], kind="stable")]
+    sorted_mid = second_mid[second_rows]
+    first_rows = numpy.flatnonzero(first_ok)
+    lo = numpy.searchsorted(sorted_mid, first_mid[first_rows], side="left")
+    hi = numpy.searchsorted(sorted_mid, first_mid[first_rows], side="right")
+    n_matches = hi - lo
+    left = numpy.repeat(first_rows, n_matches)
+    right = numpy.arange(left.size)
+    right += numpy.repeat(lo - numpy.cumsum(n_matches) + n_matches, n_matches)
+    right = second_rows[right]
+
+    # sum the products of the weights of each source and target pair
+    n_trg = len(trg_ids) + 1
+    pair_codes = src_codes[left] * n_trg + trg_codes[right]
+    pair_codes, pairs = pandas.factorize(pair_codes, sort=True)
+    out_weights = {}
+    for col, (first_col, second_col) in weights.items():
+        products = _float_values(first[first_col])[left]
+        products = products * _float_values(second[second_col])[right]
+        notna = ~numpy.isnan(products)
+        summed = numpy.bincount(
+            pair_codes, weights=numpy.where(notna, products, 0.0), minlength=pairs.size
+        )
+        # all missing products sum to a missing weight
+        counts = numpy.bincount(pair_codes, weights=notna, minlength=pairs.size)
+        out_weights[col] = numpy.where(counts > 0, summed, numpy.nan)
+
+    # add the unaccounted for sources and targets, then sort all rows
+    src_unacc = numpy.ones(len(src_ids), dtype=bool)
+    src_unacc[pairs // n_trg] = False
+    src_unacc = numpy.flatnonzero(src_unacc)
+    trg_unacc = numpy.ones(len(trg_ids), dtype=bool)
+    trg_unacc[pairs % n_trg] = False
+    trg_unacc = numpy.flatnonzero(trg_unacc)
+    codes = numpy.concatenate(
+        [pairs, src_unacc * n_trg + n_trg - 1, len(src_ids) * n_trg + trg_unacc]
     )
-    keep_cols = [geoxwalk.tabular_code_label, geoxwalk.supp_source, geoxwalk.target]
-    keep_cols += geoxwalk.weight_col
-    nod_xwalk_exp = nod_xwalk_exp[keep_cols].copy()
-    nod_xwalk_exp.rename(
-        columns={geoxwalk.tabular_code_label: geoxwalk.source}, inplace=True
+    order = numpy.argsort(codes, kind="stable")
+    out_src, out_trg = codes[order] // n_trg, codes[order] % n_trg
+    out_src[out_src == len(src_ids)] = -1
+    out_trg[out_trg == n_trg - 1] = -1
+    out_xwalk = pandas.DataFrame(
+        {
+            source: _take_ids(src_ids, out_src),
+            target: _take_ids(trg_ids, out_trg),
+        }
     )
+    n_unacc = codes.size - pairs.size
+    for col, values in out_weights.items():
+        out_xwalk[col] = numpy.concatenate([values, numpy.zeros(n_unacc)])[order]
+    return out_xwalk
 
-    # 3(e) ---------------------------------------------------------------------------
-    # Remove records from the expanded xwalk that are already in the populated xwalk
-    # Generate a single atom IDs to perform a set difference
-    atom_id = "atom_id"
-    # Atom ID for populated crosswalk
-    geoxwalk.xwalk = generate_atom_id(
-        geoxwalk.xwalk, geoxwalk.source, geoxwalk.target, atom_id
-    )
 
-    # Atom ID for "no-data" crosswalk
-    nod_xwalk_exp = generate_atom_id(
-        nod_xwalk_exp, geoxwalk.source, geoxwalk.target, atom_id
-    )
+def _is_weight_column(values):
+    """Flag the numeric (weight) columns of a crosswalk."""
+    is_numeric = pandas.api.types.is_numeric_dtype(values)
+    return is_numeric and not pandas.api.types.is_bool_dtype(values)
 
-    # Keep these atoms from the expanded "no-data" crosswalk
-    nod_atoms = nod_xwalk_exp[atom_id].tolist()
-    pop_atoms = geoxwalk.xwalk[atom_id].tolist()
-    keep_nod_atoms = numpy.setdiff1d(nod_atoms, pop_atoms)
-
-    # Remove the duplicated atoms
-    nod_xwalk_exp = nod_xwalk_exp[nod_xwalk_exp[atom_id].isin(keep_nod_atoms)]
-    nod_xwalk_exp.reset_index(inplace=True, drop=True)
-    geoxwalk.xwalk.drop(columns=atom_id, inplace=True)
-    nod_xwalk_exp.drop(columns=atom_id, inplace=True)
-
-    # 3(f) ---------------------------------------------------------------------------
-    # Append the "no-data" crosswalk to the populated crosswalk
-    geoxwalk.xwalk = pandas.concat([geoxwalk.xwalk, nod_xwalk_exp], ignore_index=True)
-
-    # pre-step 9 - # Isolate unaccounted for source geographies ----------------------
-    geoxwalk.src_unacc = numpy.setdiff1d(
-        supp_src_tab_sf[geoxwalk.tabular_code_label].unique().tolist(),
-        geoxwalk.xwalk[geoxwalk.source].unique().tolist(),
-    )
 
-    if drop_supp_col:
-        geoxwalk.xwalk.drop(columns=geoxwalk.supp_source, inplace=True)
+def _float_values(values):
+    """The values of a weight column as floats -- missing as ``NaN``."""
+    return values.to_numpy(dtype=float, na_value=numpy.nan)
 
-    return geoxwalk
+
+def _take_ids(ids, codes):
+    """The IDs of ``codes`` -- missing for ``-1`` -- keeping their dtype."""
+    return ids.array.take(codes, allow_fill=True)
 
 
 def round_weights(df, decimals):
@@ -1263,6 +2841,24 @@ def _state(rec, stfips=None, code="gj"):
         return NaN if str(rec) == NaN else rec[idx1:idx2]
 
 
+def _state_keys(ids, code="gj"):
+    """Slice the state FIPS code out of all IDs at once -- ``'nan'`` for null
+    IDs. See ``_state()``.
+    """
+    idx1, idx2 = (1, 3) if code == "gj" else (0, 2)
+    ids = pandas.Series(ids)
+    if isinstance(ids.dtype, pandas.CategoricalDtype):
+        # slice each category once
+        states = pandas.Series(ids.cat.categories).str.slice(idx1, idx2)
+        states = states.reindex(ids.cat.codes.to_numpy()).reset_index(drop=True)
+    else:
+        states = ids.str.slice(idx1, idx2).reset_index(drop=True)
+    null = ids.isna().to_numpy() | (ids == NaN).to_numpy() | states.isna().to_numpy()
+    states = states.astype(object)
+    states[null] = NaN
+    return states
+
+
 def _check_vars(_vars):
     """If the input is a single, named variable (str), insert it into a list."""
     if isinstance(_vars, str):
@@ -1313,8 +2909,18 @@ def example_crosswalk_data():
     return example_data
 
 
-def prepare_data_product(xwalk, xwalk_name, path, remove=True):
-    """Prepare an archived NHGIS crosswalk with a README.txt.
+def prepare_data_product(
+    xwalk,
+    xwalk_name,
+    path,
+    remove=True,
+    formats=CSV,
+    compression=zipfile.ZIP_DEFLATED,
+    compresslevel=None,
+):
+    """Prepare an archived NHGIS crosswalk with a README.txt. The crosswalk is
+    encoded straight into the ``.zip`` archive -- it is not written to disk
+    and then compressed.
 
     Parameters
     ----------
@@ -1326,39 +2932,32 @@ def prepare_data_product(xwalk, xwalk_name, path, remove=True):
         The crosswalk name.
 
     path : str
-        File path to directory where the archive will be stored.
+        File path (without the ``.zip`` extension) of the archive.
 
     remove : bool
-        Delete the uncompressed directory (``True``). Default is ``True``.
+        Do not keep an uncompressed directory of the archive (``True``).
+        Default is ``True``.
+
+    formats : str or list
+        The file format(s) of the crosswalk within the archive -- any of
+        ``'csv'``, ``'parquet'``, and ``'feather'``. See ``FORMATS`` and
+        ``xwalk_df_to_columnar()``. Default is ``'csv'``.
+
+    compression : int
+        The ``zipfile`` compression method. Default is ``zipfile.ZIP_DEFLATED``.
+
+    compresslevel : int
+        The compression level. See ``zipfile.ZipFile``. Default is ``None``,
+        which is the default level of the ``compression`` method.
 
     """
 
-    def _fetch_readme():
-        """Fetch and copy the proper README.txt for a geographic crosswalk."""
+    formats = _check_formats(formats)
 
-        # set file paths + file names
-        readme_file = f"{readme_name}_README.{TXT}"
-        readme_to = f"{path}/{readme_file}"
-        RESOURCE_README_PATH = "../resources/readme_files/"
-        if not os.path.exists(RESOURCE_README_PATH):
-            # for tests
-            RESOURCE_README_PATH = "./resources/readme_files/"
-        readme_from = RESOURCE_README_PATH + readme_file
-        # copy the specified README.txt into the archive directory
-        shutil.copyfile(readme_from, readme_to)
-
-    def _zip_directory():
-        """Initialize and archive a directory."""
-        # compress directory
-        shutil.make_archive(path, ZIP, path)
-
-        # delete uncompressed directory
-        if remove:
-            shutil.rmtree(path)
-
-    # ensure directory exists
-    if not os.path.exists(path):
-        os.makedirs(path, exist_ok=True)
+    # ensure the archive directory exists
+    archive_dir = os.path.dirname(path)
+    if archive_dir and not os.path.exists(archive_dir):
+        os.makedirs(archive_dir, exist_ok=True)
 
     # README name same as crosswalk name
     rn_eq_xn = True
@@ -1387,12 +2986,231 @@ def prepare_data_product(xwalk, xwalk_name, path, remove=True):
     else:
         readme_name = BGP_README
 
-    # write out the dataframe
-    xwalk_df_to_csv(dfkwds={"df": xwalk, "xwalk_name": xwalk_name}, path=path)
+    # write each format of the crosswalk and the README.txt into the archive
+    archive_kws = {"compression": compression, "compresslevel": compresslevel}
+    with zipfile.ZipFile(f"{path}.{ZIP}", "w", **archive_kws) as archive:
+        for fmt in formats:
+            _write_product(archive, xwalk, xwalk_name, fmt)
+        readme_file = f"{readme_name}_README.{TXT}"
+        with open(_readme_path(readme_file), "rb") as readme:
+            _write_member(archive, readme_file, readme.read())
+
+    # keep an uncompressed directory (if desired)
+    if not remove:
+        with zipfile.ZipFile(f"{path}.{ZIP}") as archive:
+            archive.extractall(path)
+
+
+def _write_product(archive, xwalk, xwalk_name, fmt):
+    """Encode a crosswalk straight into an archive member."""
+    member = f"{xwalk_name}.{fmt}"
+    if fmt == CSV:
+        # opened by name, the streamed member takes the compression and level of
+        # the archive and the ``ZipInfo`` default timestamp (``ZIP_DATE_TIME``);
+        # closing the text wrapper closes the member
+        product = archive.open(member, "w", force_zip64=True)
+        with io.TextIOWrapper(product, encoding="utf-8", newline="") as csv:
+            xwalk.to_csv(csv, index=False)
+        archive.getinfo(member).external_attr = ZIP_ATTR
+    else:
+        columnar = io.BytesIO()
+        _to_columnar(xwalk, columnar, fmt)
+        _write_member(archive, member, columnar.getvalue())
+
+
+def _write_member(archive, member, data):
+    """Write an archive member with a fixed timestamp and permissions."""
+    zinfo = zipfile.ZipInfo(member, date_time=ZIP_DATE_TIME)
+    zinfo.external_attr = ZIP_ATTR
+    compress = {"compress_type": archive.compression}
+    compress["compresslevel"] = archive.compresslevel
+    archive.writestr(zinfo, data, **compress)
+
+
+def _readme_path(readme_file):
+    """Find the proper README.txt for a geographic crosswalk."""
+    RESOURCE_README_PATH = "../resources/readme_files/"
+    if not os.path.exists(RESOURCE_README_PATH):
+        # for tests
+        RESOURCE_README_PATH = "./resources/readme_files/"
+    return RESOURCE_README_PATH + readme_file
+
 
-    # run generation workflow
-    _fetch_readme()
-    _zip_directory()
+def _check_formats(formats):
+    """Confirm the data product format(s) as a list."""
+    formats = [formats] if isinstance(formats, str) else list(formats)
+    if not formats or not set(formats).issubset(FORMATS):
+        raise ValueError(f"'formats' must be one or more of {FORMATS}, not {formats}.")
+    return formats
+
+
+def _profiled(profile, stage, name=None, rows_in=None):
+    """A stage of a ``StageProfile`` -- or, without a profile, a context that
+    only yields a record to discard.
+    """
+    if profile is None:
+        return contextlib.nullcontext({})
+    return profile.stage(stage, name=name, rows_in=rows_in)
+
+
+def _check_workers(workers):
+    """Confirm the number of worker processes -- ``None`` is one per CPU."""
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if isinstance(workers, bool) or not isinstance(workers, int) or workers < 1:
+        raise ValueError(f"'workers' must be a positive integer, not {workers!r}.")
+    return workers
+
+
+def _write_data_product(
+    xwalk, xwalk_name, path, sort_by, remove, product_kws, trace_memory=None
+):
+    """Sort (if desired) and write a data product -- run in worker processes.
+    Unless ``trace_memory`` is ``None`` the write is profiled (see
+    ``StageProfile``) and its stage record is returned too.
+    """
+    profile = None if trace_memory is None else StageProfile(trace_memory)
+    with _profiled(profile, "write", xwalk_name, len(xwalk)) as rec:
+        if sort_by:
+            xwalk = xwalk.sort_values(by=sort_by, **{**SORT_PARAMS, "inplace": False})
+        prepare_data_product(xwalk, xwalk_name, path, remove=remove, **product_kws)
+        rec["rows_out"] = len(xwalk)
+    if profile is not None:
+        return f"{path}.{ZIP}", profile.records
+    return f"{path}.{ZIP}"
+
+
+def _write_data_products(products, workers, profile=None):
+    """Write data products -- argument tuples of ``_write_data_product()`` --
+    either in turn or in a pool of ``workers`` processes. The stage record of
+    each write is added to a ``profile``.
+    """
+    if profile is None:
+        return sorted(_pool_starmap(_write_data_product, products, workers))
+    products = ((*product, profile.trace_memory) for product in products)
+    written = _pool_starmap(_write_data_product, products, workers)
+    for _, records in written:
+        profile.extend(records)
+    return sorted(fname for fname, _ in written)
+
+
+def _pool_starmap(func, tasks, workers):
+    """``itertools.starmap()`` either in turn or in a pool of ``workers``
+    processes. At most two tasks (argument tuples) per worker are in flight
+    (pickled and waiting) at once, so the pool never holds much more than the
+    crosswalk partitions it is working on. Results are in the order of tasks.
+    """
+    if workers == 1:
+        return list(itertools.starmap(func, tasks))
+    results, pending = {}, {}
+    with futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        for i, task in enumerate(tasks):
+            if len(pending) >= 2 * workers:
+                done, _ = futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+                results.update((pending.pop(f), f.result()) for f in done)
+            pending[pool.submit(func, *task)] = i
+        results.update((i, f.result()) for f, i in pending.items())
+    return [results[i] for i in range(len(results))]
+
+
+def multi_target_xwalks(base_xwalk, target_geos, rollup=False, **xwalk_kwargs):
+    """Build crosswalks from one source to several target geographies with a
+    single source pass -- the tabular data are read and joined to the base
+    crosswalk, and the source IDs (and 1990 "no data" source IDs) are
+    generated once, then shared by every target (see ``source_pass`` in
+    ``GeoCrossWalk``). With ``rollup`` coarser targets are not built at all,
+    but rolled up from a finer target (see ``GeoCrossWalk.rollup()``).
+
+    Parameters
+    ----------
+
+    base_xwalk : pandas.DataFrame
+        An NHGIS base-level (block) crosswalk.
+
+    target_geos : iterable
+        The target geographic units (see ``target_geo`` in ``GeoCrossWalk``).
+
+    rollup : bool
+        Roll each target up from the first preceding target that nests in it
+        (``True``), so list finer targets first. Those finer crosswalks are
+        built unrounded and rounded only after the rollups. Default is
+        ``False``.
+
+    **xwalk_kwargs
+        The other keyword parameters of ``GeoCrossWalk``.
+
+    Returns
+    -------
+
+    xwalks : dict
+        The ``GeoCrossWalk`` object of each target geographic unit.
+
+    Examples
+    --------
+
+    >>> import nhgisxwalk
+    >>> data_dir = "testing_data_subsets/"
+    >>> base = nhgisxwalk.xwalk_df_from_csv(
+    ...     "nhgis_blk2000_blk2010_gj",
+    ...     path=data_dir,
+    ...     archived=True,
+    ...     remove_unpacked=True,
+    ...     dtype=nhgisxwalk.str_types(["GJOIN2000", "GJOIN2010"]),
+    ... )
+    >>> xwalks = nhgisxwalk.multi_target_xwalks(
+    ...     base,
+    ...     ["tr", "co"],
+    ...     source_year="2000",
+    ...     target_year="2010",
+    ...     source_geo="bgp",
+    ...     base_source_table=data_dir + "2000_block.csv.zip",
+    ...     input_var=["FXS001"],
+    ...     weight_var=["pop"],
+    ... )
+    >>> [xwalk.target for xwalk in xwalks.values()]
+    ['tr2010gj', 'co2010gj']
+
+    """
+    return dict(_target_xwalks(base_xwalk, target_geos, rollup, **xwalk_kwargs))
+
+
+def _target_xwalks(base_xwalk, target_geos, rollup, source_pass=None, **xwalk_kwargs):
+    """Yield the ``GeoCrossWalk`` of each target geographic unit in turn -- see
+    ``multi_target_xwalks()``. The (unrounded) finer crosswalks to roll up are
+    kept in the ``source_pass`` with their parameters, so later calls sharing
+    it roll up from them too.
+    """
+    if source_pass is None:
+        source_pass = {}
+    # (``10`` is the ``GeoCrossWalk`` default)
+    precision = xwalk_kwargs.get("weights_precision", 10)
+    # the parameters of the finer crosswalk that determine the rollups
+    params = [
+        (k, v)
+        for k, v in sorted(xwalk_kwargs.items())
+        if k not in ["weights_precision", "cache", "workers", "profile"]
+    ]
+    for target_geo in target_geos:
+        nests = [
+            finer
+            for finer_params, finer in source_pass.get("rollups", [])
+            if target_geo in ROLLUPS[finer.target_geo]
+            and [k for k, _ in finer_params] == [k for k, _ in params]
+            and _same_source([v for _, v in finer_params], [v for _, v in params])
+        ]
+        if rollup and nests:
+            yield target_geo, nests[0].rollup(target_geo, precision)
+            continue
+        kws = {**xwalk_kwargs, "target_geo": target_geo}
+        if rollup:
+            kws["weights_precision"] = None
+        xwalk_obj = GeoCrossWalk(base_xwalk, source_pass=source_pass, **kws)
+        if rollup and target_geo in ROLLUPS:
+            source_pass.setdefault("rollups", []).append((params, xwalk_obj))
+            if precision:
+                xwalk_obj = copy.copy(xwalk_obj)
+                xwalk_obj.xwalk = round_weights(xwalk_obj.xwalk, decimals=precision)
+        yield target_geo, xwalk_obj
 
 
 def generate_data_product(
@@ -1401,6 +3219,14 @@ def generate_data_product(
     out_path,
     remove_base=True,
     remove_unpacked=True,
+    formats=CSV,
+    compression=zipfile.ZIP_DEFLATED,
+    compresslevel=None,
+    workers=1,
+    cache=None,
+    source_pass=None,
+    rollup=False,
+    profile=None,
 ):
     """Create a national crosswalk, split into state-level (target)
     subsets, then archive all with individual README files. Currently this
@@ -1415,6 +3241,8 @@ def generate_data_product(
 
     xwalk_kwargs : dict
         These are the keyword parameters for generating GeoCrossWalk object.
+        A list of ``target_geo`` values creates a data product of each target
+        geographic unit from a single source pass (see ``multi_target_xwalks()``).
 
     out_path : str
         Output crosswalk (file) name.
@@ -1427,33 +3255,148 @@ def generate_data_product(
         Delete the unzipped directory after (``True``), otherwise ``False``.
         Default is ``True``.
 
+    formats : str or list
+        See ``prepare_data_product()``. Default is ``'csv'``.
+
+    compression : int
+        See ``prepare_data_product()``. Default is ``zipfile.ZIP_DEFLATED``.
+
+    compresslevel : int
+        See ``prepare_data_product()``. Default is ``None``.
+
+    workers : int
+        See ``GeoCrossWalk`` and ``split_xwalk()``. The national crosswalk is
+        built in state partitions and then written alongside the state
+        crosswalks with this many processes. Default is ``1``.
+
+    cache : nhgisxwalk.CrossWalkCache or str
+        See ``GeoCrossWalk``. Default is ``None``.
+
+    source_pass : dict
+        See ``GeoCrossWalk``. Pass the same dictionary to calls with the same
+        base crosswalk and source to share a source pass between them.
+        Default is ``None``, which shares one between the listed targets only.
+
+    rollup : bool
+        See ``multi_target_xwalks()``. With a shared ``source_pass`` targets
+        are also rolled up from the finer targets of earlier calls. Default is
+        ``False``.
+
+    profile : bool or nhgisxwalk.StageProfile
+        Record the stages of each build (see ``GeoCrossWalk``) and each write of
+        a national or state crosswalk (``True``), or add them to a shared
+        ``StageProfile``. Default is ``None``.
+
+    Returns
+    -------
+
+    profile : nhgisxwalk.StageProfile or None
+        The stage records (see the ``profile`` parameter).
+
     """
 
-    # Instantiate an ``nhgisxwalk.GeoCrossWalk`` object
-    xwalk_obj = GeoCrossWalk(base_xwalk, **xwalk_kwargs)
+    formats = _check_formats(formats)
+    workers = _check_workers(workers)
+    product_kws = {
+        "formats": formats,
+        "compression": compression,
+        "compresslevel": compresslevel,
+    }
+
+    target_geos = xwalk_kwargs.get("target_geo")
+    if isinstance(target_geos, str):
+        target_geos = [target_geos]
+    xwalk_kwargs = {k: v for k, v in xwalk_kwargs.items() if k != "target_geo"}
+    profile = StageProfile() if profile is True else profile or None
+    xwalk_kwargs["profile"] = profile
+    # Instantiate an ``nhgisxwalk.GeoCrossWalk`` object of each target
+    xwalk_objs = _target_xwalks(
+        base_xwalk,
+        target_geos,
+        rollup,
+        source_pass=source_pass,
+        cache=cache,
+        workers=workers,
+        **xwalk_kwargs,
+    )
+    for _, xwalk_obj in xwalk_objs:
+        # write out national and state crosswalks
+        xwalk_path = f"{out_path}{xwalk_obj.xwalk_name}"
+        national = (xwalk_obj.xwalk, xwalk_obj.xwalk_name, xwalk_path)
+        products = itertools.chain(
+            [(*national, None, remove_unpacked, product_kws)],
+            _state_products(
+                *national[:2],
+                xwalk_obj.target,
+                "gj",
+                xwalk_path + "_state",
+                None,
+                product_kws,
+            ),
+        )
+        _write_data_products(products, workers, profile=profile)
+        del xwalk_obj
     if remove_base:
         del base_xwalk
+    return profile
 
-    # write out national crosswalk
-    out_path = f"{out_path}{xwalk_obj.xwalk_name}"
-    prepare_data_product(
-        xwalk_obj.xwalk, xwalk_obj.xwalk_name, out_path, remove=remove_unpacked
-    )
 
-    # write out state crosswalks
-    st_path = out_path + "_state"
-    split_xwalk(
-        xwalk_obj.xwalk,
-        xwalk_obj.target,
-        xwalk_obj.xwalk_name,
-        "gj",
-        fpath=st_path,
-    )
-    del xwalk_obj
+def translate_blk_blk_xwalk(df, code):
+    """Translate the ID columns of an NHGIS base-level (block) crosswalk between
+    NHGIS standard GISJOIN IDs and Census Bureau standard GEOID IDs. All IDs
+    are converted in bulk (see ``id_codes.gisjoin_to_geoid()`` and
+    ``id_codes.geoid_to_gisjoin()``), so only one of the two versions of a
+    block to block crosswalk needs to be stored.
+
+    Parameters
+    ----------
+
+    df : pandas.DataFrame
+        An original NHGIS base-level (block) crosswalk with ``ID_COLS`` columns.
+
+    code : str
+        The ID type to translate to -- either the NHGIS standard GISJOIN
+        abbreviation (``'gj'``) or the Census Bureau standard GEOID
+        abbreviation (``'ge'``).
+
+    Returns
+    -------
+
+    out_df : pandas.DataFrame
+        The translated crosswalk. Column order and values are otherwise unchanged.
+
+    """
+
+    gj_ge = dict(zip(ID_COLS[:3], ID_COLS[3:]))
+    if code == "ge":
+        translate, func = gj_ge, gisjoin_to_geoid
+    elif code == "gj":
+        translate, func = {v: k for k, v in gj_ge.items()}, geoid_to_gisjoin
+    else:
+        raise ValueError(f"'code' must be either 'gj' or 'ge', not '{code}'.")
+
+    out_df = df.rename(columns=translate)
+    for from_col, to_col in translate.items():
+        if from_col in df.columns:
+            # the census year is always the GISJOIN column suffix
+            year = (from_col if code == "ge" else to_col)[-4:]
+            out_df[to_col] = func(df[from_col], year=year)
+
+    return out_df
 
 
 def regenerate_blk_blk_xwalk(
-    in_path, out_path, target_column, dtype, archived=True, remove_unpacked=True
+    in_path,
+    out_path,
+    target_column,
+    dtype,
+    archived=True,
+    remove_unpacked=True,
+    translate=False,
+    formats=CSV,
+    compression=zipfile.ZIP_DEFLATED,
+    compresslevel=None,
+    workers=1,
 ):
     """The purpose of this function is specifically to read in the original
     NHGIS block to block crosswalk data, sort it according to ``SORT_PARAMS``,
@@ -1483,8 +3426,34 @@ def regenerate_blk_blk_xwalk(
         Delete the unzipped directory after (``True``), otherwise ``False``.
         Default is ``True``.
 
+    translate : bool
+        Also write the crosswalk with the other ID type (GEOIDs for a ``'gj'``
+        input and GISJOINs for a ``'ge'`` input) translated in bulk with
+        ``translate_blk_blk_xwalk()`` (``True``). Default is ``False``.
+
+    formats : str or list
+        See ``prepare_data_product()``. Default is ``'csv'``.
+
+    compression : int
+        See ``prepare_data_product()``. Default is ``zipfile.ZIP_DEFLATED``.
+
+    compresslevel : int
+        See ``prepare_data_product()``. Default is ``None``.
+
+    workers : int
+        See ``split_xwalk()``. The national crosswalk is written alongside
+        the state crosswalks. Default is ``1``.
+
     """
 
+    formats = _check_formats(formats)
+    workers = _check_workers(workers)
+    product_kws = {
+        "formats": formats,
+        "compression": compression,
+        "compresslevel": compresslevel,
+    }
+
     # split components of the corsswalk path name
     in_path_components = in_path.split("/")
     # isolate the directory housing the crosswalk to read in
@@ -1508,19 +3477,60 @@ def regenerate_blk_blk_xwalk(
     sorter = SORT_BYS[xwalk_name]
     df.sort_values(by=sorter, **SORT_PARAMS)
 
-    # write out national crosswalk
-    out_path = f"{out_path}{xwalk_name}"
-    prepare_data_product(df, xwalk_name, out_path, remove=remove_unpacked)
-
-    # write out state crosswalks
-    st_path = out_path + "_state"
-    split_xwalk(
-        df, target_column, xwalk_name, xwalk_code, fpath=st_path, sort_by=sorter
+    # write out national and state crosswalks
+    product_path = f"{out_path}{xwalk_name}"
+    products = itertools.chain(
+        [(df, xwalk_name, product_path, None, remove_unpacked, product_kws)],
+        _state_products(
+            df,
+            xwalk_name,
+            target_column,
+            xwalk_code,
+            product_path + "_state",
+            sorter,
+            product_kws,
+        ),
     )
+    _write_data_products(products, workers)
+
+    # translate to the other ID type and write out again
+    if translate:
+        other_code = "ge" if xwalk_code == "gj" else "gj"
+        df = translate_blk_blk_xwalk(df, other_code)
+        xwalk_name = xwalk_name[: -len(xwalk_code)] + other_code
+        target_column = dict(zip(ID_COLS, ID_COLS[3:] + ID_COLS[:3]))[target_column]
+        sorter = SORT_BYS[xwalk_name]
+        df.sort_values(by=sorter, **SORT_PARAMS)
+        product_path = f"{out_path}{xwalk_name}"
+        products = itertools.chain(
+            [(df, xwalk_name, product_path, None, remove_unpacked, product_kws)],
+            _state_products(
+                df,
+                xwalk_name,
+                target_column,
+                other_code,
+                product_path + "_state",
+                sorter,
+                product_kws,
+            ),
+        )
+        _write_data_products(products, workers)
     del df
 
 
-def split_xwalk(df, endpoint, fname, code, fpath="", sort_by=None):
+def split_xwalk(
+    df,
+    endpoint,
+    fname,
+    code,
+    fpath="",
+    sort_by=None,
+    formats=CSV,
+    compression=zipfile.ZIP_DEFLATED,
+    compresslevel=None,
+    workers=1,
+    profile=None,
+):
     """Split and write out an original NHGIS base-level (block) crosswalk.
 
     Parameters
@@ -1545,18 +3555,64 @@ def split_xwalk(df, endpoint, fname, code, fpath="", sort_by=None):
     sort_by : list
         See ``sort_by`` parameters in ``extract_state``. Default is ``None``.
 
+    formats : str or list
+        See ``prepare_data_product()``. Default is ``'csv'``.
+
+    compression : int
+        See ``prepare_data_product()``. Default is ``zipfile.ZIP_DEFLATED``.
+
+    compresslevel : int
+        See ``prepare_data_product()``. Default is ``None``.
+
+    workers : int
+        The number of processes writing (sorting, encoding, and compressing)
+        state crosswalks in parallel. Each state partition is sent to a worker
+        as it is needed, and the archives are the same, byte for byte, for any
+        number of workers. ``None`` is one per CPU. Default is ``1``, which
+        writes in turn without a process pool.
+
+    profile : nhgisxwalk.StageProfile
+        Record the split and each write of a state crosswalk in a profile.
+        Default is ``None``.
+
+    Returns
+    -------
+
+    written : list
+        The sorted file names of the state crosswalk archives.
+
     """
 
-    # extract and sort all unique state FIPS codes
-    unique_stfips = extract_unique_stfips(df=df, endpoint=endpoint, code=code)
-    unique_stfips = list(unique_stfips)
-    unique_stfips.sort()
+    formats = _check_formats(formats)
+    workers = _check_workers(workers)
+    product_kws = {
+        "formats": formats,
+        "compression": compression,
+        "compresslevel": compresslevel,
+    }
+
+    # make sure the crosswalk isn't already an extracted state
+    _check_national(fname, None)
+
+    # partition by endpoint (source/target) state in one pass and write each
+    with _profiled(profile, "split_xwalk", fname, len(df)) as rec:
+        first_write = None if profile is None else len(profile.records)
+        products = _state_products(
+            df, fname, endpoint, code, fpath, sort_by, product_kws
+        )
+        written = _write_data_products(products, workers, profile=profile)
+        if profile is not None:
+            # the rows written to the state crosswalks
+            writes = profile.records[first_write:]
+            rec["rows_out"] = sum(
+                w["rows_out"] for w in writes if w["stage"] == "write"
+            )
+    return written
+
 
-    # iterate over each unique state FIPS code
-    for stfips in unique_stfips:
-        # create a subset for each endpoint (source/target) state
-        stdf = extract_state(df, stfips, fname, endpoint, code=code, sort_by=sort_by)
+def _state_products(df, fname, endpoint, code, fpath, sort_by, product_kws):
+    """Data products (``_write_data_product()`` arguments) for each state."""
+    for stfips, stdf in state_partitions(df, endpoint, code=code):
         xwalk_name = fname + "_" + stfips
         stfpath = os.path.join(fpath, xwalk_name)
-        prepare_data_product(stdf, xwalk_name, stfpath, remove=True)
-        del stdf
+        yield stdf, xwalk_name, stfpath, sort_by, True, product_kws
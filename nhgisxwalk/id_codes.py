@@ -8,6 +8,7 @@
 
 
 from io import StringIO
+from itertools import repeat
 
 import numpy
 import pandas
@@ -136,6 +137,136 @@ def generate_geoid(in_id):
     return out_id
 
 
+def gisjoin_to_geoid(ids, year=None):
+    """Convert whole columns of GISJOIN IDs to GEOID IDs. This is the bulk
+    counterpart of ``generate_geoid()``: all IDs are validated at once and
+    the state, county, and remaining components are sliced out of a single
+    character matrix. Missing IDs are passed through.
+    Note: NOT functional for Block Group Parts (only NHGIS).
+
+    Parameters
+    ----------
+
+    ids : iterable
+        Input GISJOIN IDs.
+
+    year : str
+        Set to ``'1990'`` for 1990 block IDs, where NHGIS 4-digit tract
+        codes are extended to 6 digits with an appended "00" in GEOIDs.
+        Default is ``None``.
+
+    Returns
+    -------
+
+    out_ids : numpy.array
+        Converted IDs.
+
+    """
+
+    values, missing = _id_array(ids, check_str=True)
+    chars = _char_matrix(values, min_width=8)
+    lengths = numpy.char.str_len(values)
+
+    # validate all IDs at once
+    invalid = ((chars[:, 0] != "G") | (lengths < 8)) & ~missing
+    _raise_invalid_ids(values[invalid], "NHGIS prefix ('G') and length (>= 8)")
+
+    # state + county + everything after the county trailing zero
+    keep = [1, 2, 4, 5, 6] + list(range(8, chars.shape[1]))
+    out_ids = _from_char_matrix(chars[:, keep]).astype(object)
+
+    if year == "1990":
+        # blocks with 4-digit tracts -- even lengths have 4-character blocks
+        tract_len = lengths - 8 - numpy.where(lengths % 2 == 0, 4, 3)
+        short = (tract_len == 4) & ~missing
+        if short.any():
+            tract = chars[short]
+            out_ids[short] = _from_char_matrix(
+                numpy.hstack(
+                    [tract[:, keep[:9]], _const_chars("00", short.sum())]
+                    + [tract[:, 12:]]
+                )
+            )
+
+    out_ids[missing] = numpy.nan
+
+    return out_ids
+
+
+def geoid_to_gisjoin(ids, year=None):
+    """Convert whole columns of GEOID IDs to GISJOIN IDs -- the inverse of
+    ``gisjoin_to_geoid()``. The 'G' prefix and the state and county
+    trailing zeros are inserted into a single character matrix. Missing
+    IDs are passed through.
+
+    Parameters
+    ----------
+
+    ids : iterable
+        Input GEOID IDs.
+
+    year : str
+        Set to ``'1990'`` for 1990 block IDs, where 6-digit tract codes
+        ending in "00" are 4-digit tract codes in NHGIS GISJOINs.
+        Default is ``None``.
+
+    Returns
+    -------
+
+    out_ids : numpy.array
+        Converted IDs.
+
+    """
+
+    values, missing = _id_array(ids, check_str=True)
+    chars = _char_matrix(values, min_width=5)
+    lengths = numpy.char.str_len(values)
+
+    # validate all IDs at once -- state and county must be digits
+    state_county = chars[:, :5]
+    digits = ((state_county >= "0") & (state_county <= "9")).all(axis=1)
+    invalid = (~digits | (lengths < 5)) & ~missing
+    _raise_invalid_ids(values[invalid], "state/county digits and length (>= 5)")
+
+    n = values.size
+    out_ids = _from_char_matrix(
+        numpy.hstack(
+            [
+                _const_chars("G", n),
+                chars[:, :2],
+                _const_chars("0", n),
+                chars[:, 2:5],
+                _const_chars("0", n),
+                chars[:, 5:],
+            ]
+        )
+    ).astype(object)
+
+    if year == "1990":
+        # 6-digit tracts ending in "00" are 4-digit NHGIS tracts
+        short = (lengths > 11) & ~missing
+        short[short] = (chars[short, 9] == "0") & (chars[short, 10] == "0")
+        if short.any():
+            tract = chars[short]
+            out_ids[short] = _from_char_matrix(
+                numpy.hstack(
+                    [
+                        _const_chars("G", short.sum()),
+                        tract[:, :2],
+                        _const_chars("0", short.sum()),
+                        tract[:, 2:5],
+                        _const_chars("0", short.sum()),
+                        tract[:, 5:9],
+                        tract[:, 11:],
+                    ]
+                )
+            )
+
+    out_ids[missing] = numpy.nan
+
+    return out_ids
+
+
 def gisjoin_id(record, component_order, trailing_zeros):
     """GISJOIN ID generator. Add 'G' and trailing zeros.
     See GISJOIN identifiers
@@ -183,7 +314,69 @@ def gisjoin_id(record, component_order, trailing_zeros):
     return _id
 
 
-def blk_gj(df, order, cname="GISJOIN", tzero=["STATE", "COUNTY"]):
+def gisjoin_ids(df, component_order, trailing_zeros):
+    """Columnar GISJOIN ID generator. Add 'G' and trailing zeros to
+    entire columns at once. This produces the same IDs as calling
+    ``gisjoin_id()`` on each record, but joins whole columns of ID
+    components (one string allocation per ID) instead of building a
+    ``namedtuple`` and calling ``getattr`` for every record component.
+
+    Parameters
+    ----------
+
+    df : pandas.DataFrame
+        The input dataframe.
+
+    component_order : list
+         The correct ordering of columns to create the ID.
+
+    trailing_zeros : list
+        The specific columns to add a trailing zero.
+
+    Returns
+    -------
+
+    _ids : numpy.array
+        The GISJOIN version of census geography IDs if the geography
+        exists, otherwise ``numpy.nan``.
+
+    """
+
+    endex = -1
+    vend = df[component_order[endex]].to_numpy(dtype=object)
+    # if the block ID isn't in the summary data
+    exists = ~(pandas.isna(vend) | (vend == "nan"))
+    all_exist = exists.all()
+    _ids = vend.copy()
+
+    def _column(co):
+        """Fetch the values of an ID component column for existing IDs."""
+        v = df[co].to_numpy(dtype=object)
+        return v if all_exist else v[exists]
+
+    # G prefix for GISJOIN
+    join_id_vals = [repeat("G")]
+    for co in component_order[:endex]:
+        # append ID component column to ID columns
+        join_id_vals.append(_column(co))
+        # add trailing zero for NHGIS
+        if co in trailing_zeros:
+            join_id_vals.append(repeat("0"))
+    join_id_vals.append(_column(component_order[endex]))
+    # concatenate ID component columns
+    _ids[exists] = ["".join(vals) for vals in zip(*join_id_vals)]
+
+    return _ids
+
+
+def _gisjoin_column(df, order, tzero, vectorized):
+    """Build a GISJOIN ID column either columnar or record-by-record."""
+    if vectorized:
+        return gisjoin_ids(df, order, tzero)
+    return [gisjoin_id(record, order, tzero) for record in df.itertuples()]
+
+
+def blk_gj(df, order, cname="GISJOIN", tzero=["STATE", "COUNTY"], vectorized=True):
     """Recreate BLK GISJOIN ---- Used to extract 2000 block UR codes.
 
     Parameters
@@ -201,6 +394,11 @@ def blk_gj(df, order, cname="GISJOIN", tzero=["STATE", "COUNTY"]):
     tzeros : list
         The columns to add trailing zero. Default is ['STATE', 'COUNTY'].
 
+    vectorized : bool
+        Build the IDs from whole columns with ``gisjoin_ids()`` (``True``)
+        or record-by-record with ``gisjoin_id()`` (``False``).
+        Default is ``True``.
+
     Returns
     -------
 
@@ -209,11 +407,11 @@ def blk_gj(df, order, cname="GISJOIN", tzero=["STATE", "COUNTY"]):
 
     """
 
-    df[cname] = [gisjoin_id(record, order, tzero) for record in df.itertuples()]
+    df[cname] = _gisjoin_column(df, order, tzero, vectorized)
     return df
 
 
-def bgp_gj(df, order, cname="_GJOIN", tzero=["STATEA", "COUNTYA"]):
+def bgp_gj(df, order, cname="_GJOIN", tzero=["STATEA", "COUNTYA"], vectorized=True):
     """Recreate BGPs GISJOIN ID.
 
     Parameters
@@ -231,6 +429,11 @@ def bgp_gj(df, order, cname="_GJOIN", tzero=["STATEA", "COUNTYA"]):
     tzeros : list
         The columns to add trailing zero. Default is ['STATEA', 'COUNTYA'].
 
+    vectorized : bool
+        Build the IDs from whole columns with ``gisjoin_ids()`` (``True``)
+        or record-by-record with ``gisjoin_id()`` (``False``).
+        Default is ``True``.
+
     Returns
     -------
 
@@ -240,11 +443,19 @@ def bgp_gj(df, order, cname="_GJOIN", tzero=["STATEA", "COUNTYA"]):
     """
 
     # recreate GISJOIN ID (_GJOIN, [or other])
-    df[cname] = [gisjoin_id(record, order, tzero) for record in df.itertuples()]
+    df[cname] = _gisjoin_column(df, order, tzero, vectorized)
     return df
 
 
-def bg_gj(year, _id, df=None, order=None, cname="GISJOIN", tzero=["STATEA", "COUNTYA"]):
+def bg_gj(
+    year,
+    _id,
+    df=None,
+    order=None,
+    cname="GISJOIN",
+    tzero=["STATEA", "COUNTYA"],
+    vectorized=True,
+):
     """Extract the block group ID from the block ID.
     See GISJOIN identifiers
     [https://www.nhgis.org/user-resources/geographic-crosswalks].
@@ -273,6 +484,11 @@ def bg_gj(year, _id, df=None, order=None, cname="GISJOIN", tzero=["STATEA", "COU
     tzeros : list
         The columns to add trailing zero. Default is ['STATEA', 'COUNTYA'].
 
+    vectorized : bool
+        Build the IDs from whole columns with ``gisjoin_ids()`` (``True``)
+        or record-by-record with ``gisjoin_id()`` (``False``).
+        Default is ``True``.
+
     Returns
     -------
 
@@ -299,7 +515,7 @@ def bg_gj(year, _id, df=None, order=None, cname="GISJOIN", tzero=["STATEA", "COU
 
     else:
         # scenario 2: build ID from summary file (whole dataframe)
-        df[cname] = [gisjoin_id(record, order, tzero) for record in df.itertuples()]
+        df[cname] = _gisjoin_column(df, order, tzero, vectorized)
         return df
 
 
@@ -375,6 +591,129 @@ def co_gj(year, _id):
     return county_id
 
 
+def _id_array(ids, check_str=False):
+    """Convert IDs to a fixed-width unicode array and flag missing IDs."""
+    ids = numpy.asarray(ids, dtype=object)
+    missing = pandas.isna(ids)
+    if missing.any():
+        ids = ids.copy()
+        ids[missing] = ""
+    if check_str and pandas.api.types.infer_dtype(ids) not in ["string", "empty"]:
+        raise TypeError("Check the data type of the IDs -- all must be 'str'.")
+    return ids.astype(str), missing
+
+
+def _char_matrix(values, min_width=1):
+    """View a fixed-width unicode array as a 2-D matrix of characters."""
+    width = values.dtype.itemsize // 4
+    if width < min_width:
+        values, width = values.astype(f"U{min_width}"), min_width
+    return values.view("U1").reshape(values.size, width)
+
+
+def _from_char_matrix(chars):
+    """Collapse a 2-D matrix of characters into a fixed-width unicode array."""
+    chars = numpy.ascontiguousarray(chars)
+    return chars.view(f"U{max(chars.shape[1], 1)}").reshape(chars.shape[0])
+
+
+def _const_chars(chars, n):
+    """A 2-D matrix of ``n`` rows of the same characters."""
+    return numpy.tile(numpy.array(list(chars), dtype="U1"), (n, 1))
+
+
+def _raise_invalid_ids(bad_ids, expected):
+    """Raise a single error listing (up to 10) invalid IDs."""
+    if bad_ids.size:
+        msg = f"Check the {expected} of {bad_ids.size} ID(s): "
+        msg += ", ".join(f"'{i}'" for i in bad_ids[:10])
+        msg += ", ..." if bad_ids.size > 10 else ""
+        raise ValueError(msg)
+
+
+def _truncate(values, stops):
+    """Keep the first ``stops`` characters of each ID (scalar or per ID)."""
+    if numpy.ndim(stops) and stops.size and stops.min() == stops.max():
+        stops = stops[0]
+    if numpy.ndim(stops) == 0:
+        return values.astype(f"U{max(int(stops), 1)}")
+    chars = _char_matrix(values).copy()
+    # null characters are trailing padding in a fixed-width unicode array
+    chars[numpy.arange(chars.shape[1]) >= stops[:, None]] = ""
+    return _from_char_matrix(chars)
+
+
+# minimum block GISJOIN lengths for (columnar) target ID slicing
+_gj_slice_lengths = {
+    ("bg", "1990"): 15,
+    ("bg", "2010"): 18,
+    ("tr", "2010"): 14,
+    ("co", "2010"): 8,
+}
+
+
+def slice_gj_ids(geog, year, ids):
+    """Extract block group, tract, or county GISJOINs from whole columns
+    of block GISJOINs. This is the columnar counterpart of ``bg_gj()``,
+    ``tr_gj()``, and ``co_gj()``: each is a fixed-width slice of the block
+    GISJOIN (parity-dependent for 1990 block groups), so all IDs are
+    validated and sliced at once. Missing IDs are passed through.
+
+    Parameters
+    ----------
+
+    geog : str
+        The target census geography -- ``'bg'``, ``'tr'``, or ``'co'``.
+
+    year : str
+        The census collection year.
+
+    ids : iterable
+        The block GISJOINs.
+
+    Returns
+    -------
+
+    result : numpy.array
+        The target geography GISJOINs.
+
+    """
+
+    if (geog, year) not in _gj_slice_lengths:
+        msg = f"Census year {year} is not currently supported for '{geog}'."
+        raise ValueError(msg)
+    min_length = _gj_slice_lengths[geog, year]
+
+    values, missing = _id_array(ids)
+    lengths = numpy.char.str_len(values)
+
+    # validate the prefix and length of all IDs at once
+    invalid = (_char_matrix(values)[:, 0] != "G") | (lengths < min_length)
+    invalid &= ~missing
+    expected = f"NHGIS prefix ('G') and length (>= {min_length})"
+    _raise_invalid_ids(values[invalid], expected)
+
+    if geog == "bg":
+        # 1990 -- Block Group (by State--County--Census Tract)
+        if year == "1990":
+            indexer = numpy.where(lengths % 2 == 0, 3, 2)
+        if year == "2010":
+            indexer = 3
+        stops = lengths - indexer
+    else:
+        # tract and county IDs are fixed-width prefixes
+        stops = min_length
+
+    result = _truncate(values, stops).astype(object)
+    result[missing] = numpy.nan
+
+    return result
+
+
+# record-level ID functions with a columnar (sliced) counterpart
+_sliced_geographies = {bg_gj: "bg", tr_gj: "tr", co_gj: "co"}
+
+
 def id_from(target_func, target_year, source, vectorized):
     """Create target IDs from source IDs.
 
@@ -388,10 +727,14 @@ def id_from(target_func, target_year, source, vectorized):
         The original target ID year.
 
     source : iterable
-        The original source IDs.
+        The original source IDs. Target IDs of categorical source IDs
+        are derived once per category and returned as a categorical.
 
     vectorized : bool
-        Potential speedup when set to ``True``. Default is ``True``.
+        Derive all target IDs at once (``True``). For ``bg_gj()``,
+        ``tr_gj()``, and ``co_gj()`` this slices whole columns with
+        ``slice_gj_ids()``, otherwise ``numpy.vectorize`` is used.
+        Default is ``True``.
 
     Returns
     -------
@@ -401,8 +744,19 @@ def id_from(target_func, target_year, source, vectorized):
 
     """
 
+    # derive target IDs from the categories of categorical source IDs only
+    if isinstance(getattr(source, "dtype", None), pandas.CategoricalDtype):
+        source = pandas.Categorical(source)
+        result = id_from(target_func, target_year, source.categories, vectorized)
+        codes, categories = pandas.factorize(numpy.asarray(result), sort=True)
+        codes = numpy.where(source.codes >= 0, codes[source.codes], -1)
+        return pandas.Categorical.from_codes(codes, categories=categories)
+
     # generate IDs from source geographies to target geographies
-    if vectorized:
+    if vectorized and target_func in _sliced_geographies:
+        geog = _sliced_geographies[target_func]
+        result = slice_gj_ids(geog, target_year, source)
+    elif vectorized:
         result = numpy.vectorize(target_func)(target_year, source)
     else:
         result = [target_func(target_year, rec) for rec in source]
@@ -0,0 +1,365 @@
+# This file is part of the Minnesota Population Center's NHGISXWALK.
+# For copyright and licensing information, see the NOTICE and LICENSE files
+# in this project's top-level directory, and also on-line at:
+#   https://github.com/ipums/nhgisxwalk
+
+"""Integer-packed keys for geographic IDs. GISJOIN and GEOID layouts are fixed
+width and (nearly) all digits -- see ``__code_components`` -- so each ID packs
+losslessly into one or more ``uint64`` words that sort in the same order as
+the original strings. Joins, groupbys, and set operations on the packed keys
+avoid hashing and comparing Python ``str`` objects.
+"""
+
+import numpy
+import pandas
+
+from .id_codes import _char_matrix, _from_char_matrix, _id_array, _raise_invalid_ids
+
+# packed character values -- padding (of shorter IDs) sorts first,
+# then digits, then (upper case) letters, as in the original strings
+_ALPHABET = "\0" + "0123456789" + "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+_CHARS = numpy.array(list(_ALPHABET), dtype="U1")
+_VALUES = numpy.full(128, -1, dtype=numpy.int64)
+_VALUES[[ord(c) for c in _ALPHABET]] = numpy.arange(len(_ALPHABET))
+_DIGITS_RADIX, _ALPHABET_RADIX = 11, len(_ALPHABET)
+
+# missing IDs are packed with all bits set, which no valid word can reach
+MISSING = numpy.iinfo(numpy.uint64).max
+_WORD_LIMIT = int(MISSING)
+
+
+class IDCodec:
+    """Lossless, order-preserving packing of geographic IDs into ``uint64``
+    keys. Each character position of the IDs is either a constant (e.g. the
+    GISJOIN 'G' prefix and trailing zeros), a digit (radix 11, including
+    padding for shorter IDs), or a digit/letter (radix 37). Positions are
+    packed into as few words as possible, e.g. one word for block GISJOINs and
+    two words for block group parts with an urban/rural letter.
+
+    Parameters
+    ----------
+
+    constants : list
+        The constant character at each position or ``None`` if it varies.
+
+    radices : list
+        The radix of each position. This is ``1`` for constant positions.
+
+    Attributes
+    ----------
+
+    width : int
+        The maximum length of an encodable ID.
+
+    words : list
+        The positions packed into each ``uint64`` word.
+
+    n_words : int
+        The number of ``uint64`` words per ID.
+
+    Examples
+    --------
+
+    >>> from nhgisxwalk.id_keys import IDCodec
+    >>> ids = ["G10000509355299999051304R1", "G10000509355299999051304U2"]
+    >>> codec = IDCodec.fit(ids)
+    >>> codec.n_words
+    1
+    >>> keys = codec.encode(ids)
+    >>> codec.decode(keys).tolist() == ids
+    True
+
+    """
+
+    def __init__(self, constants, radices):
+        self.constants, self.radices = list(constants), list(radices)
+        self.width = len(self.radices)
+
+        # greedily fill words with varying positions
+        self.words, capacity = [[]], 1
+        for pos, radix in enumerate(self.radices):
+            if radix == 1:
+                continue
+            if capacity * radix > _WORD_LIMIT:
+                self.words, capacity = self.words + [[]], 1
+            self.words[-1].append(pos)
+            capacity *= radix
+        self.n_words = len(self.words)
+
+    def __repr__(self):
+        return f"IDCodec(width={self.width}, n_words={self.n_words})"
+
+    @classmethod
+    def fit(cls, *ids):
+        """Determine the packing layout of all positions in one or more
+        collections of IDs. All collections that will be compared, joined, or
+        combined must be encoded with the same codec.
+        """
+        uniques = pandas.unique(numpy.concatenate([_unique_ids(i)[1] for i in ids]))
+        return cls._from_values(_char_values(uniques)[0])
+
+    @classmethod
+    def _from_values(cls, values):
+        """Create a codec from the character values of unique IDs."""
+        constants, radices = [], []
+        if not values.size:
+            return cls(constants, radices)
+        for col in values.T:
+            if (col == col[0]).all():
+                constants.append(_ALPHABET[col[0]])
+                radices.append(1)
+            else:
+                constants.append(None)
+                digits = col.max() < _DIGITS_RADIX
+                radices.append(_DIGITS_RADIX if digits else _ALPHABET_RADIX)
+        return cls(constants, radices)
+
+    def encode(self, ids, strict=True):
+        """Pack IDs into a ``(len(ids), n_words)`` array of ``uint64`` keys.
+        Only unique IDs are packed. Missing IDs are packed as ``MISSING``.
+        IDs that do not fit the layout of the codec raise an error, unless
+        ``strict=False`` -- then they are packed as ``MISSING``, which is
+        useful when looking up IDs that can not be among the fitted IDs.
+        """
+        codes, uniques = _unique_ids(ids)
+        return self._take(self._pack(uniques, strict=strict), codes)
+
+    def decode(self, keys):
+        """Unpack ``uint64`` keys into IDs. Only unique keys are unpacked.
+        Missing keys are unpacked as ``numpy.nan``.
+        """
+        keys = numpy.asarray(keys, dtype=numpy.uint64).reshape(-1, self.n_words)
+        codes = _factorize_rows(keys)
+        first = numpy.full(codes.max() + 1 if codes.size else 0, -1)
+        first[codes[::-1]] = numpy.arange(codes.size)[::-1]
+        uniques = keys[first]
+        missing = (uniques == MISSING).all(axis=1)
+        ids = numpy.full(uniques.shape[0], numpy.nan, dtype=object)
+        ids[~missing] = self._unpack(uniques[~missing])
+        return ids[codes]
+
+    def _pack(self, uniques, strict=True):
+        """Pack unique (non-missing) IDs."""
+        values, invalid = _char_values(uniques, width=self.width, strict=strict)
+        for pos, (const, radix) in enumerate(zip(self.constants, self.radices)):
+            if radix == 1:
+                invalid |= values[:, pos] != _VALUES[ord(const)]
+            else:
+                invalid |= values[:, pos] >= radix
+        if strict:
+            _raise_invalid_ids(uniques[invalid], f"layout ({self!r})")
+        packed = self._pack_values(values)
+        packed[invalid] = MISSING
+        return packed
+
+    def _pack_values(self, values):
+        """Pack the (validated) character values of IDs."""
+        packed = numpy.zeros((values.shape[0], self.n_words), dtype=numpy.uint64)
+        for word, positions in enumerate(self.words):
+            for pos in positions:
+                packed[:, word] *= numpy.uint64(self.radices[pos])
+                packed[:, word] += values[:, pos].astype(numpy.uint64)
+        return packed
+
+    def _unpack(self, packed):
+        """Unpack unique (non-missing) keys."""
+        values = numpy.zeros((packed.shape[0], self.width), dtype=numpy.int64)
+        for pos, (const, radix) in enumerate(zip(self.constants, self.radices)):
+            if radix == 1:
+                values[:, pos] = _VALUES[ord(const)]
+        for word, positions in enumerate(self.words):
+            remainder = packed[:, word].copy()
+            for pos in positions[::-1]:
+                radix = numpy.uint64(self.radices[pos])
+                values[:, pos] = remainder % radix
+                remainder //= radix
+        return _from_char_matrix(_CHARS[values]).astype(object)
+
+    def _take(self, packed, codes):
+        """Expand packed unique IDs to all IDs by their codes."""
+        keys = numpy.full((codes.size, self.n_words), MISSING, dtype=numpy.uint64)
+        found = codes >= 0
+        keys[found] = packed[codes[found]]
+        return keys
+
+
+def _unique_ids(ids):
+    """Factorize IDs -- categorical IDs reuse their categories."""
+    if isinstance(getattr(ids, "dtype", None), pandas.CategoricalDtype):
+        ids = pandas.Series(ids)
+        return ids.cat.codes.to_numpy(), ids.cat.categories.to_numpy(dtype=object)
+    codes, uniques = pandas.factorize(numpy.asarray(ids, dtype=object))
+    return codes, numpy.asarray(uniques, dtype=object)
+
+
+def _char_values(ids, width=None, strict=True):
+    """Packed character values of (non-missing) IDs in a 2-D matrix,
+    optionally truncated/padded to a fixed ``width``. Also returns flags for
+    IDs that are too long or contain unsupported characters.
+    """
+    ids, _ = _id_array(ids, check_str=True)
+    chars = _char_matrix(ids, min_width=width or 1)
+    too_long = numpy.zeros(ids.size, dtype=bool)
+    if width is not None:
+        too_long = (chars[:, width:] != "").any(axis=1)
+        chars = chars[:, :width]
+    points = chars.view(numpy.uint32)
+    values = _VALUES[numpy.minimum(points, 127)]
+    unsupported = ((values < 0) | (points > 127)).any(axis=1)
+    if strict:
+        _raise_invalid_ids(ids[too_long], "length")
+        _raise_invalid_ids(ids[unsupported], "characters")
+    invalid = too_long | unsupported
+    values[invalid] = 0
+    return values, invalid
+
+
+def _factorize_rows(keys):
+    """Factorize the rows of a 2-D key array into ``int64`` codes. Codes are
+    sorted, so they follow the order of the original IDs.
+    """
+    codes = numpy.zeros(keys.shape[0], dtype=numpy.int64)
+    for word in keys.T:
+        word_codes, word_uniques = pandas.factorize(word, sort=True)
+        codes = codes * len(word_uniques) + word_codes
+        codes, _ = pandas.factorize(codes, sort=True)
+    return codes
+
+
+def pack_ids(*ids):
+    """Pack one or more collections of IDs with a shared ``IDCodec``.
+
+    Parameters
+    ----------
+
+    ids : iterable
+        Collections of IDs to pack.
+
+    Returns
+    -------
+
+    codec : IDCodec
+        The codec fit to all IDs.
+
+    keys : list
+        A ``(len(ids), codec.n_words)`` array of ``uint64`` keys for each
+        collection of IDs.
+
+    """
+    factorized = [_unique_ids(i) for i in ids]
+    values = [_char_values(u)[0] for _, u in factorized]
+    # pad to a common width, then fit on the character values of all IDs
+    width = max(v.shape[1] for v in values)
+    values = [numpy.pad(v, ((0, 0), (0, width - v.shape[1]))) for v in values]
+    codec = IDCodec._from_values(numpy.vstack(values))
+    keys = [
+        codec._take(codec._pack_values(v), c) for v, (c, _) in zip(values, factorized)
+    ]
+    return codec, keys
+
+
+def _joint_codes(keys1, keys2):
+    """Jointly factorize the rows of two 2-D key arrays."""
+    if keys1.shape[1] == 1:
+        return keys1[:, 0], keys2[:, 0]
+    codes = _factorize_rows(numpy.vstack([keys1, keys2]))
+    return codes[: len(keys1)], codes[len(keys1) :]
+
+
+def is_missing(keys):
+    """Flag the missing IDs in a 2-D key array."""
+    return (keys == MISSING).all(axis=1)
+
+
+def isin_keys(keys1, keys2):
+    """Flag the rows of ``keys1`` that are also in ``keys2``. Both must be
+    packed with the same codec. Missing keys are never found.
+    """
+    codes1, codes2 = _joint_codes(keys1, keys2)
+    return ~is_missing(keys1) & numpy.isin(codes1, codes2)
+
+
+def setdiff_keys(keys1, keys2):
+    """The sorted, unique (non-missing) rows of ``keys1`` that are not in
+    ``keys2``. Both must be packed with the same codec.
+    """
+    codes1, codes2 = _joint_codes(keys1, keys2)
+    keep = ~is_missing(keys1) & ~numpy.isin(codes1, codes2)
+    _, first = numpy.unique(codes1[keep], return_index=True)
+    return keys1[keep][first]
+
+
+def key_indexer(keys, target_keys):
+    """The position of each row of ``keys`` within the (unique) rows of
+    ``target_keys``, or ``-1`` when not found. Both must be packed with the
+    same codec. This is ``None`` when ``target_keys`` has duplicate rows.
+    """
+    codes, target_codes = _joint_codes(keys, target_keys)
+    target_index = pandas.Index(target_codes)
+    if not target_index.is_unique:
+        return None
+    indexer = target_index.get_indexer(codes)
+    indexer[is_missing(keys)] = -1
+    return indexer
+
+
+def group_keys(*keys):
+    """Group rows by one or more 2-D key arrays (e.g. source and target).
+
+    Returns
+    -------
+
+    codes : numpy.array
+        The group of each row, in sorted key order, or ``-1`` for rows with a
+        missing key.
+
+    first : numpy.array
+        The first row in each group.
+
+    """
+    codes = _factorize_rows(numpy.hstack(keys))
+    missing = numpy.any([is_missing(k) for k in keys], axis=0)
+    if missing.any():
+        codes[missing] = -1
+        codes[~missing] = pandas.factorize(codes[~missing], sort=True)[0]
+    first = numpy.full(codes.max() + 1 if codes.size else 0, -1)
+    present = numpy.flatnonzero(codes >= 0)[::-1]
+    first[codes[present]] = present
+    return codes, first
+
+
+def setdiff_ids(ids1, ids2):
+    """The sorted, unique IDs in ``ids1`` that are not in ``ids2`` computed
+    on packed keys. This matches ``numpy.setdiff1d``, but missing IDs are
+    never returned.
+    """
+    codec, (keys1, keys2) = pack_ids(ids1, ids2)
+    return codec.decode(setdiff_keys(keys1, keys2))
+
+
+def isin_pairs(pairs1, pairs2):
+    """Flag the (source, target) ID pairs in ``pairs1`` that are also in
+    ``pairs2`` -- an anti-join is the inverse. Both IDs of each pair are
+    packed, so no concatenated "atom ID" strings are created. Pairs with a
+    missing ID are never found.
+
+    Parameters
+    ----------
+
+    pairs1 : tuple
+        A pair of equal length collections of source and target IDs.
+
+    pairs2 : tuple
+        A pair of equal length collections of source and target IDs.
+
+    Returns
+    -------
+
+    found : numpy.array
+        Boolean flags for each pair in ``pairs1``.
+
+    """
+    _, (src1, src2) = pack_ids(pairs1[0], pairs2[0])
+    _, (trg1, trg2) = pack_ids(pairs1[1], pairs2[1])
+    found = isin_keys(numpy.hstack([src1, trg1]), numpy.hstack([src2, trg2]))
+    return found & ~is_missing(src1) & ~is_missing(trg1)
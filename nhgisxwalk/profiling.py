@@ -0,0 +1,187 @@
+# This file is part of the Minnesota Population Center's NHGISXWALK.
+# For copyright and licensing information, see the NOTICE and LICENSE files
+# in this project's top-level directory, and also on-line at:
+#   https://github.com/ipums/nhgisxwalk
+
+"""Per-stage timing and peak memory of crosswalk builds and data products.
+"""
+
+import contextlib
+import json
+import sys
+import time
+import tracemalloc
+
+import pandas
+
+try:
+    import resource
+except ImportError:  # pragma: no cover -- not available on Windows
+    resource = None
+
+# the fields of each stage record
+RECORD_FIELDS = [
+    "stage",
+    "name",
+    "depth",
+    "rows_in",
+    "rows_out",
+    "wall_time",
+    "cpu_time",
+    "peak_memory",
+    "max_rss",
+]
+
+
+class StageProfile:
+    """A record of the named stages of a build -- wall and CPU time (seconds),
+    row counts in and out, the peak memory allocated within the stage
+    (``tracemalloc`` bytes above the memory allocated on entry), and the peak
+    resident set size of the process (bytes) on exit. Stages nest: a stage
+    within another has a greater ``depth`` and its peak is included in the
+    peak of the enclosing stage.
+
+    Parameters
+    ----------
+
+    trace_memory : bool
+        Trace the memory allocations of each stage with ``tracemalloc``
+        (``True``). Tracing slows the stages down severalfold, which skews
+        their times, so profile the times and the memory in separate passes.
+        Default is ``False``, which leaves ``peak_memory`` empty.
+
+    Attributes
+    ----------
+
+    records : list
+        A ``dict`` of each stage (see ``RECORD_FIELDS``) in the order the
+        stages started.
+
+    Examples
+    --------
+
+    >>> import nhgisxwalk
+    >>> profile = nhgisxwalk.StageProfile(trace_memory=True)
+    >>> with profile.stage("outer", rows_in=3) as rec:
+    ...     with profile.stage("inner"):
+    ...         data = list(range(10_000))
+    ...     rec["rows_out"] = 2
+    >>> df = profile.to_frame()
+    >>> df[["stage", "depth", "rows_in", "rows_out"]]
+       stage  depth  rows_in  rows_out
+    0  outer      0      3.0       2.0
+    1  inner      1      NaN       NaN
+
+    >>> bool((df["peak_memory"] > 0).all())
+    True
+
+    """
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.records = []
+        self._stack = []
+        self._started_tracing = False
+
+    @contextlib.contextmanager
+    def stage(self, stage, name=None, rows_in=None):
+        """Time a stage and, if traced, its peak memory. The stage record
+        (``dict``) is yielded, so the number of rows out can be set within the
+        stage.
+
+        Parameters
+        ----------
+
+        stage : str
+            The stage.
+
+        name : str
+            The name of what the stage works on, e.g. the crosswalk name.
+            Default is ``None``.
+
+        rows_in : int
+            The number of rows in. Default is ``None``.
+
+        """
+        record = dict.fromkeys(RECORD_FIELDS)
+        record.update(stage=stage, name=name, depth=len(self._stack))
+        record["rows_in"] = rows_in
+        self.records.append(record)
+        trace = self.trace_memory
+        if trace:
+            if not self._stack and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                # keep the peak of the enclosing stage before resetting it
+                outer = self._stack[-1]
+                outer["_peak"] = max(outer["_peak"], peak)
+            tracemalloc.reset_peak()
+            record["_start"], record["_peak"] = current, current
+        self._stack.append(record)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            record["wall_time"] = time.perf_counter() - wall
+            record["cpu_time"] = time.process_time() - cpu
+            self._stack.pop()
+            if trace:
+                peak = max(record.pop("_peak"), tracemalloc.get_traced_memory()[1])
+                record["peak_memory"] = peak - record.pop("_start")
+                if self._stack:
+                    outer = self._stack[-1]
+                    outer["_peak"] = max(outer["_peak"], peak)
+                elif self._started_tracing:
+                    tracemalloc.stop()
+                    self._started_tracing = False
+            record["max_rss"] = max_rss()
+
+    def extend(self, records):
+        """Add the stage records of another profile -- e.g. from a worker
+        process -- nested within the current stage (if any).
+        """
+        depth = len(self._stack)
+        for record in records:
+            self.records.append({**record, "depth": record["depth"] + depth})
+
+    def to_frame(self):
+        """The stage records as a ``pandas.DataFrame``."""
+        return pandas.DataFrame(self.records, columns=RECORD_FIELDS)
+
+    def to_json(self, path=None, indent=2):
+        """Export the stage records to JSON.
+
+        Parameters
+        ----------
+
+        path : str
+            The file to write. Default is ``None``, which returns the JSON.
+
+        indent : int
+            See ``json.dumps()``. Default is ``2``.
+
+        Returns
+        -------
+
+        records : str
+            The JSON stage records, when no ``path`` is given.
+
+        """
+        records = json.dumps(self.records, indent=indent)
+        if path is None:
+            return records
+        with open(path, "w") as f:
+            f.write(records)
+
+
+def max_rss():
+    """The peak resident set size (bytes) of the process, or ``None`` where
+    it is not available.
+    """
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes, except on macOS
+    return rss if sys.platform == "darwin" else rss * 1024
@@ -6,18 +6,32 @@
 """ Testing for nhgisxwalk.
 """
 
+import contextlib
+import io
+import json
 import os
 import shutil
 import unittest
+import zipfile
 
 import numpy
+import pandas
 
 import nhgisxwalk
+from nhgisxwalk import batch
 
 CSV = "csv"
 ZIP = "zip"
 PKL = "pkl"
 
+# columnar data products require pyarrow
+try:
+    import pyarrow  # noqa: F401
+
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
 
 # use sample data for all empirical tests
 data_dir = "./testing_data_subsets/"
@@ -138,6 +152,394 @@ class Test_GeoCrossWalk(unittest.TestCase):
         numpy.testing.assert_equal(knw_str_vals, obs_str_vals)
         numpy.testing.assert_allclose(knw_num_vals, obs_num_vals, atol=6)
 
+    def test_xwalk_categorical_ids_bgp1990_tr2010(self):
+        kws = {
+            "source_year": _90,
+            "target_year": _10,
+            "source_geo": bgp,
+            "target_geo": tr,
+            "base_source_table": tab_data_path_1990,
+            "supp_source_table": supplement_data_path_90,
+            "input_var": input_vars_1990,
+            "weight_var": input_var_tags,
+        }
+        known_xwalk = nhgisxwalk.GeoCrossWalk(base_xwalk_blk1990_blk2010, **kws)
+        obs_xwalk = nhgisxwalk.GeoCrossWalk(
+            base_xwalk_blk1990_blk2010, categorical_ids=True, **kws
+        )
+        id_cols = ["bgp1990gj", "tr2010gj", "tr2010ge"]
+        for col in id_cols:
+            self.assertIsInstance(obs_xwalk.xwalk[col].dtype, pandas.CategoricalDtype)
+        pandas.testing.assert_frame_equal(
+            known_xwalk.xwalk,
+            obs_xwalk.xwalk.astype({c: object for c in id_cols}),
+            check_dtype=False,
+        )
+        known_cols = ["bgp1990gj", "GJOIN1990", "GJOIN2010", "tr2010gj"]
+        obs_memory = obs_xwalk.id_memory.loc["base"]
+        self.assertEqual(known_cols, obs_memory.index.tolist())
+        self.assertTrue((obs_memory["saved"] > 0).all())
+
+    def test_xwalk_accounting_bgp1990_bg2010(self):
+        observed_xwalk = nhgisxwalk.GeoCrossWalk(
+            base_xwalk_blk1990_blk2010,
+            source_year=_90,
+            target_year=_10,
+            source_geo=bgp,
+            target_geo=bg,
+            base_source_table=tab_data_path_1990,
+            supp_source_table=supplement_data_path_90,
+            input_var=input_vars_1990,
+            weight_var=input_var_tags,
+        )
+        trg_unacc = observed_xwalk.trg_unacc
+        observed = observed_xwalk.xwalk[
+            observed_xwalk.xwalk["bg2010gj"].isin(trg_unacc)
+        ]
+        numpy.testing.assert_array_equal(["G10000509900000"], trg_unacc)
+        # the "bg" target prefix must not fill the "bgp" source column
+        self.assertTrue(observed["bgp1990gj"].isna().all())
+        self.assertTrue((observed[observed_xwalk.weight_col] == 0.0).all(axis=None))
+        self.assertTrue(observed_xwalk.xwalk.index.is_unique)
+
+    def test_xwalk_numpy_engine_bgp1990_tr2010(self):
+        kws = {
+            "source_year": _90,
+            "target_year": _10,
+            "source_geo": bgp,
+            "target_geo": tr,
+            "base_source_table": tab_data_path_1990,
+            "supp_source_table": supplement_data_path_90,
+            "input_var": input_vars_1990,
+            "weight_var": input_var_tags,
+            "weights_precision": None,
+        }
+        known_xwalk = nhgisxwalk.GeoCrossWalk(base_xwalk_blk1990_blk2010, **kws)
+        obs_xwalk = nhgisxwalk.GeoCrossWalk(
+            base_xwalk_blk1990_blk2010, engine="numpy", **kws
+        )
+        pandas.testing.assert_frame_equal(
+            known_xwalk.xwalk, obs_xwalk.xwalk, check_exact=True
+        )
+
+    def test_xwalk_cache_bgp1990_tr2010(self):
+        kws = {
+            "source_year": _90,
+            "target_year": _10,
+            "source_geo": bgp,
+            "target_geo": tr,
+            "base_source_table": tab_data_path_1990,
+            "supp_source_table": supplement_data_path_90,
+            "input_var": input_vars_1990,
+            "weight_var": input_var_tags,
+        }
+        cache_dir = data_dir + "xwalk_cache"
+        cache = nhgisxwalk.CrossWalkCache(cache_dir)
+        known_xwalk = nhgisxwalk.GeoCrossWalk(base_xwalk_blk1990_blk2010, **kws)
+
+        # built, then restored
+        obs_built = nhgisxwalk.GeoCrossWalk(
+            base_xwalk_blk1990_blk2010, cache=cache, **kws
+        )
+        obs_cached = nhgisxwalk.GeoCrossWalk(
+            base_xwalk_blk1990_blk2010, cache=cache, **kws
+        )
+        self.assertEqual((1, 1), (cache.hits, cache.misses))
+        self.assertEqual(obs_built.cache_key, obs_cached.cache_key)
+        self.assertFalse(hasattr(obs_cached, "base_tab_df"))
+        for obs_xwalk in [obs_built, obs_cached]:
+            pandas.testing.assert_frame_equal(known_xwalk.xwalk, obs_xwalk.xwalk)
+            numpy.testing.assert_array_equal(known_xwalk.trg_unacc, obs_xwalk.trg_unacc)
+            self.assertEqual(known_xwalk.weight_col, obs_xwalk.weight_col)
+
+        # the result depends on the precision of weights
+        obs_rounded = nhgisxwalk.GeoCrossWalk(
+            base_xwalk_blk1990_blk2010, cache=cache, weights_precision=2, **kws
+        )
+        self.assertNotEqual(obs_built.cache_key, obs_rounded.cache_key)
+        self.assertEqual(2, cache.misses)
+
+        # and on the aggregation engine
+        obs_numpy = nhgisxwalk.GeoCrossWalk(
+            base_xwalk_blk1990_blk2010, cache=cache, engine="numpy", **kws
+        )
+        self.assertNotEqual(obs_built.cache_key, obs_numpy.cache_key)
+        self.assertEqual(3, cache.misses)
+        self.assertEqual(3, cache.invalidate())
+        shutil.rmtree(cache_dir)
+
+    def test_xwalk_workers_bgp1990_tr2010(self):
+        kws = {
+            "source_year": _90,
+            "target_year": _10,
+            "source_geo": bgp,
+            "target_geo": tr,
+            "base_source_table": tab_data_path_1990,
+            "supp_source_table": supplement_data_path_90,
+            "input_var": input_vars_1990,
+            "weight_var": input_var_tags,
+            "drop_supp_col": False,
+        }
+        known_xwalk = nhgisxwalk.GeoCrossWalk(base_xwalk_blk1990_blk2010, **kws)
+        # state 34 holds sources (and target candidates) too
+        obs_xwalk = nhgisxwalk.GeoCrossWalk(
+            base_xwalk_blk1990_blk2010, workers=2, **kws
+        )
+        pandas.testing.assert_frame_equal(known_xwalk.xwalk, obs_xwalk.xwalk)
+        numpy.testing.assert_array_equal(known_xwalk.src_unacc, obs_xwalk.src_unacc)
+        numpy.testing.assert_array_equal(known_xwalk.trg_unacc, obs_xwalk.trg_unacc)
+        self.assertEqual(known_xwalk.weight_col, obs_xwalk.weight_col)
+
+        with self.assertRaises(ValueError):
+            nhgisxwalk.GeoCrossWalk(
+                base_xwalk_blk1990_blk2010, workers=2, keep_base=True, **kws
+            )
+
+    def test_multi_target_xwalks_bgp1990(self):
+        kws = {
+            "source_year": _90,
+            "target_year": _10,
+            "source_geo": bgp,
+            "base_source_table": tab_data_path_1990,
+            "supp_source_table": supplement_data_path_90,
+            "input_var": input_vars_1990,
+            "weight_var": input_var_tags,
+        }
+        obs_xwalks = nhgisxwalk.multi_target_xwalks(
+            base_xwalk_blk1990_blk2010, [bg, tr, co], **kws
+        )
+        self.assertEqual([bg, tr, co], list(obs_xwalks))
+        for target_geo, obs_xwalk in obs_xwalks.items():
+            known_xwalk = nhgisxwalk.GeoCrossWalk(
+                base_xwalk_blk1990_blk2010, target_geo=target_geo, **kws
+            )
+            pandas.testing.assert_frame_equal(known_xwalk.xwalk, obs_xwalk.xwalk)
+            numpy.testing.assert_array_equal(known_xwalk.src_unacc, obs_xwalk.src_unacc)
+            numpy.testing.assert_array_equal(known_xwalk.trg_unacc, obs_xwalk.trg_unacc)
+
+        # a source pass is not reused for another source
+        source_pass = {}
+        nhgisxwalk.GeoCrossWalk(
+            base_xwalk_blk1990_blk2010, target_geo=tr, source_pass=source_pass, **kws
+        )
+        self.assertIn("nopop_base", source_pass)
+        with self.assertRaises(ValueError):
+            nhgisxwalk.GeoCrossWalk(
+                base_xwalk_blk1990_blk2010.copy(),
+                target_geo=co,
+                source_pass=source_pass,
+                **kws,
+            )
+
+    def test_rollup_bgp1990_bg2010(self):
+        kws = {
+            "source_year": _90,
+            "target_year": _10,
+            "source_geo": bgp,
+            "base_source_table": tab_data_path_1990,
+            "supp_source_table": supplement_data_path_90,
+            "input_var": input_vars_1990,
+            "weight_var": input_var_tags,
+        }
+        obs_xwalks = nhgisxwalk.multi_target_xwalks(
+            base_xwalk_blk1990_blk2010, [bg, tr, co], rollup=True, **kws
+        )
+        for target_geo, obs_xwalk in obs_xwalks.items():
+            known_xwalk = nhgisxwalk.GeoCrossWalk(
+                base_xwalk_blk1990_blk2010, target_geo=target_geo, **kws
+            )
+            self.assertEqual(known_xwalk.xwalk_name, obs_xwalk.xwalk_name)
+            pandas.testing.assert_frame_equal(known_xwalk.xwalk, obs_xwalk.xwalk)
+            numpy.testing.assert_array_equal(known_xwalk.trg_unacc, obs_xwalk.trg_unacc)
+
+        # unrounded rollups agree up to floating point summation order
+        kws["weights_precision"] = None
+        bg_xwalk = nhgisxwalk.GeoCrossWalk(
+            base_xwalk_blk1990_blk2010, target_geo=bg, categorical_ids=True, **kws
+        )
+        known_xwalk = nhgisxwalk.GeoCrossWalk(
+            base_xwalk_blk1990_blk2010, target_geo=co, categorical_ids=True, **kws
+        )
+        obs_xwalk = bg_xwalk.rollup(co)
+        self.assertEqual(known_xwalk.target, obs_xwalk.target)
+        pandas.testing.assert_frame_equal(
+            known_xwalk.xwalk, obs_xwalk.xwalk, check_exact=False, rtol=1e-12
+        )
+
+        # block groups do not nest in block groups, and tracts not in tracts
+        with self.assertRaises(ValueError):
+            bg_xwalk.rollup(bg)
+        with self.assertRaises(ValueError):
+            nhgisxwalk.rollup_xwalk(obs_xwalk.xwalk, obs_xwalk.source, "tr2010gj", tr)
+
+    def test_reverse_bgp1990_tr2010(self):
+        kws = {
+            "source_year": _90,
+            "target_year": _10,
+            "source_geo": bgp,
+            "target_geo": tr,
+            "base_source_table": tab_data_path_1990,
+            "supp_source_table": supplement_data_path_90,
+            "input_var": input_vars_1990,
+            "weight_var": input_var_tags,
+            "weights_precision": None,
+        }
+        known_xwalk = nhgisxwalk.GeoCrossWalk(base_xwalk_blk1990_blk2010, **kws)
+        obs_xwalk = nhgisxwalk.GeoCrossWalk(
+            base_xwalk_blk1990_blk2010, keep_numerators=True, **kws
+        )
+        # the numerators are kept alongside the unchanged weights
+        known_cols = ["num_pop", "num_fam", "num_hh", "num_hu"]
+        self.assertEqual(known_cols, obs_xwalk.numerator_col)
+        pandas.testing.assert_frame_equal(
+            known_xwalk.xwalk, obs_xwalk.xwalk[known_xwalk.xwalk.columns]
+        )
+
+        rev_xwalk = obs_xwalk.reverse()
+        self.assertEqual("nhgis_tr2010_bgp1990", rev_xwalk.xwalk_name)
+        self.assertEqual(
+            ["tr2010gj", "tr2010ge", "bgp1990gj"], rev_xwalk.xwalk.columns[:3].tolist()
+        )
+        numpy.testing.assert_array_equal(obs_xwalk.src_unacc, rev_xwalk.trg_unacc)
+        # the reverse weights of each (populated) target sum to 1
+        grouped = rev_xwalk.xwalk.groupby(rev_xwalk.source)
+        obs_sums = grouped[rev_xwalk.weight_col].sum().to_numpy()
+        populated = grouped[rev_xwalk.numerator_col].sum().to_numpy() > 0
+        numpy.testing.assert_allclose(obs_sums[populated], 1.0)
+        numpy.testing.assert_array_equal(obs_sums[~populated], 0.0)
+        # and reversing again gives the original weights
+        pandas.testing.assert_frame_equal(
+            obs_xwalk.xwalk, rev_xwalk.reverse().xwalk, check_exact=False, rtol=1e-12
+        )
+
+        with self.assertRaises(ValueError):
+            known_xwalk.reverse()
+
+    def test_lazy_bgp1990_tr2010(self):
+        kws = {
+            "source_year": _90,
+            "target_year": _10,
+            "source_geo": bgp,
+            "target_geo": tr,
+            "base_source_table": tab_data_path_1990,
+            "supp_source_table": supplement_data_path_90,
+            "input_var": input_vars_1990,
+            "weight_var": input_var_tags,
+        }
+        known_xwalk = nhgisxwalk.GeoCrossWalk(base_xwalk_blk1990_blk2010, **kws)
+        obs_xwalk = nhgisxwalk.GeoCrossWalk(
+            base_xwalk_blk1990_blk2010, lazy=True, **kws
+        )
+        self.assertFalse(hasattr(obs_xwalk, "id_keys"))
+        # the atoms are evaluated without accounting
+        known_ids = known_xwalk.xwalk[known_xwalk.target].unique()
+        obs_ids = obs_xwalk.target_ids.unique()
+        self.assertEqual(set(known_ids), set(obs_ids))
+        self.assertEqual(1062, obs_xwalk.atoms.shape[0])
+        self.assertEqual(["accounted", "xwalk"], obs_xwalk._pending)
+        for stage in ["joined_base", "source_ids", "target_ids", "base"]:
+            self.assertFalse(hasattr(obs_xwalk, stage))
+        # the stages are dropped once consumed
+        pandas.testing.assert_frame_equal(known_xwalk.xwalk, obs_xwalk.xwalk)
+        self.assertFalse(hasattr(obs_xwalk, "atoms"))
+        self.assertFalse(hasattr(obs_xwalk, "accounted"))
+
+        with self.assertRaises(ValueError):
+            obs_xwalk.evaluate("unknown")
+        with self.assertRaises(ValueError):
+            nhgisxwalk.GeoCrossWalk(
+                base_xwalk_blk1990_blk2010, lazy=True, workers=2, **kws
+            )
+
+    def test_profile_bgp1990_tr2010(self):
+        kws = {
+            "source_year": _90,
+            "target_year": _10,
+            "source_geo": bgp,
+            "target_geo": tr,
+            "base_source_table": tab_data_path_1990,
+            "supp_source_table": supplement_data_path_90,
+            "input_var": input_vars_1990,
+            "weight_var": input_var_tags,
+        }
+        known_xwalk = nhgisxwalk.GeoCrossWalk(base_xwalk_blk1990_blk2010, **kws)
+        self.assertIsNone(known_xwalk.profile)
+        obs_xwalk = nhgisxwalk.GeoCrossWalk(
+            base_xwalk_blk1990_blk2010, profile=True, **kws
+        )
+        pandas.testing.assert_frame_equal(known_xwalk.xwalk, obs_xwalk.xwalk)
+
+        known_stages = nhgisxwalk.STAGES[:4] + ["calculate_atoms"]
+        known_stages += ["handle_1990_no_data", "no_data_ids", "no_data_atoms"]
+        known_stages += ["supp_source_ids", "expand_no_data", "append_no_data"]
+        known_stages += nhgisxwalk.STAGES[4:]
+        obs_profile = obs_xwalk.profile.to_frame()
+        self.assertEqual(known_stages, obs_profile["stage"].tolist())
+        known_depths = [0, 0, 0, 0, 1, 1, 2, 2, 2, 2, 2, 0, 0]
+        self.assertEqual(known_depths, obs_profile["depth"].tolist())
+        known_rows = [38297, 38297, 38297, 1062, 834, 1062]
+        known_rows += [9572, 520, 777, 997, 1062, 1063, 1063]
+        self.assertEqual(known_rows, obs_profile["rows_out"].tolist())
+        self.assertTrue((obs_profile["wall_time"] > 0).all())
+        # memory is only traced on request
+        self.assertTrue(obs_profile["peak_memory"].isna().all())
+        profile = nhgisxwalk.StageProfile(trace_memory=True)
+        nhgisxwalk.GeoCrossWalk(base_xwalk_blk1990_blk2010, profile=profile, **kws)
+        self.assertTrue((profile.to_frame()["peak_memory"] > 0).all())
+
+        # exported to JSON
+        obs_records = json.loads(obs_xwalk.profile.to_json())
+        self.assertEqual(nhgisxwalk.profiling.RECORD_FIELDS, list(obs_records[0]))
+
+    def test_compose_xwalks_bgp1990_tr2010(self):
+        kws = {
+            "source_year": _90,
+            "target_year": _10,
+            "source_geo": bgp,
+            "base_source_table": tab_data_path_1990,
+            "supp_source_table": supplement_data_path_90,
+            "input_var": input_vars_1990,
+            "weight_var": input_var_tags,
+            "weights_precision": None,
+            "add_geoid": False,
+        }
+        xwalks = nhgisxwalk.multi_target_xwalks(
+            base_xwalk_blk1990_blk2010, [bg, tr], **kws
+        )
+        bg_xwalk, known_xwalk = xwalks[bg].xwalk, xwalks[tr].xwalk
+        # the block groups of each tract
+        bg_tr = pandas.DataFrame({"bg2010gj": bg_xwalk["bg2010gj"].dropna().unique()})
+        bg_tr["tr2010gj"] = bg_tr["bg2010gj"].str[:14]
+        bg_tr["wt"] = 1.0
+        obs_xwalk = nhgisxwalk.compose_xwalks(
+            bg_xwalk, bg_tr, "bgp1990gj", "bg2010gj", "tr2010gj"
+        )
+        pandas.testing.assert_frame_equal(
+            known_xwalk[obs_xwalk.columns], obs_xwalk, check_exact=False, rtol=1e-12
+        )
+
+        # the weights of each block are kept when composed with its block group
+        base = base_xwalk_blk1990_blk2010
+        blk_bg = pandas.DataFrame({"GJOIN2010": base["GJOIN2010"].unique()})
+        blk_bg["bg2010gj"] = blk_bg["GJOIN2010"].str[:15]
+        blk_bg["wt"] = 1.0
+        obs_xwalk = nhgisxwalk.compose_xwalks(
+            base, blk_bg, "GJOIN1990", "GJOIN2010", "bg2010gj"
+        )
+        self.assertEqual(
+            ["GJOIN1990", "bg2010gj", "WEIGHT", "PAREA_VIA_BLK00"],
+            list(obs_xwalk.columns),
+        )
+        known_sums = base.groupby("GJOIN1990")["WEIGHT"].sum()
+        obs_sums = obs_xwalk.groupby("GJOIN1990")["WEIGHT"].sum()
+        numpy.testing.assert_allclose(known_sums, obs_sums)
+        self.assertEqual(0, obs_xwalk["bg2010gj"].isna().sum())
+
+        with self.assertRaises(ValueError):
+            nhgisxwalk.compose_xwalks(
+                base, bg_xwalk, "GJOIN1990", "GJOIN2010", "bg2010gj"
+            )
+
     def test_xwalk_state_bgp1990_tr2010(
         self,
     ):
@@ -254,6 +656,37 @@ class Test_GeoCrossWalk(unittest.TestCase):
         ).values
         self.assertEqual(known_source_nan_base_shape, obs_source_nan_base.shape)
 
+    def test_xwalk_state_partitions_bgp1990_tr2010(self):
+        known_stfips = ["10", "34", "nan"]
+        obs_xwalk = nhgisxwalk.GeoCrossWalk(
+            base_xwalk_blk1990_blk2010,
+            source_year=_90,
+            target_year=_10,
+            source_geo=bgp,
+            target_geo=tr,
+            base_source_table=tab_data_path_1990,
+            supp_source_table=supplement_data_path_90,
+            input_var=input_vars_1990,
+            weight_var=input_var_tags,
+        )
+        obs_partitions = list(
+            nhgisxwalk.state_partitions(obs_xwalk.xwalk, obs_xwalk.source)
+        )
+        self.assertEqual(known_stfips, [st for st, _ in obs_partitions])
+        self.assertEqual(
+            obs_xwalk.xwalk.shape[0], sum(df.shape[0] for _, df in obs_partitions)
+        )
+        for stfips, obs_partition in obs_partitions:
+            known_partition = nhgisxwalk.extract_state(
+                obs_xwalk.xwalk, stfips, obs_xwalk.xwalk_name, obs_xwalk.source
+            )
+            pandas.testing.assert_frame_equal(known_partition, obs_partition)
+
+    def test_state_partitions_empty(self):
+        empty_xwalk = pandas.DataFrame({"bgp1990gj": pandas.Series([], dtype=str)})
+        obs_partitions = list(nhgisxwalk.state_partitions(empty_xwalk, "bgp1990gj"))
+        self.assertEqual([], obs_partitions)
+
     def test_xwalk_extract_state_failure_bgp1990_tr2010(self):
         obs_xwalk = nhgisxwalk.GeoCrossWalk(
             base_xwalk_blk1990_blk2010,
@@ -648,6 +1081,103 @@ class Test_GeoCrossWalk(unittest.TestCase):
         observed_values = read_xwalk["wt_pop"].values
         numpy.testing.assert_allclose(known_values, observed_values)
 
+    def test_xwalk_read_csv_categorical_ids(self):
+        known_xwalk = fetch_base_xwalk(blk, blk, _90, _10)
+        base_xwalk_name = base_xwalk_name_fmat % (blk, _90, blk, _10, gj)
+        obs_xwalk = nhgisxwalk.xwalk_df_from_csv(
+            base_xwalk_name,
+            path=data_dir,
+            archived=True,
+            remove_unpacked=True,
+            categorical_ids=True,
+            dtype={"WEIGHT": float},
+        )
+        for col in ["GJOIN1990", "GJOIN2010"]:
+            self.assertIsInstance(obs_xwalk[col].dtype, pandas.CategoricalDtype)
+        self.assertEqual(obs_xwalk["WEIGHT"].dtype, float)
+        pandas.testing.assert_series_equal(
+            known_xwalk["GJOIN1990"].astype(object),
+            obs_xwalk["GJOIN1990"].astype(object),
+        )
+        obs_memory = nhgisxwalk.id_memory_usage(obs_xwalk)
+        self.assertTrue((obs_memory["object"] > obs_memory["current"]).all())
+
+    def test_xwalk_read_csv_archived_chunks(self):
+        known_xwalk = fetch_base_xwalk(blk, blk, _90, _10)
+        base_xwalk_name = base_xwalk_name_fmat % (blk, _90, blk, _10, gj)
+        chunks = nhgisxwalk.xwalk_df_from_csv(
+            base_xwalk_name,
+            path=data_dir,
+            archived=True,
+            chunksize=10_000,
+            dtype=nhgisxwalk.str_types(["GJOIN1990", "GJOIN2010"]),
+        )
+        chunks = list(chunks)
+        self.assertEqual(4, len(chunks))
+        # the archive is streamed -- nothing is unpacked
+        self.assertFalse(os.path.exists(data_dir + base_xwalk_name))
+        pandas.testing.assert_frame_equal(known_xwalk, pandas.concat(chunks))
+
+    @unittest.skipIf(not HAS_PYARROW, "pyarrow is not installed")
+    def test_xwalk_read_csv_archived_pyarrow(self):
+        known_xwalk = fetch_base_xwalk(blk, blk, _90, _10)
+        base_xwalk_name = base_xwalk_name_fmat % (blk, _90, blk, _10, gj)
+        obs_xwalk = nhgisxwalk.xwalk_df_from_csv(
+            base_xwalk_name,
+            path=data_dir,
+            archived=True,
+            engine="pyarrow",
+            dtype=nhgisxwalk.str_types(["GJOIN1990", "GJOIN2010"]),
+        )
+        pandas.testing.assert_frame_equal(known_xwalk, obs_xwalk, check_dtype=False)
+
+    @unittest.skipIf(not HAS_PYARROW, "pyarrow is not installed")
+    def test_xwalk_read_csv_geoid_pyarrow(self):
+        xwalk_name = "nhgis_geoid_pyarrow"
+        known_xwalk = pandas.DataFrame(
+            {
+                "GEOID90": ["00001040100101", "10001040100102", numpy.nan],
+                "GEOID10": ["010010401001000", numpy.nan, "100010401001001"],
+                "WEIGHT": [1.0, 0.5, 0.25],
+            }
+        )
+        nhgisxwalk.xwalk_df_to_csv(dfkwds={"df": known_xwalk, "xwalk_name": xwalk_name})
+        dtype = nhgisxwalk.str_types(["GEOID90", "GEOID10"])
+        c_xwalk = nhgisxwalk.xwalk_df_from_csv(xwalk_name, dtype=dtype)
+        obs_xwalk = nhgisxwalk.xwalk_df_from_csv(
+            xwalk_name, engine="pyarrow", dtype=dtype
+        )
+        os.remove(xwalk_name + ".%s" % CSV)
+        self.assertEqual("00001040100101", obs_xwalk["GEOID90"][0])
+        self.assertEqual(2, obs_xwalk[["GEOID90", "GEOID10"]].isna().sum().sum())
+        pandas.testing.assert_frame_equal(c_xwalk, obs_xwalk, check_dtype=False)
+
+    def test_tabular_df_from_csv(self):
+        id_cols = ["GISJOIN"] + nhgisxwalk.id_codes.code_cols(bgp, _90)
+        known_columns = id_cols + input_vars_1990
+        known_values = ["G10000100401101", "10", "001", "91480", "99999", "0401"]
+        obs_tab = nhgisxwalk.tabular_df_from_csv(
+            tab_data_path_1990, id_cols, num_cols=input_vars_1990
+        )
+        self.assertEqual(known_columns, list(obs_tab.columns))
+        self.assertEqual(known_values, obs_tab.iloc[0, :6].tolist())
+        self.assertTrue((obs_tab[input_vars_1990].dtypes == float).all())
+
+    @unittest.skipIf(not HAS_PYARROW, "pyarrow is not installed")
+    def test_tabular_df_from_csv_pyarrow(self):
+        id_cols = ["GISJOIN"] + nhgisxwalk.id_codes.code_cols(bgp, _90)
+        known_tab = nhgisxwalk.tabular_df_from_csv(
+            tab_data_path_1990, id_cols, num_cols=input_vars_1990
+        )
+        obs_tab = nhgisxwalk.tabular_df_from_csv(
+            tab_data_path_1990, id_cols, num_cols=input_vars_1990, engine="pyarrow"
+        )
+        pandas.testing.assert_frame_equal(known_tab, obs_tab)
+
+    def test_tabular_df_from_csv_bad_engine(self):
+        with self.assertRaises(ValueError):
+            nhgisxwalk.tabular_df_from_csv(tab_data_path_1990, ["GISJOIN"], engine="x")
+
     def test_xwalk_write_read_csv_from_df(self):
         write_xwalk = nhgisxwalk.GeoCrossWalk(
             base_xwalk_blk2000_blk2010,
@@ -808,6 +1338,57 @@ class Test_upper_level_functions(unittest.TestCase):
         observed = read_xwalk["wt"].values
         numpy.testing.assert_array_equal(known, observed)
 
+    @unittest.skipIf(not HAS_PYARROW, "pyarrow is not installed")
+    def test_prepare_data_product_columnar(self):
+        xwalk_name = prod_xwalk_name_fmat % (bgp, _90, co, _10)
+        path_out = data_dir + xwalk_name
+        formats = nhgisxwalk.FORMATS
+        nhgisxwalk.prepare_data_product(
+            self.example_df, xwalk_name, path_out, remove=True, formats=formats
+        )
+        with zipfile.ZipFile(path_out + ".%s" % ZIP) as archive:
+            observed = sorted(archive.namelist())
+        known = ["%s.%s" % (xwalk_name, fmt) for fmt in sorted(formats)]
+        known.append("nhgis_bgp_crosswalk_README.txt")
+        self.assertEqual(known, observed)
+
+        # read in the crosswalk -- only the target IDs and weights
+        from_kws = {"path": data_dir, "archived": True, "remove_unpacked": True}
+        columns = ["tr2010", "wt"]
+        for fmt in [nhgisxwalk.PARQUET, nhgisxwalk.FEATHER]:
+            read_xwalk = nhgisxwalk.xwalk_df_from_columnar(
+                xwalk_name, fmt=fmt, columns=columns, **from_kws
+            )
+            self.assertEqual(columns, read_xwalk.columns.tolist())
+            numpy.testing.assert_array_equal(
+                [1.0, 0.3, 0.7, 1.0, 1.0], read_xwalk["wt"].values
+            )
+
+    def test_prepare_data_product_compression(self):
+        xwalk_name = prod_xwalk_name_fmat % (bgp, _90, co, _10)
+        path_out = data_dir + xwalk_name
+        nhgisxwalk.prepare_data_product(
+            self.example_df,
+            xwalk_name,
+            path_out,
+            remove=False,
+            compression=zipfile.ZIP_STORED,
+        )
+        with zipfile.ZipFile(path_out + ".%s" % ZIP) as archive:
+            compression = {info.compress_type for info in archive.infolist()}
+        self.assertEqual({zipfile.ZIP_STORED}, compression)
+
+        # the uncompressed directory is kept
+        observed = pandas.read_csv(path_out + "/%s.%s" % (xwalk_name, CSV))
+        shutil.rmtree(path_out)
+        pandas.testing.assert_frame_equal(self.example_df, observed)
+
+    def test_prepare_data_product_bad_format(self):
+        with self.assertRaises(ValueError):
+            nhgisxwalk.prepare_data_product(
+                self.example_df, "nhgis_bgp1990_co2010", data_dir, formats="xlsx"
+            )
+
     def test_generate_data_product(self):
         # records known data values
         knw_str_vals = numpy.array(
@@ -929,6 +1510,42 @@ class Test_upper_level_functions(unittest.TestCase):
         observed_ids = read_xwalk["GJOIN2010"].head().values
         numpy.testing.assert_array_equal(known_ids, observed_ids)
 
+    def test_regenerate_blk_blk_xwalk_translate(self):
+        xwalk_name = base_xwalk_name_fmat % (blk, _00, blk, _10, gj)
+        path_in = data_dir + xwalk_name + ".%s" % ZIP
+        path_out = data_dir + "translated/"
+        dtype = nhgisxwalk.str_types(nhgisxwalk.ID_COLS)
+        nhgisxwalk.regenerate_blk_blk_xwalk(
+            path_in, path_out, "GJOIN2010", dtype, translate=True
+        )
+
+        # read in the translated crosswalk
+        ge_name = base_xwalk_name_fmat % (blk, _00, blk, _10, "ge")
+        from_csv_kws = {"path": path_out, "archived": True, "remove_unpacked": True}
+        read_csv_kws = {"dtype": dtype}
+        read_xwalk = nhgisxwalk.xwalk_df_from_csv(
+            ge_name, **from_csv_kws, **read_csv_kws
+        )
+        shutil.rmtree(path_out)
+
+        self.assertEqual(["GEOID00", "GEOID10"], list(read_xwalk.columns[:2]))
+        self.assertEqual("100010401001000", read_xwalk["GEOID10"][0])
+        # translating back recovers the original crosswalk
+        observed = nhgisxwalk.translate_blk_blk_xwalk(read_xwalk, gj)
+        known = base_xwalk_blk2000_blk2010.sort_values(["GJOIN2000", "GJOIN2010"])
+        numpy.testing.assert_array_equal(
+            known[["GJOIN2000", "GJOIN2010"]].values,
+            observed[["GJOIN2000", "GJOIN2010"]].values,
+        )
+
+    def test_translate_blk_blk_xwalk_1990(self):
+        ge = nhgisxwalk.translate_blk_blk_xwalk(base_xwalk_blk1990_blk2010, "ge")
+        self.assertEqual("10001040100101", ge["GEOID90"][0])
+        gj_ = nhgisxwalk.translate_blk_blk_xwalk(ge, gj)
+        pandas.testing.assert_frame_equal(
+            base_xwalk_blk1990_blk2010, gj_, check_dtype=False
+        )
+
     def test_split_xwalk(self):
         known_ids = numpy.array(
             [
@@ -968,6 +1585,110 @@ class Test_upper_level_functions(unittest.TestCase):
         observed_ids = read_xwalk["GJOIN2010"].head().values
         numpy.testing.assert_array_equal(known_ids, observed_ids)
 
+    def test_split_xwalk_workers(self):
+        xwalk_name = base_xwalk_name_fmat % (blk, _90, blk, _10, gj)
+        sorter = nhgisxwalk.SORT_BYS[xwalk_name]
+        # move every other record to a second state
+        xwalk = base_xwalk_blk1990_blk2010.copy()
+        xwalk.loc[::2, "GJOIN2010"] = "G34" + xwalk.loc[::2, "GJOIN2010"].str[3:]
+        observed = {}
+        for workers in [1, 2]:
+            xwalk_path = data_dir + xwalk_name + "_workers%s" % workers
+            written = nhgisxwalk.split_xwalk(
+                xwalk,
+                "GJOIN2010",
+                xwalk_name,
+                gj,
+                fpath=xwalk_path,
+                sort_by=sorter,
+                workers=workers,
+            )
+            archives = {}
+            for archive in written:
+                with open(archive, "rb") as product:
+                    archives[os.path.basename(archive)] = product.read()
+            observed[workers] = archives
+            shutil.rmtree(xwalk_path)
+
+        # same archives, byte for byte
+        known = [xwalk_name + "_10.%s" % ZIP, xwalk_name + "_34.%s" % ZIP]
+        self.assertEqual(known, list(observed[1]))
+        self.assertEqual(observed[1], observed[2])
+
+    def test_split_xwalk_profile(self):
+        xwalk_name = base_xwalk_name_fmat % (blk, _90, blk, _10, gj)
+        xwalk_path = data_dir + xwalk_name + "_profile"
+        profile = nhgisxwalk.StageProfile()
+        nhgisxwalk.split_xwalk(
+            base_xwalk_blk1990_blk2010,
+            "GJOIN2010",
+            xwalk_name,
+            gj,
+            fpath=xwalk_path,
+            profile=profile,
+        )
+        shutil.rmtree(xwalk_path)
+
+        obs_profile = profile.to_frame()
+        self.assertEqual(["split_xwalk", "write"], obs_profile["stage"].tolist())
+        self.assertEqual(xwalk_name + "_10", obs_profile["name"][1])
+        self.assertEqual([0, 1], obs_profile["depth"].tolist())
+        # the rows written to the state crosswalks
+        known_rows = base_xwalk_blk1990_blk2010["GJOIN2010"].notna().sum()
+        self.assertEqual(known_rows, obs_profile["rows_out"][0])
+        self.assertTrue(obs_profile["peak_memory"].isna().all())
+
+    def test_split_xwalk_bad_workers(self):
+        xwalk_name = base_xwalk_name_fmat % (blk, _90, blk, _10, gj)
+        with self.assertRaises(ValueError):
+            nhgisxwalk.split_xwalk(
+                base_xwalk_blk1990_blk2010, "GJOIN2010", xwalk_name, gj, workers=0
+            )
+
+    def test_crosswalk_cache_eviction(self):
+        cache_dir = data_dir + "xwalk_cache"
+        cache = nhgisxwalk.CrossWalkCache(cache_dir)
+        keys = []
+        for precision in range(3):
+            params = {"weights_precision": precision}
+            keys.append(cache.key(self.example_df, params=params))
+            cache.put(keys[-1], {"xwalk": self.example_df.round(precision)})
+        self.assertEqual(3, len(set(keys)))
+
+        # least recently used first -- the first entry is then read again
+        entries = cache.entries()
+        for used, entry in enumerate(entries["entry"]):
+            os.utime(entry, ns=(used, used))
+        self.assertIsNotNone(cache.get(keys[0]))
+
+        # fit two entries -- the (now) least recently used is evicted
+        cache.max_bytes = int(entries["bytes"].max() * 2)
+        cache._evict()
+        self.assertEqual(sorted([keys[0], keys[2]]), sorted(cache.entries()["key"]))
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertLessEqual(cache.size, cache.max_bytes)
+
+        # explicit invalidation
+        self.assertEqual(1, cache.invalidate(keys[0]))
+        self.assertEqual(0, cache.invalidate(keys[0]))
+        self.assertEqual(1, cache.invalidate())
+        shutil.rmtree(cache_dir)
+
+    def test_crosswalk_cache_key(self):
+        cache = nhgisxwalk.CrossWalkCache(data_dir + "xwalk_cache")
+        known_key = cache.key(self.example_df, tables=[tab_data_path_1990])
+        obs_key = cache.key(self.example_df.copy(), tables=[tab_data_path_1990])
+        self.assertEqual(known_key, obs_key)
+        modified = self.example_df.copy()
+        modified.loc[0, "wt"] += 1
+        for obs_key in [
+            cache.key(modified, tables=[tab_data_path_1990]),
+            cache.key(self.example_df, tables=[tab_data_path_2000]),
+            cache.key(self.example_df, tables=[tab_data_path_1990], params={}),
+        ]:
+            self.assertNotEqual(known_key, obs_key)
+        shutil.rmtree(data_dir + "xwalk_cache")
+
     def test_example_crosswalk_data(self):
         known_type = "dataframe"
         observed_type = self.example_df._typ
@@ -1063,6 +1784,77 @@ class Test_upper_level_functions(unittest.TestCase):
         k2, o2 = known[:, 2:].astype(float), observed.values[:, 2:].astype(float)
         numpy.testing.assert_allclose(k2, o2, atol=4)
 
+    def test_calculate_atoms_zero_denominator(self):
+        df = self.example_df.copy()
+        df.loc[df["bgp1990"] == "B", "pop_1990"] = 0.0
+        observed = nhgisxwalk.calculate_atoms(
+            df,
+            weight="wt",
+            input_var=["pop_1990", "hh_1990"],
+            weight_var=["pop", "hh"],
+            source_id="bgp1990",
+            groupby_cols=["bgp1990", "tr2010"],
+        )
+        numpy.testing.assert_array_equal([0.0, 0.0], observed["pop"].values[2:])
+        numpy.testing.assert_allclose(
+            [1.0, 1.0], observed.groupby("bgp1990")["hh"].sum()
+        )
+
+    def test_calculate_atoms_id_keys(self):
+        kws = {
+            "weight": "wt",
+            "input_var": ["pop_1990", "hh_1990"],
+            "weight_var": ["pop", "hh"],
+            "source_id": "bgp1990",
+            "groupby_cols": ["bgp1990", "tr2010"],
+        }
+        known = nhgisxwalk.calculate_atoms(self.example_df.copy(), **kws)
+        id_keys = {}
+        for col in kws["groupby_cols"]:
+            codec, (keys,) = nhgisxwalk.id_keys.pack_ids(self.example_df[col])
+            id_keys[col] = codec, keys
+        observed = nhgisxwalk.calculate_atoms(
+            self.example_df.copy(), id_keys=id_keys, **kws
+        )
+        pandas.testing.assert_frame_equal(known, observed, check_dtype=False)
+
+    def test_calculate_atoms_numpy_engine(self):
+        kws = {
+            "weight": "wt",
+            "input_var": ["pop_1990", "hh_1990"],
+            "weight_var": ["pop", "hh"],
+            "source_id": "bgp1990",
+            "groupby_cols": ["bgp1990", "tr2010"],
+        }
+        df = self.example_df.copy()
+        df.loc[df["bgp1990"] == "B", "pop_1990"] = 0.0
+        known = nhgisxwalk.calculate_atoms(df.copy(), **kws)
+        observed = nhgisxwalk.calculate_atoms(df.copy(), engine="numpy", **kws)
+        pandas.testing.assert_frame_equal(known, observed, check_exact=True)
+
+    def test_calculate_atoms_bad_engine(self):
+        with self.assertRaises(ValueError):
+            nhgisxwalk.calculate_atoms(
+                self.example_df.copy(),
+                weight="wt",
+                input_var=["pop_1990"],
+                weight_var=["pop"],
+                source_id="bgp1990",
+                groupby_cols=["bgp1990", "tr2010"],
+                engine="polars",
+            )
+
+    def test_lookup_ids(self):
+        index_ids = pandas.Series(["A", "B", "A"])
+        values = pandas.Series(["x", "y", "z"])
+        known = numpy.array(["y", numpy.nan, "z"], dtype=object)
+        observed = nhgisxwalk.geocrosswalk._lookup_ids(
+            pandas.Series(["B", "C", "A"]), index_ids, values
+        )
+        pandas.testing.assert_series_equal(
+            pandas.Series(known), pandas.Series(observed), check_dtype=False
+        )
+
     def test_round_weights(self):
         known = numpy.array(
             [
@@ -1120,6 +1912,73 @@ class Test_upper_level_functions(unittest.TestCase):
         self.assertEqual(known_ns, observed_ns)
 
 
+class Test_batch_functions(unittest.TestCase):
+    def test_plan_jobs_standard_manifest(self):
+        manifest = batch.standard_manifest("in/", "tab/", "out/", memory="2G")
+        jobs = batch.plan_jobs(manifest)
+        # one job per bgp source -- sharing the source pass -- and blk product
+        known_kinds = [bgp, bgp, blk, blk, blk, blk]
+        self.assertEqual(known_kinds, [job["kind"] for job in jobs])
+        self.assertEqual(
+            ["nhgis_bgp1990_bg2010", "nhgis_bgp1990_tr2010", "nhgis_bgp1990_co2010"],
+            list(jobs[0]["products"]),
+        )
+        self.assertEqual(2 * 2**30, jobs[0]["memory"])
+        self.assertTrue(jobs[0]["args"]["rollup"])
+        known_input_var = [
+            nhgisxwalk.desc_code_2000_SF1b[unit]["Total"] for unit in batch.UNITS
+        ]
+        self.assertEqual(known_input_var, jobs[1]["args"]["xwalk_kwargs"]["input_var"])
+        self.assertFalse(any(p["skip"] for j in jobs for p in j["products"].values()))
+
+        with self.assertRaises(ValueError):
+            batch.plan_jobs({"out_path": "out/", "products": [{"kind": "tr"}]})
+        with self.assertRaises(ValueError):
+            batch.parse_bytes("2 gigs")
+
+    def test_run_jobs_memory_budget(self):
+        jobs = [{"memory": 3}, {"memory": 2}, {"memory": None}]
+        self.assertTrue(batch._fits(jobs[0], [], 1))
+        self.assertFalse(batch._fits(jobs[0], [jobs[1]], 4))
+        self.assertTrue(batch._fits(jobs[1], [jobs[1]], 4))
+        self.assertTrue(batch._fits(jobs[2], jobs[:2], 4))
+
+    def test_batch_main(self):
+        path_out = data_dir + "batch/"
+        os.makedirs(path_out, exist_ok=True)
+        manifest = {
+            "out_path": path_out,
+            "products": [
+                {
+                    "kind": bgp,
+                    "base_xwalk": data_dir + "nhgis_blk2000_blk2010_gj.zip",
+                    "source_year": _00,
+                    "target_geo": geo,
+                    "base_source_table": tab_data_path_2000,
+                    "rollup": True,
+                }
+                for geo in [tr, co]
+            ],
+        }
+        manifest_path = path_out + "manifest.json"
+        with open(manifest_path, "w") as manifest_file:
+            json.dump(manifest, manifest_file)
+
+        with contextlib.redirect_stdout(io.StringIO()) as stdout:
+            with contextlib.redirect_stderr(io.StringIO()):
+                self.assertEqual(0, batch.main([manifest_path]))
+        self.assertIn("nhgis_bgp2000_co2010", stdout.getvalue())
+        for geo in [tr, co]:
+            xwalk_name = "nhgis_bgp2000_%s2010" % geo
+            self.assertTrue(os.path.exists(path_out + xwalk_name + ".zip"))
+
+        # the products are up to date
+        jobs = batch.plan_jobs(batch.read_manifest(manifest_path))
+        self.assertTrue(all(p["skip"] for p in jobs[0]["products"].values()))
+        self.assertEqual([], list(batch.run_jobs(jobs)))
+        shutil.rmtree(path_out)
+
+
 class Test_id_codes_functions(unittest.TestCase):
     def test_generate_geoid_nan(self):
         known_value = numpy.nan
@@ -1154,6 +2013,88 @@ class Test_id_codes_functions(unittest.TestCase):
         with self.assertRaises(ValueError):
             nhgisxwalk.id_codes.generate_geoid("X1.1")
 
+    def test_gisjoin_to_geoid(self):
+        ids = ["G1000010042100", "G10000100421002", numpy.nan, "G10000100401001000"]
+        known = [nhgisxwalk.id_codes.generate_geoid(i) for i in ids]
+        observed = nhgisxwalk.id_codes.gisjoin_to_geoid(ids)
+        self.assertTrue(pandas.Series(known).equals(pandas.Series(observed)))
+        roundtrip = nhgisxwalk.id_codes.geoid_to_gisjoin(observed)
+        self.assertTrue(pandas.Series(ids).equals(pandas.Series(roundtrip)))
+
+    def test_gisjoin_to_geoid_1990(self):
+        ids = ["G10000100401201A", "G1000030011202104A"]
+        known = ["10001040100201A", "10003011202104A"]
+        observed = nhgisxwalk.id_codes.gisjoin_to_geoid(ids, year=_90)
+        numpy.testing.assert_array_equal(known, observed)
+        roundtrip = nhgisxwalk.id_codes.geoid_to_gisjoin(observed, year=_90)
+        numpy.testing.assert_array_equal(ids, roundtrip)
+
+    def test_gisjoin_to_geoid_errors(self):
+        with self.assertRaises(TypeError):
+            nhgisxwalk.id_codes.gisjoin_to_geoid(["G10000100401001000", 1.1])
+        with self.assertRaisesRegex(ValueError, "2 ID.*'X1', '1'"):
+            nhgisxwalk.id_codes.gisjoin_to_geoid(["X1", "1", "G1000010"])
+        with self.assertRaisesRegex(ValueError, "1 ID.*'G100001'"):
+            nhgisxwalk.id_codes.geoid_to_gisjoin(["100010421002", "G100001"])
+
+    def test_gisjoin_ids(self):
+        order = nhgisxwalk.id_codes.code_cols(bgp, _90)
+        tzero = ["STATEA", "COUNTYA"]
+        df = pandas.DataFrame({c: [str(i), str(i + 1)] for i, c in enumerate(order)})
+        df.loc[1, order[-1]] = numpy.nan
+        known = [
+            nhgisxwalk.id_codes.gisjoin_id(r, order, tzero) for r in df.itertuples()
+        ]
+        observed = nhgisxwalk.id_codes.gisjoin_ids(df, order, tzero)
+        self.assertEqual(known[0], "G0010234567891011")
+        self.assertEqual(known[0], observed[0])
+        self.assertTrue(numpy.isnan(observed[1]))
+
+    def test_bgp_gj_vectorized_matches_records(self):
+        order = nhgisxwalk.id_codes.code_cols(bgp, _00)
+        df = pandas.read_csv(tab_data_path_2000, dtype=nhgisxwalk.str_types(order))
+        known = nhgisxwalk.id_codes.bgp_gj(df.copy(), order, vectorized=False)
+        observed = nhgisxwalk.id_codes.bgp_gj(df.copy(), order, vectorized=True)
+        numpy.testing.assert_array_equal(known["_GJOIN"], observed["_GJOIN"])
+
+    def test_slice_gj_ids(self):
+        ids = ["G10000100401101", "G10000100401201A", "G1000030000601101"]
+        known = [nhgisxwalk.id_codes.bg_gj(_90, i) for i in ids] + [numpy.nan]
+        observed = nhgisxwalk.id_codes.slice_gj_ids(bg, _90, ids + [numpy.nan])
+        numpy.testing.assert_array_equal(known[:3], observed[:3])
+        self.assertTrue(numpy.isnan(observed[3]))
+
+        ids = numpy.array(["G10000100401001000", "G10000100401001003"])
+        for geog, func in zip([bg, tr, co], ["bg_gj", "tr_gj", "co_gj"]):
+            func = getattr(nhgisxwalk.id_codes, func)
+            known = numpy.vectorize(func)(_10, ids)
+            observed = nhgisxwalk.id_codes.id_from(func, _10, ids, True)
+            numpy.testing.assert_array_equal(known, observed)
+
+    def test_slice_gj_ids_bad_ids(self):
+        with self.assertRaisesRegex(ValueError, "2 ID\\(s\\).*'X1.1', 'G1'"):
+            nhgisxwalk.id_codes.slice_gj_ids(
+                tr, _10, ["X1.1", "G10000100401001000", "G1"]
+            )
+
+    def test_slice_gj_ids_bad_year(self):
+        with self.assertRaises(ValueError):
+            nhgisxwalk.id_codes.slice_gj_ids(co, _00, ["G10000100401001000"])
+
+    def test_id_from_categorical(self):
+        ids = ["G10000100401001000", numpy.nan, "G10000100401001003", "G1000030"]
+        for vectorized, _ids in [(True, ids), (False, ids[::2])]:
+            func = nhgisxwalk.id_codes.co_gj
+            known = nhgisxwalk.id_codes.id_from(func, _10, _ids, vectorized)
+            observed = nhgisxwalk.id_codes.id_from(
+                func, _10, pandas.Series(_ids, dtype="category"), vectorized
+            )
+            self.assertIsInstance(observed, pandas.Categorical)
+            pandas.testing.assert_series_equal(
+                pandas.Series(known, dtype=object),
+                pandas.Series(observed, dtype=object),
+            )
+
     def test_tr_gj_no_G(self):
         with self.assertRaises(ValueError):
             nhgisxwalk.id_codes.tr_gj("2010", "X1.1")
@@ -1176,6 +2117,62 @@ class Test_id_codes_functions(unittest.TestCase):
             nhgisxwalk.id_codes.tr_gj("0000", "G123456789123456789")
 
 
+class Test_id_keys_functions(unittest.TestCase):
+    def test_id_codec_roundtrip(self):
+        ids = [
+            "G10000100401201A",
+            "G1000030011202104A",
+            numpy.nan,
+            "G10000100401201",
+            "G1000030011202104B",
+        ]
+        codec, (keys,) = nhgisxwalk.id_keys.pack_ids(ids)
+        self.assertEqual(codec.n_words, 1)
+        self.assertEqual(keys[2, 0], nhgisxwalk.id_keys.MISSING)
+        observed = codec.decode(keys)
+        self.assertTrue(pandas.Series(ids).equals(pandas.Series(observed)))
+
+        # keys sort as the IDs do
+        known = sorted(i for i in ids if isinstance(i, str))
+        order = numpy.lexsort(keys[[0, 1, 3, 4]].T[::-1])
+        numpy.testing.assert_array_equal(known, observed[[0, 1, 3, 4]][order])
+
+    def test_id_codec_multiple_words(self):
+        ids = ["G" + str(i) * 36 for i in range(10)]
+        codec = nhgisxwalk.id_keys.IDCodec.fit(ids)
+        self.assertEqual(codec.n_words, 2)
+        numpy.testing.assert_array_equal(ids, codec.decode(codec.encode(ids)))
+
+    def test_id_codec_errors(self):
+        codec = nhgisxwalk.id_keys.IDCodec.fit(["G1000010", "G1000020"])
+        with self.assertRaisesRegex(ValueError, "length of 1 ID.*'G10000100'"):
+            codec.encode(["G10000100"])
+        with self.assertRaisesRegex(ValueError, "layout .* 1 ID.*'X1000010'"):
+            codec.encode(["X1000010"])
+        with self.assertRaisesRegex(ValueError, "characters of 1 ID.*'g1000010'"):
+            nhgisxwalk.id_keys.IDCodec.fit(["g1000010"])
+        with self.assertRaises(TypeError):
+            nhgisxwalk.id_keys.IDCodec.fit(["G1000010", 1])
+        keys = codec.encode(["G10000100", "G1000020"], strict=False)
+        numpy.testing.assert_array_equal(
+            [True, False], nhgisxwalk.id_keys.is_missing(keys)
+        )
+
+    def test_setdiff_ids(self):
+        ids1 = ["G1000030", "G1000010", numpy.nan, "G1000020", "G1000030"]
+        ids2 = ["G1000020", "G1000040"]
+        known = numpy.setdiff1d(["G1000030", "G1000010", "G1000020"], ids2)
+        observed = nhgisxwalk.id_keys.setdiff_ids(ids1, ids2)
+        numpy.testing.assert_array_equal(known, observed)
+
+    def test_isin_pairs(self):
+        pairs1 = ["A", "A", "B", "B"], ["X", "Y", "X", numpy.nan]
+        pairs2 = ["A", "B"], ["Y", "Y"]
+        known = [False, True, False, False]
+        observed = nhgisxwalk.id_keys.isin_pairs(pairs1, pairs2)
+        numpy.testing.assert_array_equal(known, observed)
+
+
 class Test_remove_generated_data(unittest.TestCase):
     def test_remove_generated_data(self):
         # remove 2000-2010 written test data